@@ -11,6 +11,10 @@ __version__ = '0.0.4'
 
 import os
 
+from vunits.quantity import unchecked, set_check_fraction
+from vunits.system import unit_system
+from vunits.cache import memoize
+
 def run_tests(python_command='python', buffer=False, failfast=False,
               verbose=False):
     """Run unit tests.
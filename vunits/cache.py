@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.cache
+
+Memoization of functions that take :class:`~vunits.quantity.Quantity`
+arguments.
+"""
+
+import threading
+from functools import wraps
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from vunits.quantity import Quantity, _quantity_key
+
+CacheInfo = namedtuple('CacheInfo',
+                       ['hits', 'misses', 'maxsize', 'currsize', 'hit_rate'])
+CacheInfo.__doc__ = """Statistics of a function decorated with
+:func:`~vunits.memoize`."""
+
+_quantity_marker = object()
+"""object: Marker used in cache keys to distinguish quantities from tuples."""
+
+_array_marker = object()
+"""object: Marker used in cache keys to distinguish arrays from tuples."""
+
+def memoize(maxsize=128):
+    """Decorator to cache the results of functions taking
+    :class:`~vunits.quantity.Quantity` arguments
+
+    :class:`~vunits.quantity.Quantity` and numpy array arguments are hashed
+    using their magnitude bytes (and units). Other arguments must be hashable.
+    The least recently used results are evicted once ``maxsize`` is reached.
+
+    The decorated function has a ``cache_info()`` method returning a
+    :class:`~vunits.cache.CacheInfo` and a ``cache_clear()`` method.
+
+    Parameters
+    ----------
+        maxsize : int or None, optional
+            Maximum number of results stored. If None, the cache grows without
+            bound. Default is 128.
+    Returns
+    -------
+        decorator : callable
+            Decorator to apply to the function.
+
+    Notes
+    -----
+        Cached results are returned directly. Do not modify them in place.
+    """
+    # Allow decorator to be used without parentheses
+    if callable(maxsize):
+        return memoize()(maxsize)
+
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.RLock()
+        stats = {'hits': 0, 'misses': 0}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            with lock:
+                try:
+                    result = cache[key]
+                except KeyError:
+                    stats['misses'] += 1
+                else:
+                    cache.move_to_end(key)
+                    stats['hits'] += 1
+                    return result
+            result = func(*args, **kwargs)
+            with lock:
+                cache[key] = result
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        def cache_info():
+            with lock:
+                n_calls = stats['hits'] + stats['misses']
+                hit_rate = stats['hits']/n_calls if n_calls > 0 else 0.
+                return CacheInfo(hits=stats['hits'], misses=stats['misses'],
+                                 maxsize=maxsize, currsize=len(cache),
+                                 hit_rate=hit_rate)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                stats['hits'] = 0
+                stats['misses'] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def _make_key(args, kwargs):
+    """Helper method to create a hashable key from function arguments
+
+    Parameters
+    ----------
+        args : tuple
+            Positional arguments
+        kwargs : dict
+            Keyword arguments
+    Returns
+    -------
+        key : tuple
+            Hashable key
+    """
+    key = tuple([_make_arg_key(arg) for arg in args])
+    if kwargs:
+        key += tuple([(name, _make_arg_key(arg))
+                      for name, arg in sorted(kwargs.items())])
+    return key
+
+def _make_arg_key(arg):
+    """Helper method to create a hashable key from an argument
+
+    Parameters
+    ----------
+        arg : object
+            Argument
+    Returns
+    -------
+        key : object
+            ``arg`` if it is not a :class:`~vunits.quantity.Quantity` or
+            numpy array. Otherwise, a tuple representing the magnitude bytes.
+    """
+    if isinstance(arg, Quantity):
+        try:
+            # FrozenQuantity objects have already calculated their keys
+            return (_quantity_marker, arg._key)
+        except AttributeError:
+            return (_quantity_marker, _quantity_key(mag=arg.mag,
+                                                    units=arg.units))
+    elif isinstance(arg, np.ndarray):
+        return (_array_marker, arg.dtype.str, arg.shape, arg.tobytes())
+    return arg
@@ -5,11 +5,93 @@ vunits.constants
 Contains universal constants for catalysis research.
 """
 
-import numpy as np
-from vunits.db import _temp_units
-from vunits.quantity import Quantity, _force_get_quantity
+import sys
+from collections import namedtuple
 
-R = Quantity.from_units(mag=8.3144598, units='J/mol/K')
+import numpy as np
+from vunits.quantity import Quantity
+
+# Constants are stored as raw SI magnitudes and powers of SI units. The
+# Quantity objects are created the first time they are accessed (see
+# ``__getattr__``) so importing this module does not parse any units.
+_R = 8.3144598
+_h = 6.626070040e-34
+_h_bar = _h/2./np.pi
+_kb = 1.38064852e-23
+_c = 299792458.
+_m_e = 9.1093837015e-31
+_m_p = 1.67262192369e-27
+_m_n = 1.67492749804e-27
+_P0 = 1.e5
+_T0 = 298.15
+_V0 = _R*_T0/_P0
+_N0 = 6.02214086e23
+_Na = 6.02214086e23
+_e = 1.6021766208e-19
+_F = _e*_Na
+_G = 6.67430e-11
+_eps_0 = 8.8541878128e-12
+_mu_0 = 1.25663706212e-6
+_R_inf = _m_e*_e**4/8./_eps_0**2/_h**2
+_r_bohr = 4.*np.pi*_eps_0*_h_bar**2/_m_e/_e**2
+
+_si_values = {
+    'R': (_R, {'m': 2., 'kg': 1., 's': -2., 'K': -1., 'mol': -1.}),
+    'h': (_h, {'m': 2., 'kg': 1., 's': -1.}),
+    'h_bar': (_h_bar, {'m': 2., 'kg': 1., 's': -1.}),
+    'kb': (_kb, {'m': 2., 'kg': 1., 's': -2., 'K': -1.}),
+    'c': (_c, {'m': 1., 's': -1.}),
+    'm_e': (_m_e, {'kg': 1.}),
+    'm_p': (_m_p, {'kg': 1.}),
+    'm_n': (_m_n, {'kg': 1.}),
+    'P0': (_P0, {'m': -1., 'kg': 1., 's': -2.}),
+    'T0': (_T0, {'K': 1.}),
+    'V0': (_V0, {'m': 3., 'mol': -1.}),
+    'N0': (_N0, {}),
+    'Na': (_Na, {'mol': -1.}),
+    'e': (_e, {'s': 1., 'A': 1.}),
+    'F': (_F, {'s': 1., 'A': 1., 'mol': -1.}),
+    'G': (_G, {'m': 3., 'kg': -1., 's': -2.}),
+    'eps_0': (_eps_0, {'m': -3., 'kg': -1., 's': 4., 'A': 2.}),
+    'mu_0': (_mu_0, {'m': 1., 'kg': 1., 's': -2., 'A': -2.}),
+    'R_inf': (_R_inf, {'m': 2., 'kg': 1., 's': -2.}),
+    'r_bohr': (_r_bohr, {'m': 1.}),
+}
+"""dict: Keys are the names of the constants and the values are tuples whose
+first element is the SI magnitude and the second element is a dict with the
+powers of the SI units."""
+
+_names = tuple(sorted(_si_values))
+"""tuple: Names of the constants in this module."""
+
+__all__ = list(_names) + ['in_units', 'UnitSystemConstants']
+
+def __getattr__(name):
+    """Creates constants the first time they are accessed
+
+    Parameters
+    ----------
+        name : str
+            Name of constant
+    Returns
+    -------
+        constant : :class:`~vunits.quantity.Quantity`
+            Constant. It is stored in the module so later accesses do not call
+            this function.
+    """
+    try:
+        mag, units = _si_values[name]
+    except KeyError:
+        err_msg = 'module {!r} has no attribute {!r}'.format(__name__, name)
+        raise AttributeError(err_msg)
+    constant = Quantity(mag=mag, **units)
+    globals()[name] = constant
+    return constant
+
+def __dir__():
+    return sorted(set(globals()) | set(_si_values))
+
+R: Quantity
 r""":class:`~vunits.quantity.Quantity`: Molar (univeral or ideal) gas constant.
 
 **SI Value**: 8.3144598 J/mol/K
@@ -18,7 +100,7 @@ r""":class:`~vunits.quantity.Quantity`: Molar (univeral or ideal) gas constant.
 :ref:`temperature <temp_table>` or equivalent quantities.
 """
 
-h = Quantity.from_units(mag=6.626070040e-34, units='J s')
+h: Quantity
 r""":class:`~vunits.quantity.Quantity`: Planck's constant.
 
 **SI Value**: 6.626070040e-34 J s.
@@ -26,7 +108,7 @@ r""":class:`~vunits.quantity.Quantity`: Planck's constant.
 **Dimensions**: :ref:`energy <energy_table>`/:ref:`time <time_table>` or equivalent
 quantities."""
 
-h_bar = h/2./np.pi
+h_bar: Quantity
 r""":class:`~vunits.quantity.Quantity`: Planck's constant divided by
 2\ :math:`\pi`\ .
     
@@ -35,7 +117,7 @@ r""":class:`~vunits.quantity.Quantity`: Planck's constant divided by
 **Dimensions**: :ref:`energy <energy_table>`/:ref:`time <time_table>` or
 equivalent quantities."""
 
-kb = Quantity.from_units(mag=1.38064852e-23, units='J/K')
+kb: Quantity
 r""":class:`~vunits.quantity.Quantity`: Boltzmann constant.
 
 **SI Value**: 1.38064852e-23 J/K
@@ -43,7 +125,7 @@ r""":class:`~vunits.quantity.Quantity`: Boltzmann constant.
 **Dimensions**: :ref:`energy <energy_table>`/:ref:`temperature <temp_table>` or
 equivalent quantities."""
 
-c = Quantity(mag=299792458., m=1., s=-1.)
+c: Quantity
 r""":class:`~vunits.quantity.Quantity`: Speed of light.
 
 **SI Value**: 299792458 m/s
@@ -52,42 +134,42 @@ r""":class:`~vunits.quantity.Quantity`: Speed of light.
 quantities.
 """
 
-m_e = Quantity(mag=9.1093837015e-31, kg=1.)
+m_e: Quantity
 r""":class:`~vunits.quantity.Quantity`: Mass of a electron.
 
 **SI Value**: 9.1093837015e-31 kg
 
 **Dimensions**: :ref:`mass <mass_table>` or equivalent quantities."""
 
-m_p = Quantity(mag=1.67262192369e-27, kg=1.)
+m_p: Quantity
 r""":class:`~vunits.quantity.Quantity`: Mass of a proton.
 
 **SI Value**: 1.67262192369e-27 kg
 
 **Dimensions**: :ref:`mass <mass_table>` or equivalent quantities."""
 
-m_n = Quantity(mag=1.67492749804e-27, kg=1.)
+m_n: Quantity
 r""":class:`~vunits.quantity.Quantity`: Mass of a neutron.
 
 **SI Value**: 1.67492749804 kg
 
 **Dimensions**: :ref:`mass <mass_table>` or equivalent quantities."""
 
-P0 = Quantity.from_units(mag=1., units='bar')
+P0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Standard pressure.
 
 **SI Value**: 1 bar
 
 **Dimensions**: :ref:`pressure <pressure_table>` or equivalent quantities."""
 
-T0 = Quantity(mag=298.15, K=1.)
+T0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Standard temperature.
 
 **SI Value**: 298.15 K
 
 **Dimensions**: :ref:`temperature <temp_table>` or equivalent quantities."""
 
-V0 = R*T0/P0
+V0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Standard volume. 
 
 **SI Value**: 0.024789561893699998 m\ :sup:`3`\ /mol
@@ -95,7 +177,7 @@ r""":class:`~vunits.quantity.Quantity`: Standard volume.
 **Dimensions**: :ref:`volume <volume_table>`/:ref:`amount <amount_table>` or
 equivalent quantities."""
 
-N0 = Quantity(mag=6.02214086e23)
+N0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Avogadro number. Use this value instead
 of Avogadro's constant (``Na``) to preserve units.
 
@@ -103,21 +185,21 @@ of Avogadro's constant (``Na``) to preserve units.
 
 **Dimensions**: None"""
 
-Na = Quantity(mag=6.02214086e23, mol=-1.)
+Na: Quantity
 r""":class:`~vunits.quantity.Quantity`: Avogadro constant.
 
 **SI Value**: 6.02214086e23 1/mol
 
 **Dimensions**: :ref:`amount <amount_table>`\ :sup:`-1`\ ."""
 
-e = Quantity.from_units(mag=1.6021766208e-19, units='C')
+e: Quantity
 r""":class:`~vunits.quantity.Quantity`: Charge of electron.
 
 **SI Value**: 1.6021766208e-19 C
 
 **Dimensions**: :ref:`charge <charge_table>` or equivalent quantities."""
 
-F = e*Na
+F: Quantity
 r""":class:`~vunits.quantity.Quantity`: Faraday's constant.
 
 **SI Value**: 96485.33293056407 C/mol
@@ -125,7 +207,7 @@ r""":class:`~vunits.quantity.Quantity`: Faraday's constant.
 **Dimensions**: :ref:`charge <charge_table>`/:ref:`amount <amount_table>` or
 equivalent quantities."""
 
-G = Quantity(mag=6.67430e-11, m=3., kg=-1., s=-2)
+G: Quantity
 r""":class:`~vunits.quantity.Quantity`: Gravitational constant.
 
 **SI Value**: 6.67430e-11 m\ :sup:`3`\ kg\ :sup:`-1`\ s\ :sup:`-2`\.
@@ -133,7 +215,7 @@ r""":class:`~vunits.quantity.Quantity`: Gravitational constant.
 **Dimensions**: :ref:`volume <volume_table>`/:ref:`mass <mass_table>`/
 :ref:`time <time_table>` or equivalent quantities."""
 
-eps_0 = Quantity.from_units(8.8541878128e-12, 'F/m')
+eps_0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Vacuum permittivity.
 
 **SI Value**: 8.8541878128e-12 F/m
@@ -142,7 +224,7 @@ r""":class:`~vunits.quantity.Quantity`: Vacuum permittivity.
 :ref:`length <length_table>` or equivalent quantities.
 """
 
-mu_0 = Quantity.from_units(1.25663706212e-6, 'H/m')
+mu_0: Quantity
 r""":class:`~vunits.quantity.Quantity`: Vacuum permeability.
 
 **SI Value**: 1.25663706212e-6 H/m
@@ -151,17 +233,60 @@ r""":class:`~vunits.quantity.Quantity`: Vacuum permeability.
 :ref:`length <length_table>` or equivalent quantities.
 """
 
-R_inf = m_e*e**4/8./eps_0**2/h**2
+R_inf: Quantity
 r""":class:`~vunits.quantity.Quantity`: Rydberg constant.
 
 **SI Value**: 2.1799233153862138e-18 J
 
 **Dimensions**: :ref:`energy <energy_table>` or equivalent quantities."""
 
-r_bohr = 4.*np.pi*eps_0*h_bar**2/m_e/e**2
+r_bohr: Quantity
 r""":class:`~vunits.quantity.Quantity`: Bohr radius.
 
 **SI Value**: 5.291648330110941e-11 m
 
 **Dimensions**: :ref:`length <length_table>` or equivalent quantities.
-"""
\ No newline at end of file
+"""
+UnitSystemConstants = namedtuple('UnitSystemConstants', _names)
+UnitSystemConstants.__doc__ = """Immutable namespace of constants expressed as
+floats in a unit system. Returned by :func:`~vunits.constants.in_units`."""
+
+_in_units_cache = {}
+"""dict: Cache of namespaces returned by :func:`~vunits.constants.in_units`.
+Keys are :attr:`~vunits.system.UnitSystem.key` tuples."""
+
+def in_units(**kwargs):
+    """Returns all constants as floats in a unit system
+
+    Useful for hot loops since accessing the floats does not parse units. The
+    namespace is calculated once per unit system and cached.
+
+    Parameters
+    ----------
+        kwargs : keyword arguments
+            Units of the system (e.g. ``energy='kcal/mol'``,
+            ``length='Ang'``). See :class:`~vunits.system.UnitSystem` for
+            supported keywords. Dimensions not specified use SI units.
+    Returns
+    -------
+        constants : :class:`~vunits.constants.UnitSystemConstants`
+            Immutable namespace whose attributes are the constants of this
+            module. Each constant is a float in the units obtained by
+            substituting the system's units into the constant's dimensions.
+            e.g. with ``energy='kcal/mol'``, ``R`` is in kcal/mol/K and ``kb``
+            is in kcal/K.
+    """
+    from vunits.system import get_unit_system
+    system = get_unit_system(**kwargs)
+    try:
+        return _in_units_cache[system.key]
+    except KeyError:
+        pass
+
+    values = {}
+    for name in _names:
+        qty = getattr(sys.modules[__name__], name)
+        values[name] = float(qty.mag/system.factor(qty.units))
+    constants = UnitSystemConstants(**values)
+    _in_units_cache[system.key] = constants
+    return constants
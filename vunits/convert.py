@@ -1,10 +1,11 @@
 import numpy as np
 
 from vunits.db import _temp_units
-from vunits.quantity import Quantity, _force_get_quantity, _return_quantity
+from vunits.quantity import (Quantity, _force_get_quantity, _return_quantity,
+                             _as_dtype, _cast_factor, _apply_factor)
 from vunits import constants as c
 
-def convert_temp(num, initial, final):
+def convert_temp(num, initial, final, out=None):
     """Converts temperature from one unit set to another
 
     Parameters
@@ -18,10 +19,14 @@ def convert_temp(num, initial, final):
         final : str
             Units you would like num to be in. Accepted options include 'C',
             'oC', 'F', 'oF', 'R', 'K'.
+        out : np.ndarray, optional
+            Array to write the result to. Must have the same shape as ``num``.
+            If not specified, a new object is created.
     Returns
     -------
         conversion_num : float
-            num in the appropriate units
+            num in the appropriate units. If ``out`` is specified, returns
+            ``out``.
     Raises
     ------
         ValueError
@@ -29,52 +34,70 @@ def convert_temp(num, initial, final):
     """
     if num is None:
         num = 0.
-    # Evaluating each combination
+    # Evaluating each combination. Conversions are expressed as
+    # num*scale + offset
     initial_err_msg = 'Unsupported initial unit, {}.'.format(initial)
     final_err_msg = 'Unsupported final unit, {}.'.format(final)
     if initial == final:
-        result = num
+        scale, offset = 1., 0.
     elif initial == 'C' or initial == 'oC':
         if final == 'K':
-            result = num + 273.15
+            scale, offset = 1., 273.15
         elif final == 'F' or final == 'oF':
-            result = (num * 9./5.) + 32.
+            scale, offset = 9./5., 32.
         elif final == 'R':
-            result = (num + 273.15) * 1.8
+            scale, offset = 1.8, 273.15*1.8
         else:
             raise ValueError(final_err_msg)
     elif initial == 'K':
         if final == 'C' or final == 'oC':
-            result = num - 273.15
+            scale, offset = 1., -273.15
         elif final == 'F' or final == 'oF':
-            result = (num * 1.8) - 459.67
+            scale, offset = 1.8, -459.67
         elif final == 'R':
-            result = num * 1.8
+            scale, offset = 1.8, 0.
         else:
             raise ValueError(final_err_msg)
     elif initial == 'F' or initial == 'oF':
         if final == 'C' or final == 'oC':
-            result = (num - 32.) * 5./9.
+            scale, offset = 5./9., -32.*5./9.
         elif final == 'K':
-            result = (num + 459.67)/1.8
+            scale, offset = 1./1.8, 459.67/1.8
         elif final == 'R':
-            result = num + 459.67
+            scale, offset = 1., 459.67
         else:
             raise ValueError(final_err_msg)
     elif initial == 'R':
         if final == 'C' or final == 'oC':
-            result = num/1.8 - 273.15
+            scale, offset = 1./1.8, -273.15
         elif final == 'K':
-            result = num/1.8
+            scale, offset = 1./1.8, 0.
         elif final == 'F' or final == 'oF':
-            result = num - 459.67
+            scale, offset = 1., -459.67
         else:
             raise ValueError(final_err_msg)
     else:
         raise ValueError(initial_err_msg)
+
+    # Apply the conversion in the type of num to avoid upcasting
+    scale = _cast_factor(num, scale)
+    offset = _cast_factor(num, offset)
+    if out is None:
+        if scale == 1. and offset == 0.:
+            result = num
+        else:
+            result = num*scale + offset
+    else:
+        # Write to out without creating temporary arrays
+        if scale == 1.:
+            result = np.add(num, offset, out=out)
+        else:
+            result = np.multiply(num, scale, out=out)
+            if offset != 0.:
+                result = np.add(result, offset, out=out)
     return result
 
-def convert_unit(num=None, initial=None, final=None):
+def convert_unit(num=None, initial=None, final=None, out=None, dtype=None):
     """Converts units between two unit sets
 
     Parameters
@@ -91,24 +114,44 @@ def convert_unit(num=None, initial=None, final=None):
             Units you would like num to be in. Different units must be sparated
             by a ' ' or '/'. Supports powers as numbers after units. e.g.
             'cm/s2', 'cm s-2', or 'cm s^-2'.
+        out : np.ndarray, optional
+            Array to write the result to. Must have the same shape as ``num``.
+            ``out`` can be ``num`` to convert in place. If not specified, a new
+            object is created.
+        dtype : data-type, optional
+            Data type of the result. ``num`` is cast to ``dtype`` before the
+            conversion. If not specified, the type of ``num`` is kept for
+            floating point arrays.
     Returns
     -------
         conversion_num : float
-            num in the appropriate units
+            num in the appropriate units. If ``out`` is specified, returns
+            ``out``.
     Raises
     ------
         ValueError
             If unit types are not consistent or not supported
     """
+    if dtype is not None and num is not None:
+        num = _as_dtype(num, dtype)
     if initial in _temp_units and final in _temp_units:
         if num is None:
             num = 0.
-        return convert_temp(num=num, initial=initial, final=final)
-    else:
+        return convert_temp(num=num, initial=initial, final=final, out=out)
+    elif initial in _temp_units or final in _temp_units:
         if num is None:
             num = 1.
         in_qty = Quantity.from_units(mag=num, units=initial)
-        return in_qty(final)
+        return in_qty(final, out=out)
+    else:
+        if num is None:
+            num = 1.
+        elif isinstance(num, list):
+            num = np.array(num)
+        # Only the conversion factor is calculated using Quantity objects so
+        # num is multiplied once
+        factor = Quantity.from_units(units=initial)(final)
+        return _apply_factor(num, factor, out=out)
 
 def energy_to_freq(energy, units_in='J', return_quantity=False, units_out='Hz'):
     """Converts energy to frequency
@@ -481,4 +524,217 @@ def einstein_to_debye(einstein_temperature):
         debye_temperature : float
             Debye temperature in K
     """
-    return einstein_temperature/(np.pi/6.)**(1./3.)
\ No newline at end of file
+    return einstein_temperature/(np.pi/6.)**(1./3.)
+
+def mole_to_mass_fraction(mole_fractions, molar_masses,
+                          molar_mass_units='g/mol', return_quantity=False):
+    """Converts mole fractions to mass fractions
+
+    Parameters
+    ----------
+        mole_fractions : (..., N) np.ndarray
+            Mole fractions of N species. Leading dimensions (e.g. time points)
+            are broadcasted.
+        molar_masses : (N,) list of str, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar masses of the species. If a list of str, the molar masses
+            are calculated from the chemical formulas using
+            :func:`~vunits.formula.get_molar_mass`.
+        molar_mass_units : str, optional
+            Units of ``molar_masses`` if they are numbers. Default is 'g/mol'.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns np.ndarray.
+    Returns
+    -------
+        mass_fractions : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Mass fractions.
+    """
+    masses = _get_mag(mole_fractions)*_get_molar_masses(molar_masses,
+                                                        molar_mass_units)
+    qty_out = Quantity(mag=masses/masses.sum(axis=-1, keepdims=True))
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity)
+
+def mass_to_mole_fraction(mass_fractions, molar_masses,
+                          molar_mass_units='g/mol', return_quantity=False):
+    """Converts mass fractions to mole fractions
+
+    Parameters
+    ----------
+        mass_fractions : (..., N) np.ndarray
+            Mass fractions of N species. Leading dimensions (e.g. time points)
+            are broadcasted.
+        molar_masses : (N,) list of str, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar masses of the species. See
+            :func:`~vunits.convert.mole_to_mass_fraction`.
+        molar_mass_units : str, optional
+            Units of ``molar_masses`` if they are numbers. Default is 'g/mol'.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns np.ndarray.
+    Returns
+    -------
+        mole_fractions : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Mole fractions.
+    """
+    moles = _get_mag(mass_fractions)/_get_molar_masses(molar_masses,
+                                                       molar_mass_units)
+    qty_out = Quantity(mag=moles/moles.sum(axis=-1, keepdims=True))
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity)
+
+def mole_fraction_to_conc(mole_fractions, T, P, T_units='K', P_units='Pa',
+                          return_quantity=False, units_out='mol/m3'):
+    """Converts mole fractions to molar concentrations assuming an ideal gas
+
+    Parameters
+    ----------
+        mole_fractions : (..., N) np.ndarray
+            Mole fractions of N species. Leading dimensions (e.g. time points)
+            are broadcasted.
+        T : float, (...) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperature. Arrays have one value per point in the leading
+            dimensions of ``mole_fractions``.
+        P : float, (...) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Pressure. Arrays have one value per point in the leading
+            dimensions of ``mole_fractions``.
+        T_units : str, optional
+            Units of ``T`` if it is a number. Default is 'K'.
+        P_units : str, optional
+            Units of ``P`` if it is a number. Default is 'Pa'.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns np.ndarray.
+        units_out : str, optional
+            Units of the concentrations. Default is 'mol/m3'.
+    Returns
+    -------
+        concentrations : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar concentrations.
+    """
+    P_in = _force_get_quantity(obj=P, units=P_units)
+    T_in = _force_get_quantity(obj=T, units=T_units)
+    total_conc = P_in/c.R/T_in
+    if total_conc.units != Quantity(mol=1., m=-3.).units:
+        err_msg = ('Temperature and pressure do not give concentrations, {}.'
+                   ''.format(str(total_conc)))
+        raise TypeError(err_msg)
+    conc = _get_mag(mole_fractions)*np.expand_dims(total_conc.mag, axis=-1)
+    qty_out = Quantity(mag=conc, m=-3., mol=1.)
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity,
+                            units_out=units_out)
+
+def conc_to_mole_fraction(concentrations, units_in='mol/m3',
+                          return_quantity=False):
+    """Converts molar concentrations to mole fractions
+
+    Parameters
+    ----------
+        concentrations : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar concentrations of N species. Leading dimensions (e.g. time
+            points) are broadcasted.
+        units_in : str, optional
+            Units of ``concentrations`` if they are numbers. Default is
+            'mol/m3'.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns np.ndarray.
+    Returns
+    -------
+        mole_fractions : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Mole fractions.
+    """
+    conc = _force_get_quantity(obj=concentrations, units=units_in).mag
+    qty_out = Quantity(mag=conc/conc.sum(axis=-1, keepdims=True))
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity)
+
+def mass_fraction_to_conc(mass_fractions, molar_masses, T, P,
+                          molar_mass_units='g/mol', T_units='K', P_units='Pa',
+                          return_quantity=False, units_out='mol/m3'):
+    """Converts mass fractions to molar concentrations assuming an ideal gas.
+    See :func:`~vunits.convert.mass_to_mole_fraction` and
+    :func:`~vunits.convert.mole_fraction_to_conc` for the parameters.
+
+    Returns
+    -------
+        concentrations : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar concentrations.
+    """
+    mole_fractions = mass_to_mole_fraction(mass_fractions=mass_fractions,
+                                           molar_masses=molar_masses,
+                                           molar_mass_units=molar_mass_units)
+    return mole_fraction_to_conc(mole_fractions=mole_fractions, T=T, P=P,
+                                 T_units=T_units, P_units=P_units,
+                                 return_quantity=return_quantity,
+                                 units_out=units_out)
+
+def conc_to_mass_fraction(concentrations, molar_masses, units_in='mol/m3',
+                          molar_mass_units='g/mol', return_quantity=False):
+    """Converts molar concentrations to mass fractions. See
+    :func:`~vunits.convert.conc_to_mole_fraction` and
+    :func:`~vunits.convert.mole_to_mass_fraction` for the parameters.
+
+    Returns
+    -------
+        mass_fractions : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Mass fractions.
+    """
+    mole_fractions = conc_to_mole_fraction(concentrations=concentrations,
+                                           units_in=units_in)
+    return mole_to_mass_fraction(mole_fractions=mole_fractions,
+                                 molar_masses=molar_masses,
+                                 molar_mass_units=molar_mass_units,
+                                 return_quantity=return_quantity)
+
+def _get_mag(obj):
+    """Helper method to get the magnitude of fractions
+
+    Parameters
+    ----------
+        obj : np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Fractions
+    Returns
+    -------
+        mag : np.ndarray
+            Magnitude
+    Raises
+    ------
+        TypeError
+            If ``obj`` is a :class:`~vunits.quantity.Quantity` with units.
+    """
+    if isinstance(obj, Quantity):
+        if not obj._is_dimless():
+            err_msg = ('Fractions must be dimensionless, not {}.'
+                       ''.format(str(obj)))
+            raise TypeError(err_msg)
+        obj = obj.mag
+    return np.asarray(obj)
+
+def _get_molar_masses(molar_masses, units):
+    """Helper method to get molar masses in SI units
+
+    Parameters
+    ----------
+        molar_masses : list of str, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar masses or chemical formulas
+        units : str
+            Units of ``molar_masses`` if they are numbers
+    Returns
+    -------
+        molar_masses : np.ndarray
+            Molar masses in kg/mol
+    Raises
+    ------
+        TypeError
+            If ``molar_masses`` (or ``units``) do not have units of molar
+            mass.
+    """
+    if not isinstance(molar_masses, Quantity):
+        molar_masses = np.asarray(molar_masses)
+        if molar_masses.dtype.kind in 'US':
+            from vunits.formula import get_molar_mass
+            return get_molar_mass(list(molar_masses), units_out='kg/mol')
+        molar_masses = Quantity.from_units(mag=molar_masses, units=units)
+    if molar_masses.units != Quantity(kg=1., mol=-1.).units:
+        err_msg = ('Molar masses must have units of mass per amount, not {}.'
+                   ''.format(str(molar_masses)))
+        raise TypeError(err_msg)
+    return np.asarray(molar_masses.mag)
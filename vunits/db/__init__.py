@@ -1,6 +1,9 @@
 import os
+import sys
 import json
 
+import numpy as np
+
 from vunits.quantity import Quantity, UnitQuantity
 
 short_prefixes = {'Y': 1.e24, 'Z': 1.e21, 'E': 1.e18, 'P': 1.e15, 'T': 1.e12,
@@ -341,6 +344,191 @@ def _add_plural(qty_dict):
 _temp_units = ('K', 'R', 'oC', 'oF')
 """tuple: Helper tuple to identify if a unit belongs to temperature."""
 
+_unit_db_version = 0
+"""int: Incremented every time ``unit_db`` is modified by
+:func:`~vunits.db.register_unit`."""
+
+def register_unit(name, quantity, add_short_prefix=False,
+                  add_long_prefix=False, plural_suffix=None, overwrite=False):
+    """Adds a unit to ``unit_db`` so it can be parsed
+
+    Prefixes and plurals are only generated for the new unit. Cached parsing
+    results that use the added names are discarded.
+
+    Parameters
+    ----------
+        name : str
+            Name of the unit (e.g. 'furlong').
+        quantity : :class:`~vunits.quantity.Quantity`
+            Value of one unit.
+        add_short_prefix : bool, optional
+            If True, short prefixes are also added (e.g. 'kfurlong'). Default
+            is False.
+        add_long_prefix : bool, optional
+            If True, long prefixes are also added (e.g. 'kilofurlong').
+            Default is False.
+        plural_suffix : str, optional
+            If specified, plural units are also added (e.g. 's' adds
+            'furlongs'). Default is None.
+        overwrite : bool, optional
+            If True, existing units with the same names are replaced. Default
+            is False.
+    Returns
+    -------
+        names : list of str
+            Names added to ``unit_db``.
+    Raises
+    ------
+        ValueError
+            If ``overwrite`` is False and any of the names already exist.
+    """
+    unit_qty = UnitQuantity._from_qty(units=quantity.units, mag=quantity.mag,
+                                      add_short_prefix=add_short_prefix,
+                                      add_long_prefix=add_long_prefix,
+                                      plural_suffix=plural_suffix)
+    new_entries = _add_plural(_add_prefixes({name: unit_qty}))
+    if not overwrite:
+        existing_names = sorted(set(new_entries) & set(unit_db))
+        if len(existing_names) > 0:
+            err_msg = ('Units {} already exist. Use overwrite=True to replace '
+                       'them.'.format(existing_names))
+            raise ValueError(err_msg)
+    unit_db.update(new_entries)
+    _invalidate_units(names=set(new_entries))
+    return list(new_entries)
+
+def get_unit_db_version():
+    """Returns the version of ``unit_db``
+
+    Returns
+    -------
+        version : int
+            Number of times ``unit_db`` was modified using
+            :func:`~vunits.db.register_unit`. Can be used to invalidate
+            caches derived from the units.
+    """
+    return _unit_db_version
+
+def _invalidate_units(names):
+    """Helper method to discard cached results that depend on units
+
+    Parameters
+    ----------
+        names : set of str
+            Units that were added or replaced.
+    """
+    global _dimension_index, _unit_db_version
+    from vunits.parse import _parse_cache, _split_units
+    from vunits.system import _unit_systems
+
+    _unit_db_version += 1
+    # The index is rebuilt the next time it is needed
+    _dimension_index = None
+    for units in list(_parse_cache):
+        if any(unit in names for unit, _ in _split_units(units)):
+            del _parse_cache[units]
+    # Caches keyed by unit system. Constants are only checked if they were
+    # imported.
+    system_caches = [_unit_systems]
+    constants = sys.modules.get('vunits.constants')
+    if constants is not None:
+        system_caches.append(constants._in_units_cache)
+    for cache in system_caches:
+        for key in list(cache):
+            for units in key:
+                if units is None:
+                    continue
+                if any(unit in names for unit, _ in _split_units(units)):
+                    del cache[key]
+                    break
+
+_dimension_index = None
+"""dict: Index of ``unit_db`` by dimension. Keys are tuples of powers (see
+:func:`~vunits.quantity._units_key`) and values are tuples of the sorted
+log10 magnitudes and names of candidate units. Built by
+:func:`~vunits.db._get_dimension_index` when first needed."""
+
+def _get_dimension_index():
+    """Helper method to get the index of ``unit_db`` by dimension. Candidate
+    units have magnitudes that are multiples of 1000 (i.e. SI units with
+    engineering prefixes such as kPa or mJ). If more than one unit has the
+    same magnitude, the shortest name is used.
+
+    Returns
+    -------
+        dimension_index : dict
+            Keys are tuples of powers and values are tuples of a
+            np.ndarray of log10 magnitudes in ascending order and a tuple of
+            the corresponding unit names.
+    """
+    global _dimension_index
+    if _dimension_index is not None:
+        return _dimension_index
+    from vunits.quantity import _units_key
+
+    candidates = {}
+    for name, qty_obj in unit_db.items():
+        # Skip temperatures with offsets and dimensionless units
+        if name in _temp_units[1:] or qty_obj._is_dimless():
+            continue
+        log_mag = np.log10(qty_obj.mag)
+        if not np.isclose(log_mag/3., round(log_mag/3.)):
+            continue
+        units_key = _units_key(qty_obj.units)
+        log_mag = 3.*round(log_mag/3.)
+        dim_candidates = candidates.setdefault(units_key, {})
+        prev_name = dim_candidates.get(log_mag)
+        if prev_name is None or (len(name), name) < (len(prev_name),
+                                                     prev_name):
+            dim_candidates[log_mag] = name
+
+    _dimension_index = {}
+    for units_key, dim_candidates in candidates.items():
+        log_mags = sorted(dim_candidates)
+        _dimension_index[units_key] = (np.array(log_mags),
+                                       tuple([dim_candidates[log_mag]
+                                              for log_mag in log_mags]))
+    return _dimension_index
+
+def _find_best_units(mag, units):
+    """Helper method to find the most readable units for magnitudes
+
+    Parameters
+    ----------
+        mag : float or np.ndarray
+            SI magnitude.
+        units : dict
+            Powers of SI units.
+    Returns
+    -------
+        mag_out : float or np.ndarray
+            Magnitude in ``units_out``.
+        units_out : str or np.ndarray
+            Largest candidate unit that does not exceed the magnitude (so the
+            magnitude is between 1 and 1000 when possible). Arrays of
+            magnitudes return an array of unit names. If no candidate units
+            exist for the dimension, SI units are used.
+    """
+    from vunits.quantity import _units_key, _format_units
+    try:
+        log_mags, names = _get_dimension_index()[_units_key(units)]
+    except KeyError:
+        units_str = _format_units(units)
+        if np.ndim(mag) == 0:
+            return mag, units_str
+        return mag, np.full(np.shape(mag), units_str, dtype=object)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_mag = np.log10(np.abs(mag))
+    # Zeros and non-finite magnitudes use the unit closest to SI
+    log_mag = np.where(np.isfinite(log_mag), log_mag, 0.)
+    i = np.searchsorted(log_mags, log_mag + 1.e-9, side='right') - 1
+    i = np.clip(i, 0, len(log_mags) - 1)
+    mag_out = mag/10.**log_mags[i]
+    if np.ndim(mag) == 0:
+        return float(mag_out), names[int(i)]
+    return mag_out, np.array(names, dtype=object)[i]
+
 symmetry_dict = {
     'C1': 1,
     'Cs': 1,
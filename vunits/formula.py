@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.formula
+
+Parses chemical formulas and calculates molar masses using
+:data:`~vunits.db.atomic_weight`.
+"""
+
+import re
+
+import numpy as np
+
+from vunits.db import atomic_weight
+from vunits.quantity import Quantity, _return_quantity
+
+_token_pattern = re.compile(r'([A-Z][a-z]*)(\d*\.?\d*)|(\()|(\))(\d*\.?\d*)')
+"""re.Pattern: Matches elements with counts, opening parentheses and closing
+parentheses with multipliers."""
+
+_atomic_numbers = {
+    'H': 1, 'He': 2, 'Li': 3, 'Be': 4, 'B': 5, 'C': 6, 'N': 7, 'O': 8, 'F': 9,
+    'Ne': 10, 'Na': 11, 'Mg': 12, 'Al': 13, 'Si': 14, 'P': 15, 'S': 16,
+    'Cl': 17, 'Ar': 18, 'K': 19, 'Ca': 20, 'Sc': 21, 'Ti': 22, 'V': 23,
+    'Cr': 24, 'Mn': 25, 'Fe': 26, 'Co': 27, 'Ni': 28, 'Cu': 29, 'Zn': 30,
+    'Ga': 31, 'Ge': 32, 'As': 33, 'Se': 34, 'Br': 35, 'Kr': 36, 'Rb': 37,
+    'Sr': 38, 'Y': 39, 'Zr': 40, 'Nb': 41, 'Mo': 42, 'Tc': 43, 'Ru': 44,
+    'Rh': 45, 'Pd': 46, 'Ag': 47, 'Cd': 48, 'In': 49, 'Sn': 50, 'Sb': 51,
+    'Te': 52, 'I': 53, 'Xe': 54, 'Cs': 55, 'Ba': 56, 'La': 57, 'Ce': 58,
+    'Pr': 59, 'Nd': 60, 'Pm': 61, 'Sm': 62, 'Eu': 63, 'Gd': 64, 'Tb': 65,
+    'Dy': 66, 'Ho': 67, 'Er': 68, 'Tm': 69, 'Yb': 70, 'Lu': 71, 'Hf': 72,
+    'Ta': 73, 'W': 74, 'Re': 75, 'Os': 76, 'Ir': 77, 'Pt': 78, 'Au': 79,
+    'Hg': 80, 'Tl': 81, 'Pb': 82, 'Bi': 83, 'Po': 84, 'At': 85, 'Rn': 86,
+    'Fr': 87, 'Ra': 88, 'Ac': 89, 'Th': 90, 'Pa': 91, 'U': 92, 'Np': 93,
+    'Pu': 94, 'Am': 95, 'Cm': 96, 'Bk': 97, 'Cf': 98, 'Es': 99, 'Fm': 100,
+    'Md': 101, 'No': 102, 'Lr': 103, 'Rf': 104, 'Db': 105, 'Sg': 106,
+    'Bh': 107, 'Hs': 108, 'Mt': 109, 'Ds': 110, 'Rg': 111, 'Cn': 112,
+    'Uut': 113, 'Fl': 114, 'Uup': 115, 'Lv': 116, 'Uuo': 118}
+"""dict: Atomic numbers. Keys are element symbols."""
+
+_symbols = {atomic_number: symbol
+            for symbol, atomic_number in _atomic_numbers.items()}
+"""dict: Element symbols. Keys are atomic numbers."""
+
+_atomic_weights = np.zeros(max(_atomic_numbers.values()) + 1)
+"""np.ndarray: Atomic weights in g/mol indexed by atomic number."""
+for _symbol, _atomic_number in _atomic_numbers.items():
+    _atomic_weights[_atomic_number] = atomic_weight[_symbol]
+
+_formula_cache = {}
+"""dict: Cache of :func:`~vunits.formula.parse_formula` results. Keys are
+formulas and values are dictionaries of atomic numbers and counts."""
+
+def parse_formula(formula):
+    """Counts the elements in a chemical formula
+
+    Parameters
+    ----------
+        formula : str
+            Chemical formula (e.g. 'CH3OH' or 'Ca(OH)2'). Parentheses can be
+            nested.
+    Returns
+    -------
+        elements : dict
+            Keys are element symbols and values are the counts.
+    Raises
+    ------
+        ValueError
+            If the formula cannot be parsed or has unknown elements.
+    """
+    return {_symbols[atomic_number]: count
+            for atomic_number, count in _parse_formula(formula).items()}
+
+def get_element_matrix(formulas):
+    """Counts the elements in chemical formulas
+
+    Parameters
+    ----------
+        formulas : list of str
+            Chemical formulas.
+    Returns
+    -------
+        element_matrix : (N, M) np.ndarray
+            Counts of each element, where N is the number of formulas and M is
+            the largest atomic number plus one. Columns are indexed by atomic
+            number.
+    Raises
+    ------
+        ValueError
+            If a formula cannot be parsed or has unknown elements.
+    """
+    element_matrix = np.zeros((len(formulas), len(_atomic_weights)))
+    for i, formula in enumerate(formulas):
+        elements = _parse_formula(formula)
+        element_matrix[i, list(elements)] = list(elements.values())
+    return element_matrix
+
+def get_molar_mass(formulas, return_quantity=False, units_out='g/mol'):
+    """Calculates molar masses of chemical formulas
+
+    Parameters
+    ----------
+        formulas : str or list of str
+            Chemical formulas.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns float or np.ndarray.
+        units_out : str, optional
+            Units of the molar masses (e.g. 'kg/mol'). Default is 'g/mol'.
+    Returns
+    -------
+        molar_mass : float, np.ndarray or :class:`~vunits.quantity.Quantity`
+            Molar masses. If ``formulas`` is a str, a single value is
+            returned.
+    """
+    if isinstance(formulas, str):
+        molar_mass = get_element_matrix([formulas])[0] @ _atomic_weights
+    else:
+        molar_mass = get_element_matrix(formulas) @ _atomic_weights
+    qty_out = Quantity.from_units(mag=molar_mass, units='g/mol')
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity,
+                            units_out=units_out)
+
+def _parse_formula(formula):
+    """Helper method to count the elements in a formula. Results are cached.
+
+    Parameters
+    ----------
+        formula : str
+            Chemical formula.
+    Returns
+    -------
+        elements : dict
+            Keys are atomic numbers and values are counts. Should not be
+            modified since it may be cached.
+    Raises
+    ------
+        ValueError
+            If the formula cannot be parsed or has unknown elements.
+    """
+    try:
+        return _formula_cache[formula]
+    except KeyError:
+        pass
+
+    # Each level of parentheses has its own counts
+    stack = [{}]
+    position = 0
+    for match in _token_pattern.finditer(formula):
+        if match.start() != position:
+            break
+        position = match.end()
+        symbol, count, open_paren, close_paren, multiplier = match.groups()
+        if symbol is not None:
+            try:
+                atomic_number = _atomic_numbers[symbol]
+            except KeyError:
+                err_msg = ('When trying to parse "{}", encountered element '
+                           '"{}", which is not supported.'
+                           ''.format(formula, symbol))
+                raise ValueError(err_msg)
+            count = _get_count(count, formula)
+            stack[-1][atomic_number] = stack[-1].get(atomic_number, 0.) + count
+        elif open_paren is not None:
+            stack.append({})
+        else:
+            if len(stack) == 1:
+                err_msg = ('Formula "{}" has unmatched parentheses.'
+                           ''.format(formula))
+                raise ValueError(err_msg)
+            multiplier = _get_count(multiplier, formula)
+            group = stack.pop()
+            if len(group) == 0:
+                err_msg = 'Formula "{}" has empty parentheses.'.format(formula)
+                raise ValueError(err_msg)
+            for atomic_number, count in group.items():
+                stack[-1][atomic_number] = (stack[-1].get(atomic_number, 0.)
+                                            + count*multiplier)
+    if position != len(formula) or len(stack) != 1 or formula == '':
+        err_msg = 'Formula "{}" could not be parsed.'.format(formula)
+        raise ValueError(err_msg)
+    elements = stack[0]
+    _formula_cache[formula] = elements
+    return elements
+
+def _get_count(count, formula):
+    """Helper method to read the count of an element or group
+
+    Parameters
+    ----------
+        count : str
+            Digits after the element or closing parenthesis. May be empty.
+        formula : str
+            Chemical formula. Used for error messages.
+    Returns
+    -------
+        count : float
+            Count. 1 if ``count`` is empty.
+    Raises
+    ------
+        ValueError
+            If the count is not a positive number.
+    """
+    if count == '':
+        return 1.
+    try:
+        count_out = float(count)
+    except ValueError:
+        count_out = 0.
+    if count_out <= 0.:
+        err_msg = ('Formula "{}" has an invalid count, "{}". Counts must be '
+                   'positive numbers.'.format(formula, count))
+        raise ValueError(err_msg)
+    return count_out
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.io
+
+Saving and loading :class:`~vunits.quantity.Quantity` objects.
+"""
+
+import os
+import json
+import struct
+
+import numpy as np
+
+from vunits.quantity import Quantity
+
+_magic = b'VUNITS01'
+"""bytes: Marks the end of files written by :func:`~vunits.io.save`."""
+
+_footer_struct = struct.Struct('<Q8s')
+"""struct.Struct: Length of the metadata and magic bytes at the end of
+files."""
+
+def save(path, quantity):
+    """Saves a :class:`~vunits.quantity.Quantity` to a .npy file
+
+    The magnitude is written in the .npy format and the units are appended
+    after the data as JSON. The file can still be read using ``numpy.load``,
+    which ignores the units.
+
+    Parameters
+    ----------
+        path : str
+            Name of the file. The name is used as is (i.e. '.npy' is not
+            appended).
+        quantity : :class:`~vunits.quantity.Quantity`
+            Quantity to save. The magnitude is saved in SI units.
+    """
+    mag = np.asanyarray(quantity.mag)
+    metadata = json.dumps({'units': dict(quantity.units)}).encode('utf-8')
+    with open(path, 'wb') as f_ptr:
+        np.lib.format.write_array(f_ptr, mag, allow_pickle=False)
+        f_ptr.write(metadata)
+        f_ptr.write(_footer_struct.pack(len(metadata), _magic))
+
+def load(path, mmap_mode='r'):
+    """Loads a :class:`~vunits.quantity.Quantity` saved using
+    :func:`~vunits.io.save`
+
+    Parameters
+    ----------
+        path : str
+            Name of the file.
+        mmap_mode : str, optional
+            Memory-map mode passed to ``numpy.load``. The default, 'r', maps
+            the file read-only so processes loading the same file share its
+            memory. Use None to read the data into memory.
+    Returns
+    -------
+        quantity : :class:`~vunits.quantity.Quantity`
+            Loaded quantity. Files without units (e.g. written by
+            ``numpy.save``) are dimensionless.
+    """
+    units = _read_units(path)
+    mag = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+    if mag.ndim == 0:
+        mag = mag[()]
+    if units is None:
+        return Quantity(mag=mag)
+    return Quantity._from_qty(units=units, mag=mag)
+
+def save_archive(path, quantities):
+    """Saves named :class:`~vunits.quantity.Quantity` objects to a directory
+
+    Each quantity is saved to '<name>.npy' using :func:`~vunits.io.save` so
+    each one can be memory-mapped when loaded.
+
+    Parameters
+    ----------
+        path : str
+            Name of the directory. Created if it does not exist.
+        quantities : dict
+            Keys are the names of the quantities and values are
+            :class:`~vunits.quantity.Quantity` objects.
+    Raises
+    ------
+        ValueError
+            If a name cannot be used as a file name.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name, quantity in quantities.items():
+        if name != os.path.basename(name) or name in ('', '.', '..'):
+            err_msg = ('Name "{}" cannot be used as a file name.'.format(name))
+            raise ValueError(err_msg)
+        save(path=os.path.join(path, '{}.npy'.format(name)),
+             quantity=quantity)
+
+def load_archive(path, mmap_mode='r'):
+    """Loads named :class:`~vunits.quantity.Quantity` objects saved using
+    :func:`~vunits.io.save_archive`
+
+    Parameters
+    ----------
+        path : str
+            Name of the directory.
+        mmap_mode : str, optional
+            Memory-map mode passed to ``numpy.load``. Default is 'r'.
+    Returns
+    -------
+        quantities : dict
+            Keys are the names of the quantities and values are
+            :class:`~vunits.quantity.Quantity` objects.
+    """
+    quantities = {}
+    for filename in sorted(os.listdir(path)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.npy':
+            continue
+        quantities[name] = load(path=os.path.join(path, filename),
+                                mmap_mode=mmap_mode)
+    return quantities
+
+def write_table(path, quantities, units=None, fmt='%.18e', delimiter=None):
+    """Writes :class:`~vunits.quantity.Quantity` arrays to a CSV or TSV file
+
+    Each quantity is written as a column with a header of the form
+    'name [units]'. Numbers are formatted by ``numpy.savetxt`` instead of
+    converting each :class:`~vunits.quantity.Quantity` to a string.
+
+    Parameters
+    ----------
+        path : str or path-like
+            Name of the file.
+        quantities : dict
+            Keys are the names of the columns and values are
+            :class:`~vunits.quantity.Quantity` objects with the same length.
+            2D quantities are written as one column per element of the second
+            axis, named 'name_0', 'name_1', ...
+        units : dict, optional
+            Keys are names of columns and values are the units to write them
+            in (e.g. {'T': 'oC'}). Columns not specified are written in SI
+            units (or in the active unit system).
+        fmt : str, optional
+            Format of the numbers passed to ``numpy.savetxt``. Default is
+            '%.18e'.
+        delimiter : str, optional
+            Separator between columns. If not specified, a tab is used for
+            files ending in '.tsv' and a comma otherwise.
+    Raises
+    ------
+        ValueError
+            If the quantities have different lengths or more than two
+            dimensions.
+    """
+    from vunits.system import _active_system
+    if units is None:
+        units = {}
+    if delimiter is None:
+        delimiter = '\t' if os.fspath(path).endswith('.tsv') else ','
+    system = _active_system.get()
+
+    columns = []
+    headers = []
+    for name, quantity in quantities.items():
+        mag = np.asarray(quantity(units.get(name)))
+        if mag.ndim > 2:
+            err_msg = ('Quantity "{}" has {} dimensions. Only 1D and 2D '
+                       'quantities can be written.'.format(name, mag.ndim))
+            raise ValueError(err_msg)
+        if name in units:
+            units_str = units[name]
+        elif system is not None:
+            units_str = system.units_str(quantity.units)
+        else:
+            units_str = quantity.units_str
+        if mag.ndim == 2:
+            names = ['{}_{}'.format(name, i) for i in range(mag.shape[1])]
+        else:
+            names = [name]
+            mag = mag.reshape(-1, 1)
+        for column_name in names:
+            if units_str == '':
+                headers.append(column_name)
+            else:
+                headers.append('{} [{}]'.format(column_name, units_str))
+        columns.append(mag)
+
+    lengths = set([len(mag) for mag in columns])
+    if len(lengths) > 1:
+        err_msg = ('Quantities must have the same length to be written as a '
+                   'table, not {}.'.format(sorted(lengths)))
+        raise ValueError(err_msg)
+    np.savetxt(path, np.hstack(columns), fmt=fmt, delimiter=delimiter,
+               header=delimiter.join(headers), comments='')
+
+def _read_units(path):
+    """Helper method to read the units at the end of a file
+
+    Parameters
+    ----------
+        path : str
+            Name of the file
+    Returns
+    -------
+        units : dict or None
+            Units of the quantity. None if the file does not have units.
+    """
+    with open(path, 'rb') as f_ptr:
+        f_ptr.seek(0, os.SEEK_END)
+        size = f_ptr.tell()
+        if size < _footer_struct.size:
+            return None
+        f_ptr.seek(size - _footer_struct.size)
+        length, magic = _footer_struct.unpack(f_ptr.read(_footer_struct.size))
+        if magic != _magic:
+            return None
+        f_ptr.seek(size - _footer_struct.size - length)
+        metadata = json.loads(f_ptr.read(length).decode('utf-8'))
+    return metadata['units']
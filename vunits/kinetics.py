@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.kinetics
+
+Boltzmann factors and rate constants evaluated over arrays of energies and
+temperatures.
+"""
+
+import numpy as np
+
+from vunits.quantity import Quantity, _force_get_quantity, _return_quantity
+from vunits import constants as c
+
+def boltzmann_factor(energy, T, units_in='J/mol', T_units='K', log=False,
+                     return_quantity=False):
+    """Calculates Boltzmann factors, exp(-E/kT)
+
+    Parameters
+    ----------
+        energy : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Energies. Molar energies (e.g. kcal/mol) are divided by ``R`` and
+            particle energies (e.g. eV) are divided by ``kb``.
+        T : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures. ``energy`` and ``T`` are broadcasted (e.g. use
+            ``energy[:, None]`` for a reaction x temperature grid).
+        units_in : str, optional
+            Units of ``energy`` if it is not a
+            :class:`~vunits.quantity.Quantity`. Default is 'J/mol'.
+        T_units : str, optional
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is 'K'.
+        log : bool, optional
+            If True, returns the natural logarithm of the Boltzmann factors,
+            which does not underflow for large energies. Default is False.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns float or np.ndarray. Default is False.
+    Returns
+    -------
+        factor : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Dimensionless Boltzmann factors.
+    """
+    log_factor = -_get_reduced_energy(energy=energy, T=T, units_in=units_in,
+                                      T_units=T_units)
+    mag = log_factor if log else np.exp(log_factor)
+    return _return_quantity(quantity=Quantity(mag=mag),
+                            return_quantity=return_quantity)
+
+def arrhenius(A, Ea, T, n=0., A_units='', Ea_units='J/mol', T_units='K',
+              T_ref=1., return_quantity=False, units_out=None):
+    """Calculates rate constants using the modified Arrhenius equation,
+    k = A (T/T_ref)^n exp(-Ea/RT)
+
+    The temperature dependence is evaluated as a single exponential,
+    exp(n ln(T/T_ref) - Ea/RT), so large ``n`` or ``Ea`` do not overflow
+    intermediate results.
+
+    Parameters
+    ----------
+        A : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Pre-exponential factors. Their units are the units of the rate
+            constants.
+        Ea : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Activation energies. Molar or particle energies are accepted.
+        T : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures. ``A``, ``Ea``, ``n`` and ``T`` are broadcasted (e.g.
+            use ``Ea[:, None]`` for a reaction x temperature grid).
+        n : float or np.ndarray, optional
+            Temperature exponents. Default is 0.
+        A_units : str, optional
+            Units of ``A`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is '' (dimensionless).
+        Ea_units : str, optional
+            Units of ``Ea`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is 'J/mol'.
+        T_units : str, optional
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is 'K'.
+        T_ref : float, optional
+            Reference temperature in K for the temperature exponent. Default
+            is 1.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns float or np.ndarray. Default is False.
+        units_out : str, optional
+            Units of the rate constants if ``return_quantity`` is False. If
+            not specified, SI units (or the active unit system) are used.
+    Returns
+    -------
+        k : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Rate constants with the units of ``A``.
+    """
+    A_in = _force_get_quantity(obj=A, units=A_units)
+    T_in = _get_temperature(T=T, T_units=T_units)
+    reduced_energy = _get_reduced_energy(energy=Ea, T=T_in, units_in=Ea_units,
+                                         T_units=T_units)
+    exponent = np.asarray(n)*np.log(T_in.mag/T_ref) - reduced_energy
+    qty_out = Quantity._from_qty(units=A_in.units,
+                                 mag=A_in.mag*np.exp(exponent))
+    return _return_quantity(quantity=qty_out, return_quantity=return_quantity,
+                            units_out=units_out)
+
+def _get_temperature(T, T_units):
+    """Helper method to get temperatures as a
+    :class:`~vunits.quantity.Quantity`
+
+    Parameters
+    ----------
+        T : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures
+        T_units : str
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`
+    Returns
+    -------
+        T_out : :class:`~vunits.quantity.Quantity` obj
+            Temperatures
+    Raises
+    ------
+        TypeError
+            If ``T`` does not have units of temperature.
+    """
+    T_out = _force_get_quantity(obj=T, units=T_units)
+    if not T_out._is_temp():
+        err_msg = 'Temperature expected but received {}.'.format(str(T_out))
+        raise TypeError(err_msg)
+    return T_out
+
+def _get_reduced_energy(energy, T, units_in, T_units):
+    """Helper method to calculate E/kT. Units are resolved once so the
+    calculation is done using magnitudes.
+
+    Parameters
+    ----------
+        energy : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Molar or particle energies
+        T : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures
+        units_in : str
+            Units of ``energy`` if it is not a
+            :class:`~vunits.quantity.Quantity`
+        T_units : str
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`
+    Returns
+    -------
+        reduced_energy : float or np.ndarray
+            Dimensionless energies
+    Raises
+    ------
+        TypeError
+            If ``energy`` does not have units of molar or particle energy.
+    """
+    energy_in = _force_get_quantity(obj=energy, units=units_in)
+    T_in = _get_temperature(T=T, T_units=T_units)
+    if energy_in.units == Quantity.from_units(units='J/mol').units:
+        k = c.R.mag
+    elif energy_in.units == Quantity.from_units(units='J').units:
+        k = c.kb.mag
+    else:
+        err_msg = ('Energy expected but received {}.'.format(str(energy_in)))
+        raise TypeError(err_msg)
+    return np.asarray(energy_in.mag)/(k*np.asarray(T_in.mag))
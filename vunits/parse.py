@@ -1,8 +1,11 @@
 import re
-from vunits.quantity import Quantity
+from collections import OrderedDict
+
+import numpy as np
+from vunits.quantity import Quantity, _apply_factor
 from vunits.db import unit_db, _temp_units
 
-def _parse_unit(mag=1., units='', unit_db=None):
+def _parse_unit(mag=1., units='', unit_db=None, copy=True):
     """Helper method to parse units
 
     Parameters
@@ -18,61 +21,144 @@ def _parse_unit(mag=1., units='', unit_db=None):
             expected units and values are :class:`~vunits.quantity.Quantity`
             objects. If ``unit_db`` is not specified, uses the
             ``vunits.db.unit_db``.
+        copy : bool, optional
+            If True (default), arrays in SI units are copied so the new
+            object does not share memory with ``mag``. If False, they are
+            wrapped without copying (e.g. for
+            :meth:`~vunits.quantity.Quantity.from_buffer`).
     Returns
     -------
         quantity : :class:`~vunits.quantity.Quantity`
             New quantity object.
     """
-    # Load appropriate database
-    if unit_db is None:
-        from vunits.db import unit_db as vunits_units_db
-        unit_db = vunits_units_db
     # Check if temperature unit and parse independently
     if units in _temp_units:
         from vunits.convert import convert_temp
-        mag = convert_temp(num=mag, initial=units, final='K')
-        quantity_out = Quantity(mag=mag, K=1.)
+        mag_out = convert_temp(num=mag, initial=units, final='K')
+        quantity_out = Quantity(mag=mag_out, K=1.)
     else:
-        # Separate numerators
-        units_list1 = units.split(' ')
-
-        # Separate denominators
-        units_list2 = []
-        units_pow2 = []
-        for coupled_units in units_list1:
-            units_list = coupled_units.split('/')
-            units_list2.extend(units_list)
+        factor, units_out = _parse_factor(units=units, unit_db=unit_db)
+        # Create Quantity object
+        quantity_out = Quantity._from_qty(units=units_out, mag=mag)
+        # SI units do not need to be multiplied
+        if factor != 1.:
+            quantity_out.mag = _apply_factor(quantity_out.mag, factor)
+    if copy and quantity_out.mag is mag and isinstance(mag, np.ndarray):
+        quantity_out.mag = mag.copy()
+    return quantity_out
 
-            # Add powers
-            units_pow = [1] + [-1]*(len(units_list)-1)
-            units_pow2.extend(units_pow)
+def _parse_factor(units='', unit_db=None):
+    """Helper method to find the SI magnitude and units of a unit string.
+    Results using the default unit database or a
+    :class:`~vunits.registry.UnitRegistry` are cached.
 
-        # Remove powers if any
-        units_list3 = []
-        units_pow3 = []
-        # Pattern detects powers given to units. e.g. J^2, m10, s-2
-        power_pattern = re.compile(r'\^*-*[0-9]*\.*[0-9]+')
-        for i, units2 in enumerate(units_list2):
-            match = power_pattern.search(units2)
-            if match is None:
-                power_str = ''
-                power_float = float(units_pow2[i])
-            else:
-                power_str = match.group(0)
-                # Remove ^ character and convert to a float
-                power_float = float(power_str.replace('^', ''))*units_pow2[i]
-            unit = units2.replace(power_str, '')
-            units_list3.append(unit)
-            units_pow3.append(power_float)
+    Parameters
+    ----------
+        units : str, optional
+            Units to parse. Different units must be sparated by a space (' ') or
+            forward slash ('/'). Supports powers as numbers after units.
+            e.g. 'cm/s2', 'cm s-2', or 'cm s^-2'. Default is ''.
+        unit_db : dict, optional
+            Unit database to use parse units. If ``unit_db`` is not specified,
+            uses the ``vunits.db.unit_db``.
+    Returns
+    -------
+        factor : float
+            Magnitude of ``units`` in SI units.
+        units_out : dict
+            Powers of SI units. Should not be modified since it may be cached.
+    """
+    # Load appropriate database
+    if unit_db is None:
+        from vunits.db import unit_db as vunits_units_db
+        parse_cache = _parse_cache
+        unit_db = vunits_units_db
+    else:
+        # Registries keep their own cache
+        try:
+            parse_cache = unit_db._get_parse_cache()
+        except AttributeError:
+            parse_cache = None
+    if parse_cache is not None:
+        try:
+            out = parse_cache[units]
+            parse_cache.move_to_end(units)
+        except KeyError:
+            pass
+        else:
+            return out
 
-        # Create Quantity object
-        quantity_out = Quantity(mag=mag)
-        for unit, power in zip(units_list3, units_pow3):
+    quantity_out = Quantity()
+    for unit, power in _split_units(units):
+        try:
+            quantity_out *= unit_db[unit]**power
+        except KeyError:
+            err_msg = ('When trying to parse "{}", encountered unit "{}", '
+                       'which is not supported.'
+                       ''.format(units, unit))
+            raise ValueError(err_msg)
+    out = (quantity_out.mag, quantity_out.units)
+    if parse_cache is not None:
+        parse_cache[units] = out
+        # Least recently used unit strings are discarded
+        while len(parse_cache) > _parse_cache_maxsize:
             try:
-                quantity_out *= unit_db[unit]**power
+                parse_cache.popitem(last=False)
             except KeyError:
-                err_msg = ('When trying to parse "{}", encountered unit "{}", '
-                           'which is not supported.'
-                           ''.format(units, unit))
-                raise ValueError(err_msg)
-    return quantity_out
+                break
+    return out
+
+def _split_units(units):
+    """Helper method to split a unit string into individual units and powers
+
+    Parameters
+    ----------
+        units : str
+            Units to split. Different units must be sparated by a space (' ') or
+            forward slash ('/'). Supports powers as numbers after units.
+            e.g. 'cm/s2', 'cm s-2', or 'cm s^-2'.
+    Returns
+    -------
+        units_powers : list of tuple
+            Each element is a tuple whose first element is the unit (str) and
+            the second element is the power (float).
+    """
+    # Separate numerators
+    units_list1 = units.split(' ')
+
+    # Separate denominators
+    units_list2 = []
+    units_pow2 = []
+    for coupled_units in units_list1:
+        units_list = coupled_units.split('/')
+        units_list2.extend(units_list)
+
+        # Add powers
+        units_pow = [1] + [-1]*(len(units_list)-1)
+        units_pow2.extend(units_pow)
+
+    # Remove powers if any
+    units_powers = []
+    for i, units2 in enumerate(units_list2):
+        match = _power_pattern.search(units2)
+        if match is None:
+            power_str = ''
+            power_float = float(units_pow2[i])
+        else:
+            power_str = match.group(0)
+            # Remove ^ character and convert to a float
+            power_float = float(power_str.replace('^', ''))*units_pow2[i]
+        unit = units2.replace(power_str, '')
+        units_powers.append((unit, power_float))
+    return units_powers
+
+_parse_cache = OrderedDict()
+"""collections.OrderedDict: Cache of :func:`~vunits.parse._parse_factor`
+results using the default unit database. Keys are unit strings, ordered from
+least to most recently used."""
+
+_parse_cache_maxsize = 1024
+"""int: Maximum number of unit strings stored in each parse cache."""
+
+_power_pattern = re.compile(r'\^*-*[0-9]*\.*[0-9]+')
+"""re.Pattern: Pattern detects powers given to units. e.g. J^2, m10, s-2"""
@@ -1,9 +1,34 @@
 import math
+import zlib
+import base64
+import mmap
+import array
+import pickle
+import random
 from warnings import warn
+from functools import lru_cache
+from contextlib import contextmanager
+from types import MappingProxyType
 from collections import defaultdict
 
 import numpy as np
 
+from vunits.system import _active_system
+
+_unit_keys = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+"""tuple: Keys of :attr:`~vunits.quantity.Quantity.units` in order."""
+
+_bytes_types = (bytes, bytearray, mmap.mmap)
+"""tuple: Types of raw buffers wrapped as arrays using ``np.frombuffer``."""
+
+_buffer_types = _bytes_types + (memoryview, array.array)
+"""tuple: Types of buffers accepted as magnitudes without copying."""
+
+_check_fraction = 1.
+"""float: Fraction of operations whose units are checked. Modified using
+:func:`~vunits.quantity.unchecked` or
+:func:`~vunits.quantity.set_check_fraction`."""
+
 class Quantity:
     """Represents a quantity with units
 
@@ -11,6 +36,9 @@ class Quantity:
     ----------
         mag : float, optional
             Magnitude of :class:`~vunits.quantity.Quantity`. Default is 1.
+            Buffers (memoryview, array.array, bytes, bytearray and mmap) are
+            wrapped as arrays without copying. Raw bytes are interpreted as
+            float64 unless ``dtype`` is specified.
         m : float, optional
             Power of meter (length). Default is 0.
         kg : float, optional
@@ -25,13 +53,21 @@ class Quantity:
             Power of moles (amount of substance). Default is 0.
         cd : float, optional
             Power of candela (luminous intensity). Default is 0.
+        dtype : data-type, optional
+            Data type of the magnitude (e.g. np.float32 to halve the memory of
+            large arrays). If not specified, lists are converted to arrays
+            using numpy's default type and other magnitudes are used as is.
     """
 
     def __init__(self, mag=1., m=0., kg=0., s=0., A=0., K=0., mol=0.,
-                 cd=0.):
+                 cd=0., dtype=None):
         # Convert magnitude list to numpy array without altering original list
         mag_in = mag
-        if isinstance(mag, list):
+        if isinstance(mag, _buffer_types):
+            mag_in = _buffer_to_array(mag, dtype=dtype)
+        elif dtype is not None:
+            mag_in = _as_dtype(mag, dtype)
+        elif isinstance(mag, list):
             mag_in = np.array(mag)
         self.mag = mag_in
         self._units = {'m': m, 'kg': kg, 's': s, 'A': A, 'K': K,
@@ -75,7 +111,7 @@ class Quantity:
     
     @m.setter
     def m(self, val):
-        self._units['m'] = val
+        self._units = {**self._units, 'm': val}
 
     @property
     def length(self):
@@ -88,7 +124,7 @@ class Quantity:
     
     @kg.setter
     def kg(self, val):
-        self._units['kg'] = val
+        self._units = {**self._units, 'kg': val}
 
     @property
     def mass(self):
@@ -101,7 +137,7 @@ class Quantity:
     
     @s.setter
     def s(self, val):
-        self._units['s'] = val
+        self._units = {**self._units, 's': val}
 
     @property
     def time(self):
@@ -114,7 +150,7 @@ class Quantity:
     
     @A.setter
     def A(self, val):
-        self._units['A'] = val
+        self._units = {**self._units, 'A': val}
 
     @property
     def current(self):
@@ -127,7 +163,7 @@ class Quantity:
     
     @K.setter
     def K(self, val):
-        self._units['K'] = val
+        self._units = {**self._units, 'K': val}
 
     @property
     def temperature(self):
@@ -140,7 +176,7 @@ class Quantity:
     
     @mol.setter
     def mol(self, val):
-        self._units['mol'] = val
+        self._units = {**self._units, 'mol': val}
 
     @property
     def amount(self):
@@ -153,7 +189,7 @@ class Quantity:
     
     @cd.setter
     def cd(self, val):
-        self._units['cd'] = val
+        self._units = {**self._units, 'cd': val}
 
     @property
     def intensity(self):
@@ -162,57 +198,51 @@ class Quantity:
 
     @property
     def units_str(self):
-        str_out = ''
-        for unit, power in self.units.items():
-            int_power = int(round(power))
-            # Skip if no contribution from quantity
-            if power == 0:
-                continue
-            # Add unit with appropriate power
-            if np.isclose(power, 1.):
-                str_out += ' {}'.format(unit)
-            elif np.isclose(power, int_power):
-                str_out += ' {}^{}'.format(unit, int_power)
-            else:
-                str_out += ' {}^{}'.format(unit, power)
-        # Remove leading space
-        str_out = str_out.strip()
-        return str_out
+        """str: SI units as a string. Strings are cached by dimension."""
+        return _get_units_str(_units_key(self._units))
     
     def __pos__(self):
-        return Quantity._from_qty(units=self.units, mag=self.mag)
+        return Quantity._new(units=_copy_units(self.units), mag=self.mag)
     
     def __neg__(self):
-        return Quantity._from_qty(units=self.units, mag=-self.mag)
+        return Quantity._new(units=_copy_units(self.units), mag=-self.mag)
 
     def __abs__(self):
-        return Quantity._from_qty(units=self.units, mag=np.abs(self.mag))
+        return Quantity._new(units=_copy_units(self.units),
+                             mag=np.abs(self.mag))
 
     def __round__(self, n):
-        return Quantity._from_qty(units=self.units, mag=round(self.mag, n))
+        return Quantity._new(units=_copy_units(self.units),
+                             mag=round(self.mag, n))
 
     def __floor__(self):
-        return Quantity._from_qty(units=self.units, mag=math.floor(self.mag))
+        return Quantity._new(units=_copy_units(self.units),
+                             mag=math.floor(self.mag))
 
     def __ceil__(self):
-        return Quantity._from_qty(units=self.units, mag=math.ceil(self.mag))
+        return Quantity._new(units=_copy_units(self.units),
+                             mag=math.ceil(self.mag))
 
     def __trunc__(self):
-        return Quantity._from_qty(units=self.units, mag=math.trunc(self.mag))
+        return Quantity._new(units=_copy_units(self.units),
+                             mag=math.trunc(self.mag))
 
     def __iadd__(self, other):
-        err_msg = ('Addition incompatible due to different units, {} and {}.'
-                   ''.format(str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, add value and return simpler type
-            if self._is_dimless():
-                self.mag += other
-            else:
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Addition incompatible due to different units, {} '
+                           'and {}.'.format(str(self), str(other)))
                 raise TypeError(err_msg)
+            self.mag += other
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Addition incompatible due to different units, {} '
+                           'and {}.'.format(str(self), str(other)))
                 raise TypeError(err_msg)
 
             # Create new Quantity object with same units and values added
@@ -224,6 +254,8 @@ class Quantity:
         return self
 
     def __imul__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             self.mag *= other
@@ -232,6 +264,44 @@ class Quantity:
             self.mag *= other.mag
         return self
 
+    def __getitem__(self, key):
+        # Basic indexing and slicing return views of the magnitude. The units
+        # dictionary is shared since setters do not modify it in place.
+        return Quantity._new(mag=self.mag[key], units=self.units)
+
+    def __setitem__(self, key, value):
+        other_units = self._get_other_units(value)
+        if other_units is None:
+            # If self is dimensionless, assign value
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Assignment incompatible due to different units, {} '
+                           'and {}.'.format(str(self), str(value)))
+                raise TypeError(err_msg)
+            self.mag[key] = value
+        else:
+            # Check if units are the same
+            if _check_units() and self.units != other_units:
+                err_msg = ('Assignment incompatible due to different units, {} '
+                           'and {}.'.format(str(self), str(value)))
+                raise TypeError(err_msg)
+            self.mag[key] = value.mag
+
+    def __len__(self):
+        return len(self.mag)
+
+    def __iter__(self):
+        if np.ndim(self.mag) == 0:
+            err_msg = ('Iteration over a scalar Quantity, {}, is not '
+                       'supported.'.format(str(self)))
+            raise TypeError(err_msg)
+        units = self.units
+        return (Quantity._new(mag=mag, units=units) for mag in self.mag)
+
+    def __bool__(self):
+        # Objects are always truthy (e.g. so ``if qty:`` detects None) even
+        # though ``__len__`` is defined for array magnitudes
+        return True
+
     def __int__(self):
         return int(self.mag)
 
@@ -239,7 +309,12 @@ class Quantity:
         return float(self.mag)
 
     def __str__(self):
-        str_out = '{} {}'.format(self.mag, self.units_str)
+        system = _active_system.get()
+        if system is None:
+            str_out = '{} {}'.format(self.mag, self.units_str)
+        else:
+            factor, units_str = system._resolve(self.units)
+            str_out = '{} {}'.format(self.mag/factor, units_str)
         return str_out
     
     def __repr__(self):
@@ -263,24 +338,29 @@ class Quantity:
             out : :class:`~vunits.quantity.Quantity` or other object
                 Result of sum.
         """
-        err_msg = ('{} incompatible due to different units, {} and {}.'
-                   ''.format(operation, str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
-            if not self._is_dimless():
+            if _check_units() and not self._is_dimless():
+                err_msg = ('{} incompatible due to different units, {} and {}.'
+                           ''.format(operation, str(self), str(other)))
                 raise TypeError(err_msg)
 
             # Add value and return simpler type
             out = self.mag + other
             if return_quantity:
-                out = Quantity._from_qty(units=self.units, mag=out)
+                out = Quantity._new(units=_copy_units(self.units), mag=out)
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('{} incompatible due to different units, {} and {}.'
+                           ''.format(operation, str(self), str(other)))
                 raise TypeError(err_msg)
 
             # Create new Quantity object with same units and values added
-            out = Quantity._from_qty(units=self.units, mag=self.mag+other.mag)
+            out = Quantity._new(units=_copy_units(self.units),
+                                mag=self.mag+other.mag)
         return out
 
     def __add__(self, other):
@@ -293,131 +373,155 @@ class Quantity:
         return self.add(other=-other, operation='Subtraction')
 
     def __rsub__(self, other):
-        err_msg = ('Subtraction incompatible due to different units, {} and {}.'
-                   ''.format(str(self), str(other)))
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, add value and return simpler type
-            if not self._is_dimless():
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Subtraction incompatible due to different units, '
+                           '{} and {}.'.format(str(self), str(other)))
                 raise TypeError(err_msg)
             out = other - self.mag
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Subtraction incompatible due to different units, '
+                           '{} and {}.'.format(str(self), str(other)))
                 raise TypeError(err_msg)
             # Create new Quantity object with same units and values added
-            out = Quantity._from_qty(units=self.units, mag=other.mag-self.mag)
+            out = Quantity._new(units=_copy_units(self.units),
+                                mag=other.mag-self.mag)
         return out
 
     def __mul__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If other is dimensionless, add value and return Unit type
-            out = Quantity._from_qty(units=self.units, mag=self.mag*other)
+            out = Quantity._new(units=_copy_units(self.units),
+                                mag=self.mag*other)
         else:
             out_units = _add_units(self.units, other_units)
-            out = Quantity._from_qty(mag=self.mag*other.mag, units=out_units)
+            out = Quantity._new(mag=self.mag*other.mag, units=out_units)
         return out
     
     def __rmul__(self, other):
         return self.__mul__(other=other)
 
     def __floordiv__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If other is dimensionless, add value and return Unit type
-            out = Quantity._from_qty(units=self.units, mag=self.mag//other)
+            out = Quantity._new(units=_copy_units(self.units),
+                                mag=self.mag//other)
         else:
             out_units = _sub_units(self.units, other_units)            
-            out = Quantity._from_qty(mag=self.mag//other.mag, units=out_units)
+            out = Quantity._new(mag=self.mag//other.mag, units=out_units)
         return out
 
     def __rfloordiv__(self, other):
         other_units = self._get_other_units(other)
         if other_units is None:
             # If other is dimensionless, floor divide the magnitude
-            out = Quantity._from_qty(units=_neg_units(self.units), mag=other//self.mag)
+            out = Quantity._new(units=_neg_units(self.units),
+                                mag=other//self.mag)
         else:
             out_units = _sub_units(other_units, self.units)
-            out = Quantity._from_qty(mag=other.mag//self.mag, units=out_units)
+            out = Quantity._new(mag=other.mag//self.mag, units=out_units)
         return out
 
     def __truediv__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If other is dimensionless, divide the magnitude
-            out = Quantity._from_qty(units=self.units, mag=self.mag/other)
+            out = Quantity._new(units=_copy_units(self.units),
+                                mag=self.mag/other)
         else:
             out_units = _sub_units(self.units, other_units)
-            out = Quantity._from_qty(mag=self.mag/other.mag, units=out_units)
+            out = Quantity._new(mag=self.mag/other.mag, units=out_units)
         return out
 
     def __rtruediv__(self, other):
         other_units = self._get_other_units(other)
         if other_units is None:
             # If other is dimensionless, add value and return Unit type
-            out = Quantity._from_qty(units=_neg_units(self.units),
-                                     mag=other/self.mag)
+            out = Quantity._new(units=_neg_units(self.units),
+                                mag=other/self.mag)
         else:
             out_units = _sub_units(other_units, self.units)
-            out = Quantity._from_qty(mag=other.mag/self.mag,
-                                     units=out_units)
+            out = Quantity._new(mag=other.mag/self.mag, units=out_units)
         return out
 
     def __pow__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             mag = self.mag**other
             units = _mul_units(self.units, other)
-        elif other._is_dimless():
+        elif not _check_units() or other._is_dimless():
             mag = self.mag**other.mag
             units = _mul_units(self.units, other.mag)
         else:
             err_msg = ('Power operation incompatible exponent with units, {}.'
                        ''.format(str(other)))
             raise TypeError(err_msg)
-        out = Quantity._from_qty(mag=mag, units=units)
+        out = Quantity._new(mag=mag, units=units)
         return out
 
     def __lt__(self, other):
-        err_msg = ('Less than operation incompatible due to different units, {}'
-                   ' and {}.'
-                   ''.format(str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, compare magnitudes
-            if self._is_dimless():
-                out = self.mag < other
-            else:
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Less than operation incompatible due to different units, {}'
+                           ' and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
+            out = self.mag < other
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Less than operation incompatible due to different units, {}'
+                           ' and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
             # Compare magnitudes
             out = self.mag < other.mag
         return out
 
     def __le__(self, other):
-        err_msg = ('Less than or equal to operation incompatible due to '
-                   'different units, {} and {}.'
-                   ''.format(str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, compare magnitudes
-            if self._is_dimless():
-                out = self.mag <= other
-            else:
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Less than or equal to operation incompatible due to '
+                           'different units, {} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
+            out = self.mag <= other
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Less than or equal to operation incompatible due to '
+                           'different units, {} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
             # Compare magnitudes
             out = self.mag <= other.mag
         return out
 
     def __eq__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, compare magnitudes
@@ -436,41 +540,51 @@ class Quantity:
         return out
 
     def __ne__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
         return (not self == other)
 
     def __gt__(self, other):
-        err_msg = ('Greater than operation incompatible due to different units,'
-                   '{} and {}.'
-                   ''.format(str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, compare magnitudes
-            if self._is_dimless():
-                out = self.mag > other
-            else:
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Greater than operation incompatible due to different units,'
+                           '{} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
+            out = self.mag > other
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Greater than operation incompatible due to different units,'
+                           '{} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
             # Compare magnitudes
             out = self.mag > other.mag
         return out
 
     def __ge__(self, other):
-        err_msg = ('Greater than or equal to operation incompatible due to '
-                   'different units, {} and {}.'
-                   ''.format(str(self), str(other)))
+        if _defer_operation(other):
+            return NotImplemented
         other_units = self._get_other_units(other)
         if other_units is None:
             # If self is dimensionless, compare magnitudes
-            if self._is_dimless():
-                out = self.mag >= other
-            else:
+            if _check_units() and not self._is_dimless():
+                err_msg = ('Greater than or equal to operation incompatible due to '
+                           'different units, {} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
+            out = self.mag >= other
         else:
             # Check if units are the same
-            if self.units != other_units:
+            if _check_units() and self.units != other_units:
+                err_msg = ('Greater than or equal to operation incompatible due to '
+                           'different units, {} and {}.'
+                           ''.format(str(self), str(other)))
                 raise TypeError(err_msg)
             # Compare magnitudes
             out = self.mag >= other.mag
@@ -522,7 +636,7 @@ class Quantity:
             other_units = None
         return other_units
 
-    def __call__(self, units=None):
+    def __call__(self, units=None, out=None):
         """Returns quantity magnitude as a float in desired units
 
         Parameters
@@ -531,34 +645,147 @@ class Quantity:
                 Desired units to return. Different units must be sparated by a
                 ' ' or '/'. Supports powers as numbers after units.
                 e.g. 'cm/s2', 'cm s-2', or 'cm s^-2'. If ``units`` is omitted,
-                the SI equivalent is returned. ``units`` must correspond to
-                the :class:`~vunits.quantity.Quantity` object's dimensions.
+                the SI equivalent is returned (or the magnitude in the
+                active unit system, see :func:`~vunits.unit_system`). Use
+                :meth:`~vunits.quantity.Quantity.si` to always get the SI
+                magnitude.
+                ``units`` must correspond to the
+                :class:`~vunits.quantity.Quantity` object's dimensions.
+            out : np.ndarray, optional
+                Array to write the result to. Must have the same shape as the
+                magnitude. Useful to avoid allocating large arrays (e.g. when
+                writing to a preallocated or memory-mapped array). If not
+                specified, a new array is created.
         Returns
         -------
             mag : float
-                Float of the magnitude in the desired units.
+                Float of the magnitude in the desired units. If ``out`` is
+                specified, returns ``out``.
         """
         if units is None:
-            # Returns SI value
-            out = self.mag
+            system = _active_system.get()
+            if system is None:
+                # Returns SI value
+                if out is None:
+                    out = self.mag
+                else:
+                    out[...] = self.mag
+            else:
+                # Returns value in the active unit system
+                out = _divide(self.mag, system.factor(self.units), out=out)
         elif self._is_temp():
             # Is this is a temperature quantity, convert temperature accounting
             # for offsets.
             from vunits.convert import convert_temp
-            out = convert_temp(num=self.mag, initial='K', final=units)
+            out = convert_temp(num=self.mag, initial='K', final=units, out=out)
         else:
             # Converts to the appropriate unit
-            units_obj = Quantity.from_units(units=units)
-            if self.units != units_obj.units:
+            from vunits.db import _temp_units
+            from vunits.parse import _parse_factor
+            if units in _temp_units:
+                units_obj = Quantity.from_units(units=units)
+                factor, units_out = units_obj.mag, units_obj.units
+            else:
+                factor, units_out = _parse_factor(units=units)
+            if _check_units() and self.units != units_out:
+                units_obj = Quantity._from_qty(units=units_out, mag=factor)
                 err_msg = ('Unit conversion not possible due to '
                            'incompatibility between object\'s units, {}, and '
                            'requested units, {}.'
                            ''.format(str(self), str(units_obj)))
                 raise ValueError(err_msg)
-            out = (self/units_obj).mag
+            out = _divide(self.mag, factor, out=out)
+        return out
+
+    def si(self, out=None):
+        """Returns the SI magnitude regardless of the active unit system
+
+        Parameters
+        ----------
+            out : np.ndarray, optional
+                Array to write the result to. If not specified, the magnitude
+                is returned without copying.
+        Returns
+        -------
+            mag : float or np.ndarray
+                Magnitude in SI units. If ``out`` is specified, returns
+                ``out``.
+        """
+        if out is None:
+            return self.mag
+        out[...] = self.mag
+        return out
+
+    def to_inplace(self, units=None):
+        """Converts the magnitude to ``units`` without allocating a new array
+
+        The magnitude array is overwritten with the values in ``units`` and
+        returned. So the object stays valid, it becomes the dimensionless
+        ratio of the original quantity to ``units`` (e.g. a speed converted to
+        'cm/s' becomes speed/(cm/s)), whose magnitude is the converted array.
+
+        Parameters
+        ----------
+            units : str, optional
+                Desired units. See :meth:`~vunits.quantity.Quantity.__call__`.
+        Returns
+        -------
+            mag : np.ndarray
+                Magnitude array in ``units``.
+        Raises
+        ------
+            TypeError
+                If the magnitude is not a numpy array.
+            ValueError
+                If ``units`` require a temperature offset (e.g. 'oC'), since
+                the result cannot be expressed as a ratio.
+        """
+        if not isinstance(self.mag, np.ndarray):
+            err_msg = ('In place conversion requires the magnitude to be a '
+                       'numpy array, not {}.'.format(type(self.mag)))
+            raise TypeError(err_msg)
+        if units in ('oC', 'oF'):
+            err_msg = ('In place conversion does not support temperatures '
+                       'with offsets, {}. Use Quantity.__call__ with the out '
+                       'parameter instead.'.format(units))
+            raise ValueError(err_msg)
+        out = self(units, out=self.mag)
+        self._units = _get_units(None)
         return out
 
-    def __array__(self):
+    def best_units(self):
+        """Finds readable units for the magnitude (e.g. 'kPa' instead of
+        'kg m^-1 s^-2')
+
+        Candidate units are SI units with engineering prefixes from the unit
+        database. The largest unit that does not exceed the magnitude is
+        chosen so the magnitude is between 1 and 1000 when possible.
+
+        Returns
+        -------
+            units : str or np.ndarray
+                Best units. If the magnitude is an array, the best units of
+                each element are returned. If no named unit exists for the
+                dimension, SI units are returned.
+        """
+        return self.to_compact()[1]
+
+    def to_compact(self):
+        """Expresses the magnitude in readable units. See
+        :meth:`~vunits.quantity.Quantity.best_units`.
+
+        Returns
+        -------
+            mag : float or np.ndarray
+                Magnitude in ``units``.
+            units : str or np.ndarray
+                Best units. If the magnitude is an array, the best units of
+                each element are returned.
+        """
+        from vunits.db import _find_best_units
+        return _find_best_units(mag=self.mag, units=self._units)
+
+    def __array__(self, dtype=None):
         # if isinstance(self.mag, np.ndarray):
         #     out = self.mag
         # else:
@@ -573,20 +800,20 @@ class Quantity:
             except TypeError:
                 # If the magnitude is not iterable
                 out = np.array([self.mag])
+        if dtype is not None:
+            out = out.astype(dtype, copy=False)
         return out
 
-    # def __array_ufunc__(self, ufunc, method, *args, **kwargs):
-    #     if method == '__call__':
-    #         args_out = []
-    #         for arg in args:
-    #             try:
-    #                 args_out.append(arg.mag)
-    #             except AttributeError:
-    #                 args_out.append(arg)
-    #         return Quantity._from_qty(units=self.units,
-    #                                   mag=ufunc(*args_out, **kwargs))
-    #     else:
-    #         raise NotImplementedError()
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        from vunits.quantity.numpy import HANDLED_FUNCTIONS, HANDLED_UFUNCS
+        if (method == '__call__' and ufunc in HANDLED_UFUNCS
+                and len(inputs) == 1 and 'out' not in kwargs):
+            return HANDLED_FUNCTIONS[ufunc](*inputs, **kwargs)
+        # Other ufuncs (e.g. operations with numpy arrays) are applied to the
+        # magnitudes
+        inputs = [np.asarray(arg) if isinstance(arg, Quantity) else arg
+                  for arg in inputs]
+        return getattr(ufunc, method)(*inputs, **kwargs)
 
     def __array_function__(self, func, types, args, kwargs):
         from vunits.quantity.numpy import HANDLED_FUNCTIONS
@@ -601,8 +828,23 @@ class Quantity:
     #     if 
 
 
+    def astype(self, dtype):
+        """Creates a copy with the magnitude cast to a different type
+
+        Parameters
+        ----------
+            dtype : data-type
+                Data type of the new magnitude (e.g. np.float32).
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                New quantity object with the same units.
+        """
+        return Quantity._new(mag=_as_dtype(self.mag, dtype, copy=True),
+                             units=dict(self.units))
+
     @classmethod
-    def from_units(cls, mag=1., units='', unit_db=None):
+    def from_units(cls, mag=1., units='', unit_db=None, dtype=None):
         """Method to create a :class:`~vunits.quantity.Quantity` by parsing
         units.
         
@@ -619,16 +861,63 @@ class Quantity:
                 expected units and values are :class:`~vunits.quantity.Quantity`
                 objects. If ``unit_db`` is not specified, uses the
                 ``vunits.db.unit_db``.
+            dtype : data-type, optional
+                Data type of the magnitude. The unit conversion factor is
+                applied in this type. If not specified, the type of ``mag`` is
+                kept for floating point arrays.
         Returns
         -------
             quantity : :class:`~vunits.quantity.Quantity`
                 New quantity object.
         """
         from vunits.parse import _parse_unit
+        if dtype is not None:
+            mag = _as_dtype(mag, dtype)
         qty_obj = _parse_unit(units=units, mag=mag, unit_db=unit_db)
         return cls._from_qty(units=qty_obj.units, mag=qty_obj.mag)
 
 
+    @classmethod
+    def from_buffer(cls, buf, dtype=float, shape=None, units='', offset=0,
+                    count=-1, unit_db=None):
+        """Creates a :class:`~vunits.quantity.Quantity` whose magnitude wraps
+        an existing buffer (e.g. shared memory, mmap or bytes read from a
+        socket or file)
+
+        Parameters
+        ----------
+            buf : buffer
+                Object exposing the buffer interface.
+            dtype : data-type, optional
+                Data type of the buffer. Default is float.
+            shape : tuple of int, optional
+                Shape of the magnitude. If not specified, a 1D array is
+                created.
+            units : str, optional
+                Units of the data in the buffer. Default is ''.
+            offset : int, optional
+                Start reading the buffer from this offset (in bytes). Default
+                is 0.
+            count : int, optional
+                Number of items to read. Default is -1 (all the data).
+            unit_db : dict, optional
+                Unit database to use parse units. If ``unit_db`` is not
+                specified, uses the ``vunits.db.unit_db``.
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                New quantity object. If ``units`` are SI units, the magnitude
+                is a view of ``buf``. Otherwise the data is converted to SI
+                units, which creates a new array.
+        """
+        from vunits.parse import _parse_unit
+        mag = np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+        if shape is not None:
+            mag = mag.reshape(shape)
+        qty_obj = _parse_unit(units=units, mag=mag, unit_db=unit_db,
+                              copy=False)
+        return cls._from_qty(units=qty_obj.units, mag=qty_obj.mag)
+
     @classmethod
     def _from_qty(cls, units, mag=1., **kwargs):
         """Helper method to create a :class:`~vunits.quantity.Quantity`
@@ -651,6 +940,28 @@ class Quantity:
                    A=units['A'], K=units['K'], mol=units['mol'], cd=units['cd'],
                    **kwargs)
 
+    @classmethod
+    def _new(cls, mag, units):
+        """Helper method to create a :class:`~vunits.quantity.Quantity`
+        without calling ``__init__``. Used by operations since ``units`` has
+        already been processed.
+
+        Parameters
+        ----------
+            mag : float
+                Magnitude of new quantity.
+            units : dict
+                Units of the new quantity. The dictionary is not copied.
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                New quantity object.
+        """
+        obj = cls.__new__(cls)
+        obj.mag = mag
+        obj._units = units
+        return obj
+
     @classmethod
     def _from_str(cls, quantity_str):
         """Helper method to create the Quantity object from a string. It assumes
@@ -669,14 +980,210 @@ class Quantity:
         """
         val, units = quantity_str.split(' ', 1)
         return Quantity.from_units(mag=float(val), units=units)
-    
-    def to_dict(self):
+
+    @classmethod
+    def stack(cls, quantities, dtype=float):
+        """Packs scalar :class:`~vunits.quantity.Quantity` objects into a
+        single :class:`~vunits.quantity.Quantity` with an array magnitude
+
+        Parameters
+        ----------
+            quantities : iterable of :class:`~vunits.quantity.Quantity`
+                Quantities to pack. All must have the same units. Other
+                objects (e.g. float) are treated as dimensionless.
+            dtype : data-type, optional
+                Data type of the magnitude array. Default is float.
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                Quantity whose magnitude has one element per inputted
+                quantity.
+        Raises
+        ------
+            TypeError
+                If the quantities have different units.
+        """
+        if not hasattr(quantities, '__len__'):
+            quantities = list(quantities)
+        mag = np.empty(len(quantities), dtype=dtype)
+        if len(quantities) == 0:
+            return cls._from_qty(units=_get_units(None), mag=mag)
+
+        units = _get_units(quantities[0])
+        for i, qty in enumerate(quantities):
+            qty_units = _get_units(qty)
+            if qty_units is not units and qty_units != units:
+                err_msg = ('Stacking incompatible due to different units, {} '
+                           'and {}.'.format(str(quantities[0]), str(qty)))
+                raise TypeError(err_msg)
+            mag[i] = getattr(qty, 'mag', qty)
+        return cls._from_qty(units=units, mag=mag)
+
+    @classmethod
+    def from_sequence(cls, quantities, dtype=float):
+        """Alias of :meth:`~vunits.quantity.Quantity.stack`"""
+        return cls.stack(quantities=quantities, dtype=dtype)
+
+    @classmethod
+    def group_by_dimension(cls, quantities, dtype=float,
+                           return_indices=False):
+        """Packs scalar :class:`~vunits.quantity.Quantity` objects with
+        different units into one :class:`~vunits.quantity.Quantity` per
+        dimension
+
+        Parameters
+        ----------
+            quantities : iterable of :class:`~vunits.quantity.Quantity`
+                Quantities to pack. Other objects (e.g. float) are treated as
+                dimensionless.
+            dtype : data-type, optional
+                Data type of the magnitude arrays. Default is float.
+            return_indices : bool, optional
+                If True, also returns the positions of each group in
+                ``quantities``. Default is False.
+        Returns
+        -------
+            groups : dict
+                Keys are tuples of the unit powers ordered as 'm', 'kg', 's',
+                'A', 'K', 'mol', 'cd'. Values are
+                :class:`~vunits.quantity.Quantity` objects with array
+                magnitudes. Keys are ordered by first appearance.
+            indices : dict
+                Only returned if ``return_indices`` is True. Keys match
+                ``groups`` and values are integer arrays of positions.
+        """
+        group_units = {}
+        group_mags = defaultdict(list)
+        group_indices = defaultdict(list)
+        for i, qty in enumerate(quantities):
+            units = _get_units(qty)
+            key = _units_key(units)
+            group_units.setdefault(key, units)
+            group_mags[key].append(getattr(qty, 'mag', qty))
+            group_indices[key].append(i)
+
+        groups = {key: cls._from_qty(units=units,
+                                     mag=np.array(group_mags[key],
+                                                  dtype=dtype))
+                  for key, units in group_units.items()}
+        if return_indices:
+            indices = {key: np.array(group_indices[key], dtype=int)
+                       for key in group_units}
+            return (groups, indices)
+        return groups
+
+    def freeze(self):
+        """Creates an immutable and hashable copy of the object
+
+        Returns
+        -------
+            frozen_quantity : :class:`~vunits.quantity.FrozenQuantity`
+                Frozen copy. Can be used as a dictionary key.
+        """
+        return FrozenQuantity._from_qty(units=self.units, mag=self.mag)
+
+    def __reduce_ex__(self, protocol):
+        # Units are stored as a tuple of powers and array magnitudes as raw
+        # buffers. With protocol 5, buffers can be sent out-of-band.
+        state = {key: val for key, val in self.__dict__.items()
+                 if key not in _pickle_skip}
+        if not state:
+            state = None
+        units = _compact_units(self._units)
+        mag = self.mag
+        if type(mag) is np.ndarray and not mag.dtype.hasobject:
+            mag = np.require(mag, requirements='C')
+            if protocol >= 5:
+                buf = pickle.PickleBuffer(mag)
+            else:
+                buf = mag.tobytes()
+            return (_unpickle_array,
+                    (self.__class__, units, buf, mag.dtype.str, mag.shape,
+                     state))
+        return (_unpickle, (self.__class__, units, mag, state))
+
+    def save(self, path):
+        """Saves the object to a .npy file with its units. See
+        :func:`~vunits.io.save`
+
+        Parameters
+        ----------
+            path : str
+                Name of the file.
+        """
+        from vunits.io import save
+        save(path=path, quantity=self)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Loads an object saved using
+        :meth:`~vunits.quantity.Quantity.save`. See :func:`~vunits.io.load`
+
+        Parameters
+        ----------
+            path : str
+                Name of the file.
+            mmap_mode : str, optional
+                Memory-map mode passed to ``numpy.load``. The default, 'r',
+                returns a read-only memory-mapped magnitude that is shared by
+                processes loading the same file. Use None to read the data
+                into memory.
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                Loaded quantity.
+        """
+        from vunits.io import load
+        return load(path=path, mmap_mode=mmap_mode)
+
+    def lazy(self):
+        """Creates a lazy expression so operations on large arrays are
+        evaluated together
+
+        Returns
+        -------
+            lazy_quantity : :class:`~vunits.quantity.lazy.LazyQuantity`
+                Lazy expression wrapping the object. Operations with other
+                objects build an expression graph that is evaluated in chunks
+                using ``evaluate`` or by calling the object.
+        """
+        from vunits.quantity.lazy import LazyQuantity
+        return LazyQuantity(self)
+
+    def to_dict(self, encoding='list', compress=False):
         """Represents object as dictionary with JSON-accepted datatypes
 
+        Parameters
+        ----------
+            encoding : str, optional
+                Encoding of array magnitudes. Supported options include:
+
+                - 'list' (default): Nested lists of floats. Readable but slow
+                  and large for big arrays.
+                - 'base64': Little-endian bytes encoded as a base64 string
+                  with the data type and shape. Round-trips exactly and is
+                  decoded without looping over elements.
+            compress : bool, optional
+                If True and ``encoding`` is 'base64', the bytes are compressed
+                using zlib before being encoded. Default is False.
         Returns
         -------
             obj_dict : dict
+        Raises
+        ------
+            ValueError
+                If ``encoding`` is not supported, ``compress`` is True
+                without base64 encoding, or an object array is encoded using
+                base64.
         """
+        if encoding not in ('list', 'base64'):
+            err_msg = ('Encoding "{}" not supported. Use "list" or "base64".'
+                       ''.format(encoding))
+            raise ValueError(err_msg)
+        if compress and encoding != 'base64':
+            err_msg = ('Compression requires base64 encoding, not "{}".'
+                       ''.format(encoding))
+            raise ValueError(err_msg)
         obj_dict = {
             'class': str(self.__class__),
             'm': self.m,
@@ -693,7 +1200,13 @@ class Quantity:
             obj_dict['mag'] = self.mag.to_dict()
         except AttributeError:
             if isinstance(self.mag, np.ndarray):
-                obj_dict['mag'] = list(self.mag)
+                if encoding == 'base64':
+                    obj_dict['mag'] = _encode_array(self.mag,
+                                                    compress=compress)
+                else:
+                    obj_dict['mag'] = self.mag.tolist()
+            elif isinstance(self.mag, np.generic):
+                obj_dict['mag'] = self.mag.item()
             else:
                 obj_dict['mag'] = self.mag
 
@@ -706,12 +1219,16 @@ class Quantity:
         Parameters
         ----------
             json_obj : dict
-                JSON representation
+                JSON representation. Magnitudes encoded using base64 (see
+                :meth:`~vunits.quantity.Quantity.to_dict`) are decoded.
         Returns
         -------
             Obj : Appropriate object
         """
         json_obj.pop('class', None)
+        mag = json_obj.get('mag', None)
+        if isinstance(mag, dict) and mag.get('encoding', None) == 'base64':
+            json_obj = {**json_obj, 'mag': _decode_array(mag)}
         return cls(**json_obj)
 
 class UnitQuantity(Quantity):
@@ -725,6 +1242,116 @@ class UnitQuantity(Quantity):
         self.add_long_prefix = add_long_prefix
         self.plural_suffix = plural_suffix
 
+class FrozenQuantity(Quantity):
+    """Immutable and hashable :class:`~vunits.quantity.Quantity`. Inherits
+    from :class:`~vunits.quantity.Quantity`.
+
+    Array magnitudes are copied and made read-only. The hash is calculated
+    from the bytes of the magnitude and the units so equal objects can be used
+    as dictionary keys (e.g. to memoize functions, see
+    :func:`~vunits.memoize`). Dimensionless scalars hash like their magnitude
+    since they are equal to bare numbers. Arithmetic operations return
+    :class:`~vunits.quantity.Quantity` objects.
+
+    Attributes
+    ----------
+        mag : float or np.ndarray, optional
+            Magnitude. Default is 1.
+        m : float, optional
+            Power of meter (length). Default is 0.
+        kg : float, optional
+            Power of kilogram (mass). Default is 0.
+        s : float, optional
+            Power of seconds (time). Default is 0.
+        A : float, optional
+            Power of amperes (electric current). Default is 0.
+        K : float, optional
+            Power of Kelvin (temperature). Default is 0.
+        mol : float, optional
+            Power of moles (amount of substance). Default is 0.
+        cd : float, optional
+            Power of candela (luminous intensity). Default is 0.
+    """
+    def __init__(self, mag=1., m=0., kg=0., s=0., A=0., K=0., mol=0.,
+                 cd=0.):
+        if isinstance(mag, (list, tuple, np.ndarray)):
+            mag = np.array(mag)
+            mag.flags.writeable = False
+        elif not isinstance(mag, np.floating):
+            mag = float(mag)
+        units = MappingProxyType({'m': m, 'kg': kg, 's': s, 'A': A, 'K': K,
+                                  'mol': mol, 'cd': cd})
+        key = _quantity_key(mag=mag, units=units)
+        object.__setattr__(self, 'mag', mag)
+        object.__setattr__(self, '_units', units)
+        object.__setattr__(self, '_key', key)
+        if not isinstance(mag, np.ndarray) and all(power == 0.
+                                                   for power in units.values()):
+            # Dimensionless scalars compare equal to bare numbers so they
+            # must hash the same way
+            object.__setattr__(self, '_hash', hash(mag))
+        else:
+            object.__setattr__(self, '_hash', hash(key))
+
+    def __setattr__(self, name, value):
+        err_msg = ('FrozenQuantity objects are immutable. Cannot set "{}".'
+                   ''.format(name))
+        raise AttributeError(err_msg)
+
+    def __setitem__(self, key, value):
+        raise TypeError('FrozenQuantity objects do not support item '
+                        'assignment.')
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenQuantity):
+            return self._key == other._key
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        if _defer_operation(other):
+            return NotImplemented
+        return (not self == other)
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __isub__(self, other):
+        return self - other
+
+    def __imul__(self, other):
+        return self * other
+
+    def __repr__(self):
+        out = ('<vunits.quantity.FrozenQuantity object at {} with value {}>'
+               ''.format(hex(id(self)), str(self)))
+        return out
+
+    def freeze(self):
+        """Returns the object since it is already frozen
+
+        Returns
+        -------
+            frozen_quantity : :class:`~vunits.quantity.FrozenQuantity`
+                The object itself.
+        """
+        return self
+
+    def thaw(self):
+        """Creates a mutable copy of the object
+
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                Copy whose magnitude can be modified.
+        """
+        mag = self.mag
+        if isinstance(mag, np.ndarray):
+            mag = mag.copy()
+        return Quantity._from_qty(units=self.units, mag=mag)
+
 def _force_get_quantity(obj, units=''):
     """Helper method to return :class:`~vunits.quantity.Quantity` object.
 
@@ -746,6 +1373,41 @@ def _force_get_quantity(obj, units=''):
         out = Quantity.from_units(mag=obj, units=units)
     return out
 
+def _defer_operation(other):
+    """Helper method to check if an operation should be handled by ``other``
+
+    Parameters
+    ----------
+        other : object
+            Second operand of the operation
+    Returns
+    -------
+        defer : bool
+            True if ``other`` sets ``_vunits_priority`` (e.g.
+            :class:`~vunits.quantity.vector.QuantityVector`). In this case,
+            operators return ``NotImplemented`` so Python calls the reflected
+            method of ``other``.
+    """
+    return getattr(other, '_vunits_priority', False)
+
+def _get_units(obj):
+    """Helper method to return the units of an object
+
+    Parameters
+    ----------
+        obj : :class:`~vunits.quantity.Quantity` or other object
+            Object to inspect
+    Returns
+    -------
+        units : dict
+            Units of ``obj``. Objects that are not
+            :class:`~vunits.quantity.Quantity` objects are dimensionless.
+    """
+    try:
+        return obj._units
+    except AttributeError:
+        return {key: 0. for key in _unit_keys}
+
 def _return_quantity(quantity, return_quantity, units_out=''):
     """Helper method to return appropriate unit type
     Parameters
@@ -756,7 +1418,10 @@ def _return_quantity(quantity, return_quantity, units_out=''):
             If True, returns :class:`~vunits.quantity.Quantity` obj. Otherwise,
             return ``quantity.mag``
         units_out : str, optional
-            Units to return. Not required if ``return_quantity`` is True.
+            Units to return. Not required if ``return_quantity`` is True. If
+            None, returns the magnitude in the active unit system (see
+            :func:`~vunits.unit_system`) or SI units if no system is active.
+            Use ``Quantity.si`` when the SI magnitude is required.
     Returns
     -------
         out : :class:`~vunits.quantity.Quantity` obj or float
@@ -767,6 +1432,454 @@ def _return_quantity(quantity, return_quantity, units_out=''):
     else:
         return quantity(units_out)
 
+def set_check_fraction(check_fraction):
+    """Sets the fraction of operations whose units are checked
+
+    Checks are applied process-wide. Use :func:`~vunits.quantity.unchecked` to
+    change the fraction temporarily.
+
+    Parameters
+    ----------
+        check_fraction : float
+            Fraction of operations whose units are checked. If 1, all
+            operations are checked (default behavior). If 0, no operations are
+            checked. Values in between randomly sample operations so mistakes
+            in validated code can still be caught.
+    Raises
+    ------
+        ValueError
+            If ``check_fraction`` is not between 0 and 1.
+    """
+    global _check_fraction
+    if not 0. <= check_fraction <= 1.:
+        err_msg = ('check_fraction must be between 0 and 1, not {}.'
+                   ''.format(check_fraction))
+        raise ValueError(err_msg)
+    _check_fraction = float(check_fraction)
+
+@contextmanager
+def unchecked(check_fraction=0.):
+    """Context manager to skip unit checks of
+    :class:`~vunits.quantity.Quantity` operations.
+
+    Inside the context, operations (e.g. addition, comparisons, conversions)
+    do not verify units are compatible and results reuse the units of their
+    operands when possible. Only use with code whose units have already been
+    validated.
+
+    Parameters
+    ----------
+        check_fraction : float, optional
+            Fraction of operations whose units are still checked. Default is
+            0.
+    """
+    previous_fraction = _check_fraction
+    set_check_fraction(check_fraction)
+    try:
+        yield
+    finally:
+        set_check_fraction(previous_fraction)
+
+def _check_units():
+    """Helper method to decide if the units of an operation should be checked
+
+    Returns
+    -------
+        check : bool
+            True if units should be checked. Depends on
+            ``vunits.quantity._check_fraction``.
+    """
+    if _check_fraction >= 1.:
+        return True
+    elif _check_fraction <= 0.:
+        return False
+    return random.random() < _check_fraction
+
+def _copy_units(units):
+    """Helper method to get units for the result of an operation
+
+    Parameters
+    ----------
+        units : dict
+            Units of the operand
+    Returns
+    -------
+        units_out : dict
+            Copy of ``units``. If unit checks are disabled, ``units`` is
+            returned without copying.
+    """
+    if _check_fraction <= 0.:
+        return units
+    return dict(units)
+
+def _divide(mag, factor, out=None):
+    """Helper method to divide a magnitude by a conversion factor
+
+    Parameters
+    ----------
+        mag : float or np.ndarray
+            Magnitude to convert
+        factor : float
+            Conversion factor
+        out : np.ndarray, optional
+            Array to write the result to. If not specified, a new object is
+            created.
+    Returns
+    -------
+        mag_out : float or np.ndarray
+            ``mag`` divided by ``factor``.
+    """
+    return _apply_factor(mag, factor, ufunc=np.divide, out=out)
+
+def _apply_factor(mag, factor, ufunc=np.multiply, out=None):
+    """Helper method to apply a conversion factor without upcasting the
+    magnitude (e.g. float32 to float64)
+
+    If ``factor`` can be represented in the type of ``mag``, it is applied in
+    that type. Otherwise (e.g. 'amu Ang2' is about 1.7e-47 and underflows in
+    float32), it is applied in double precision and the result is cast back.
+    If the result cannot be represented in the type of ``mag`` either, the
+    double precision result is returned with a warning.
+
+    Parameters
+    ----------
+        mag : float or np.ndarray
+            Magnitude to convert
+        factor : float
+            Conversion factor
+        ufunc : np.ufunc, optional
+            np.multiply (default) or np.divide.
+        out : np.ndarray, optional
+            Array to write the result to. If not specified, a new object is
+            created.
+    Returns
+    -------
+        mag_out : float or np.ndarray
+            Result of ``ufunc(mag, factor)``.
+    """
+    dtype = getattr(mag, 'dtype', None)
+    if dtype is None or dtype.kind not in 'fc':
+        if out is None:
+            return mag*factor if ufunc is np.multiply else mag/factor
+        return ufunc(mag, factor, out=out)
+
+    finfo = np.finfo(dtype)
+    if finfo.tiny <= abs(factor) <= finfo.max:
+        return ufunc(mag, dtype.type(factor), out=out)
+    work_dtype = np.promote_types(dtype, np.float64)
+    if out is not None:
+        return ufunc(mag, factor, out=out, dtype=work_dtype)
+    mag_work = ufunc(mag, factor, dtype=work_dtype)
+    mag_out = mag_work.astype(dtype)
+    with np.errstate(invalid='ignore'):
+        lost = (np.any((mag_out == 0.) != (mag_work == 0.))
+                or np.any(np.isfinite(mag_out) != np.isfinite(mag_work)))
+    if lost:
+        warn_msg = ('Converted magnitude cannot be represented as {}. The '
+                    'magnitude is returned as {}.'.format(dtype, work_dtype))
+        warn(warn_msg, RuntimeWarning)
+        return mag_work
+    return mag_out
+
+def _as_dtype(mag, dtype, copy=False):
+    """Helper method to cast a magnitude to a data type
+
+    Parameters
+    ----------
+        mag : float, list or np.ndarray
+            Magnitude
+        dtype : data-type
+            Desired data type
+        copy : bool, optional
+            If True, arrays are always copied. Otherwise, arrays that already
+            have the type are returned. Default is False.
+    Returns
+    -------
+        mag_out : np.ndarray or numpy scalar
+            Magnitude with type ``dtype``. Scalars are returned as numpy
+            scalars.
+    """
+    if copy:
+        mag_out = np.array(mag, dtype=dtype)
+    else:
+        mag_out = np.asarray(mag, dtype=dtype)
+    if mag_out.ndim == 0:
+        return mag_out[()]
+    return mag_out
+
+_pickle_skip = ('mag', '_units', '_key', '_hash')
+"""tuple: Attributes that are not pickled as state. The magnitude and units are
+pickled separately and the hash of
+:class:`~vunits.quantity.FrozenQuantity` objects is recalculated."""
+
+def _compact_units(units):
+    """Helper method to express units compactly for pickling
+
+    Parameters
+    ----------
+        units : dict
+            Units
+    Returns
+    -------
+        units_tuple : tuple
+            Powers ordered as ``vunits.quantity._unit_keys``. Integer powers
+            are stored as int since they take less space.
+    """
+    return tuple([int(power) if power == int(power) else power
+                  for power in _units_key(units)])
+
+def _unpickle(cls, units, mag, state=None):
+    """Helper method to recreate a pickled
+    :class:`~vunits.quantity.Quantity`
+
+    Parameters
+    ----------
+        cls : type
+            Class of the pickled object
+        units : tuple
+            Powers of the units ordered as ``vunits.quantity._unit_keys``
+        mag : float or object
+            Magnitude
+        state : dict, optional
+            Other attributes of the object (e.g. of
+            :class:`~vunits.quantity.UnitQuantity`)
+    Returns
+    -------
+        quantity : :class:`~vunits.quantity.Quantity`
+            Unpickled object
+    """
+    units_dict = {key: float(power) for key, power in zip(_unit_keys, units)}
+    obj = cls._from_qty(units=units_dict, mag=mag)
+    if state is not None:
+        obj.__dict__.update(state)
+    return obj
+
+def _unpickle_array(cls, units, buf, dtype, shape, state=None):
+    """Helper method to recreate a pickled
+    :class:`~vunits.quantity.Quantity` with an array magnitude
+
+    Parameters
+    ----------
+        cls : type
+            Class of the pickled object
+        units : tuple
+            Powers of the units ordered as ``vunits.quantity._unit_keys``
+        buf : bytes, bytearray or buffer
+            Data of the magnitude. Out-of-band buffers are used without
+            copying.
+        dtype : str
+            Data type of the magnitude
+        shape : tuple
+            Shape of the magnitude
+        state : dict, optional
+            Other attributes of the object
+    Returns
+    -------
+        quantity : :class:`~vunits.quantity.Quantity`
+            Unpickled object
+    """
+    mag = np.frombuffer(buf, dtype=dtype).reshape(shape)
+    if isinstance(buf, bytes):
+        # Bytes are read-only so the magnitude is copied to be writable
+        mag = mag.copy()
+    return _unpickle(cls=cls, units=units, mag=mag, state=state)
+
+def _encode_array(mag, compress=False):
+    """Helper method to encode an array as a JSON-compatible dictionary
+
+    Parameters
+    ----------
+        mag : np.ndarray
+            Array to encode
+        compress : bool, optional
+            If True, the bytes are compressed using zlib. Default is False.
+    Returns
+    -------
+        mag_dict : dict
+            Dictionary with the keys 'encoding', 'dtype', 'shape',
+            'compression' and 'data' (base64 string of the little-endian
+            bytes).
+    Raises
+    ------
+        ValueError
+            If ``mag`` is an array of Python objects.
+    """
+    if mag.dtype.hasobject:
+        err_msg = ('Arrays of Python objects cannot be encoded using base64. '
+                   'Use the "list" encoding instead.')
+        raise ValueError(err_msg)
+    dtype = mag.dtype.newbyteorder('<')
+    data = np.ascontiguousarray(mag, dtype=dtype).tobytes()
+    compression = None
+    if compress:
+        data = zlib.compress(data)
+        compression = 'zlib'
+    return {'encoding': 'base64',
+            'dtype': dtype.str,
+            'shape': list(mag.shape),
+            'compression': compression,
+            'data': base64.b64encode(data).decode('ascii')}
+
+def _decode_array(mag_dict):
+    """Helper method to decode an array encoded by
+    ``vunits.quantity._encode_array``
+
+    Parameters
+    ----------
+        mag_dict : dict
+            Encoded array
+    Returns
+    -------
+        mag : np.ndarray
+            Decoded array
+    Raises
+    ------
+        ValueError
+            If the compression is not supported.
+    """
+    data = base64.b64decode(mag_dict['data'])
+    compression = mag_dict.get('compression', None)
+    if compression == 'zlib':
+        data = zlib.decompress(data)
+    elif compression is not None:
+        err_msg = ('Compression "{}" not supported.'.format(compression))
+        raise ValueError(err_msg)
+    mag = np.frombuffer(data, dtype=mag_dict['dtype'])
+    # Bytes are read-only so the array is copied to be writable
+    return mag.reshape(mag_dict['shape']).copy()
+
+def _buffer_to_array(buf, dtype=None):
+    """Helper method to wrap a buffer as an array without copying
+
+    Parameters
+    ----------
+        buf : memoryview, array.array, bytes, bytearray or mmap.mmap
+            Buffer to wrap
+        dtype : data-type, optional
+            Data type of the array. Raw bytes are interpreted as ``dtype``
+            (float64 if not specified). Typed buffers (memoryview and
+            array.array) keep their type and are only copied if it differs
+            from ``dtype``.
+    Returns
+    -------
+        mag : np.ndarray
+            Array sharing the memory of ``buf``.
+    """
+    if isinstance(buf, _bytes_types):
+        if dtype is None:
+            dtype = np.float64
+        return np.frombuffer(buf, dtype=dtype)
+    mag = np.asarray(buf)
+    if dtype is not None:
+        mag = mag.astype(dtype, copy=False)
+    return mag
+
+def _cast_factor(mag, factor):
+    """Helper method to express a conversion factor in the type of a magnitude
+    so applying it does not upcast the magnitude (e.g. float32 to float64).
+    Only used for factors of order 1 (e.g. temperature scales and offsets).
+    Use ``vunits.quantity._apply_factor`` for unit conversion factors, which
+    can underflow in single precision.
+
+    Parameters
+    ----------
+        mag : float or np.ndarray
+            Magnitude the factor is applied to
+        factor : float
+            Conversion factor
+    Returns
+    -------
+        factor_out : float or numpy scalar
+            ``factor`` with the type of ``mag`` if ``mag`` is a floating point
+            or complex numpy object. Otherwise ``factor`` is returned as is.
+    """
+    dtype = getattr(mag, 'dtype', None)
+    if dtype is None or dtype.kind not in 'fc':
+        return factor
+    return dtype.type(factor)
+
+def _format_units(units):
+    """Helper method to express units as a string
+
+    Parameters
+    ----------
+        units : dict
+            Units
+    Returns
+    -------
+        units_str : str
+            Units with their powers (e.g. 'm s^-1'). Units without a
+            contribution are skipped.
+    """
+    str_out = ''
+    for unit, power in units.items():
+        int_power = int(round(power))
+        # Skip if no contribution from quantity
+        if power == 0:
+            continue
+        # Add unit with appropriate power
+        if np.isclose(power, 1.):
+            str_out += ' {}'.format(unit)
+        elif np.isclose(power, int_power):
+            str_out += ' {}^{}'.format(unit, int_power)
+        else:
+            str_out += ' {}^{}'.format(unit, power)
+    # Remove leading space
+    str_out = str_out.strip()
+    return str_out
+
+@lru_cache(maxsize=1024)
+def _get_units_str(units_key):
+    """Helper method to express units as a string. The least recently used
+    strings are evicted so the cache does not grow with arbitrary powers.
+
+    Parameters
+    ----------
+        units_key : tuple
+            Powers of the units ordered as ``vunits.quantity._unit_keys``
+    Returns
+    -------
+        units_str : str
+            Units with their powers (e.g. 'm s^-1').
+    """
+    return _format_units(dict(zip(_unit_keys, units_key)))
+
+def _units_key(units):
+    """Helper method to express units as a tuple
+
+    Parameters
+    ----------
+        units : dict
+            Units
+    Returns
+    -------
+        units_key : tuple
+            Powers of the units ordered as ``vunits.quantity._unit_keys``.
+            Hashable so it can be used as a dictionary key.
+    """
+    return tuple([units[key] for key in _unit_keys])
+
+def _quantity_key(mag, units):
+    """Helper method to create a hashable key from a magnitude and units
+
+    Parameters
+    ----------
+        mag : float or np.ndarray
+            Magnitude
+        units : dict
+            Units
+    Returns
+    -------
+        key : tuple
+            Key made of the units and the magnitude. Arrays are represented by
+            their type, shape and bytes.
+    """
+    if isinstance(mag, np.ndarray):
+        mag_key = (mag.dtype.str, mag.shape, mag.tobytes())
+    else:
+        mag_key = mag
+    return (_units_key(units), mag_key)
+
 def _add_units(units1, units2):
     """Helper method to handle units when quantities are multiplied
     
@@ -0,0 +1,562 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.quantity.chunked
+
+Quantities whose magnitudes are processed in chunks so they do not need to
+fit in memory.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from vunits.quantity import (Quantity, _check_units, _get_units, _add_units,
+                             _sub_units, _mul_units, _divide)
+from vunits.system import _active_system
+
+class ChunkedQuantity:
+    """Quantity whose magnitude is split into chunks along the first axis
+
+    The magnitude can be an array larger than the available memory (e.g. a
+    ``numpy.memmap``) or a sequence of chunk files (see
+    :meth:`~vunits.quantity.chunked.ChunkedQuantity.from_files`). Arithmetic
+    operations are lazy: they are applied to each chunk when a reduction or
+    conversion is requested, so only a few chunks are in memory at a time.
+
+    Attributes
+    ----------
+        mag : np.ndarray
+            Magnitude in ``units``. Usually a ``numpy.memmap``.
+        units : str, optional
+            Units of ``mag``. Default is '' (dimensionless). If the units are
+            not SI units, chunks are converted to SI units when processed.
+        chunk_size : int, optional
+            Number of elements along the first axis in each chunk. Default is
+            65536.
+        n_workers : int, optional
+            Number of threads used to process chunks. Default is None (chunks
+            are processed sequentially).
+    """
+
+    # Operations with numpy arrays are handled by the reflected methods
+    __array_ufunc__ = None
+    _vunits_priority = True
+
+    def __init__(self, mag, units='', chunk_size=65536, n_workers=None):
+        from vunits.db import _temp_units
+        unit_qty = Quantity.from_units(units=units)
+        factor = unit_qty.mag
+        starts = range(0, len(mag), chunk_size)
+        slices = [slice(start, min(start + chunk_size, len(mag)))
+                  for start in starts]
+
+        def get_chunk(i):
+            chunk = mag[slices[i]]
+            if units in _temp_units:
+                # Temperatures require offsets
+                from vunits.convert import convert_temp
+                chunk = convert_temp(num=chunk, initial=units, final='K')
+            elif factor != 1.:
+                chunk = chunk*factor
+            return chunk
+
+        self._get_chunk = get_chunk
+        self._lengths = tuple([slc.stop - slc.start for slc in slices])
+        self._row_shape = tuple(mag.shape[1:])
+        self._dtype = _float_dtype(mag.dtype)
+        self._units = dict(unit_qty.units)
+        self.n_workers = n_workers
+
+    @classmethod
+    def from_files(cls, paths, units=None, n_workers=None):
+        """Creates a :class:`~vunits.quantity.chunked.ChunkedQuantity` from
+        chunk files
+
+        Parameters
+        ----------
+            paths : list of str
+                Chunk files in order. Files are .npy files, optionally written
+                by :func:`~vunits.io.save`. Chunks are memory-mapped when
+                processed.
+            units : str, optional
+                Units of the data in files without units (e.g. written by
+                ``numpy.save``). Files written by :func:`~vunits.io.save`
+                already have units. Default is dimensionless.
+            n_workers : int, optional
+                Number of threads used to process chunks. Default is None.
+        Returns
+        -------
+            chunked_quantity : :class:`~vunits.quantity.chunked.ChunkedQuantity`
+                New object.
+        Raises
+        ------
+            TypeError
+                If the chunk files have different units.
+        """
+        from vunits.io import _read_units
+        paths = list(paths)
+        file_units = [_read_units(path) for path in paths]
+        if units is None:
+            unit_qty = Quantity()
+        else:
+            unit_qty = Quantity.from_units(units=units)
+        chunk_units = [unit_qty.units if chunk_units is None else chunk_units
+                       for chunk_units in file_units]
+        for path, units_i in zip(paths, chunk_units):
+            if units_i != chunk_units[0]:
+                err_msg = ('Chunk file "{}" has different units than "{}".'
+                           ''.format(path, paths[0]))
+                raise TypeError(err_msg)
+        # Factors only apply to files without units
+        factors = [unit_qty.mag if units_i is None else 1.
+                   for units_i in file_units]
+
+        def get_chunk(i):
+            chunk = np.load(paths[i], mmap_mode='r')
+            if factors[i] != 1.:
+                chunk = chunk*factors[i]
+            return chunk
+
+        headers = [np.load(path, mmap_mode='r') for path in paths]
+        obj = cls.__new__(cls)
+        obj._get_chunk = get_chunk
+        obj._lengths = tuple([len(header) for header in headers])
+        obj._row_shape = tuple(headers[0].shape[1:])
+        obj._dtype = _float_dtype(headers[0].dtype)
+        obj._units = dict(chunk_units[0])
+        obj.n_workers = n_workers
+        return obj
+
+    def _new(self, get_chunk, units, dtype=None):
+        """Helper method to create a
+        :class:`~vunits.quantity.chunked.ChunkedQuantity` with the same
+        chunks
+
+        Parameters
+        ----------
+            get_chunk : callable
+                Function that takes the index of a chunk and returns its SI
+                magnitude
+            units : dict
+                Units of the new object
+            dtype : data-type, optional
+                Type of the magnitude. Default is the type of this object.
+        Returns
+        -------
+            chunked_quantity : :class:`~vunits.quantity.chunked.ChunkedQuantity`
+                New object
+        """
+        obj = ChunkedQuantity.__new__(ChunkedQuantity)
+        obj._get_chunk = get_chunk
+        obj._lengths = self._lengths
+        obj._row_shape = self._row_shape
+        obj._dtype = self._dtype if dtype is None else dtype
+        obj._units = units
+        obj.n_workers = self.n_workers
+        return obj
+
+    @property
+    def units(self):
+        """dict: Units. Keys are 'm', 'kg', 's', 'A', 'K', 'mol', 'cd'."""
+        return self._units
+
+    @property
+    def shape(self):
+        """tuple: Shape of the full magnitude."""
+        return (sum(self._lengths),) + self._row_shape
+
+    @property
+    def n_chunks(self):
+        """int: Number of chunks."""
+        return len(self._lengths)
+
+    def __len__(self):
+        return sum(self._lengths)
+
+    def __str__(self):
+        units_str = Quantity._new(mag=1., units=self._units).units_str
+        return 'ChunkedQuantity(shape={}, units={})'.format(self.shape,
+                                                            units_str)
+
+    def __repr__(self):
+        out = ('<vunits.quantity.chunked.ChunkedQuantity object at {} with '
+               'value {}>'.format(hex(id(self)), str(self)))
+        return out
+
+    def chunks(self):
+        """Iterates over the chunks
+
+        Yields
+        ------
+            chunk : :class:`~vunits.quantity.Quantity`
+                Chunk with all the operations applied.
+        """
+        for i in range(self.n_chunks):
+            yield Quantity._new(mag=self._get_chunk(i),
+                                units=dict(self._units))
+
+    def _map(self, func):
+        """Helper method to apply a function to each chunk
+
+        Parameters
+        ----------
+            func : callable
+                Function that takes the index of the chunk and its SI
+                magnitude.
+        Returns
+        -------
+            results : list
+                Results of ``func`` for each chunk in order.
+        """
+        def apply(i):
+            return func(i, self._get_chunk(i))
+
+        if self.n_workers is None or self.n_workers <= 1:
+            return [apply(i) for i in range(self.n_chunks)]
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            return list(executor.map(apply, range(self.n_chunks)))
+
+    def _binary(self, other, ufunc, units, reflected=False):
+        """Helper method to apply a binary operation lazily
+
+        Parameters
+        ----------
+            other : :class:`~vunits.quantity.chunked.ChunkedQuantity`,
+            :class:`~vunits.quantity.Quantity` or other object
+                Second operand
+            ufunc : np.ufunc
+                Operation
+            units : dict
+                Units of the result
+            reflected : bool, optional
+                If True, ``other`` is the first operand. Default is False.
+        Returns
+        -------
+            chunked_quantity : :class:`~vunits.quantity.chunked.ChunkedQuantity`
+                Result
+        """
+        get_chunk = self._get_chunk
+        if isinstance(other, ChunkedQuantity):
+            if other._lengths != self._lengths:
+                err_msg = ('ChunkedQuantity objects must have the same chunks '
+                           'to be combined.')
+                raise ValueError(err_msg)
+            get_other = other._get_chunk
+        else:
+            other_mag = getattr(other, 'mag', other)
+
+            def get_other(i):
+                return other_mag
+
+        if reflected:
+            def get_result(i):
+                return ufunc(get_other(i), get_chunk(i))
+        else:
+            def get_result(i):
+                return ufunc(get_chunk(i), get_other(i))
+        dtype = _float_dtype(np.result_type(self._dtype,
+                                            getattr(other, '_dtype', np.float64)
+                                            if isinstance(other,
+                                                          ChunkedQuantity)
+                                            else self._dtype))
+        return self._new(get_chunk=get_result, units=units, dtype=dtype)
+
+    def add(self, other, operation='Addition', ufunc=np.add, reflected=False):
+        """Helper method for addition and subtraction.
+
+        Parameters
+        ----------
+            other : :class:`~vunits.quantity.chunked.ChunkedQuantity`,
+            :class:`~vunits.quantity.Quantity` or other object
+                Variable to add
+            operation : str, optional
+                Operation to apply. Default is 'Addition'.
+            ufunc : np.ufunc, optional
+                Function applied to the chunks. Default is np.add.
+            reflected : bool, optional
+                If True, ``other`` is the first operand. Default is False.
+        Returns
+        -------
+            out : :class:`~vunits.quantity.chunked.ChunkedQuantity`
+                Result
+        """
+        if _check_units() and self._units != _get_units(other):
+            err_msg = ('{} incompatible due to different units, {} and {}.'
+                       ''.format(operation, str(self), str(other)))
+            raise TypeError(err_msg)
+        return self._binary(other=other, ufunc=ufunc, units=self._units,
+                            reflected=reflected)
+
+    def __add__(self, other):
+        return self.add(other=other)
+
+    def __radd__(self, other):
+        return self.add(other=other, reflected=True)
+
+    def __sub__(self, other):
+        return self.add(other=other, operation='Subtraction',
+                        ufunc=np.subtract)
+
+    def __rsub__(self, other):
+        return self.add(other=other, operation='Subtraction',
+                        ufunc=np.subtract, reflected=True)
+
+    def __neg__(self):
+        get_chunk = self._get_chunk
+        return self._new(get_chunk=lambda i: -get_chunk(i), units=self._units)
+
+    def __mul__(self, other):
+        units = _add_units(self._units, _get_units(other))
+        return self._binary(other=other, ufunc=np.multiply, units=units)
+
+    def __rmul__(self, other):
+        units = _add_units(self._units, _get_units(other))
+        return self._binary(other=other, ufunc=np.multiply, units=units,
+                            reflected=True)
+
+    def __truediv__(self, other):
+        units = _sub_units(self._units, _get_units(other))
+        return self._binary(other=other, ufunc=np.divide, units=units)
+
+    def __rtruediv__(self, other):
+        units = _sub_units(_get_units(other), self._units)
+        return self._binary(other=other, ufunc=np.divide, units=units,
+                            reflected=True)
+
+    def __pow__(self, other):
+        if isinstance(other, Quantity):
+            if _check_units() and not other._is_dimless():
+                err_msg = ('Power operation incompatible exponent with units, '
+                           '{}.'.format(str(other)))
+                raise TypeError(err_msg)
+            other = other.mag
+        return self._binary(other=other, ufunc=np.power,
+                            units=_mul_units(self._units, other))
+
+    def sum(self, axis=None):
+        """Sums the magnitude chunk by chunk
+
+        Parameters
+        ----------
+            axis : int, optional
+                Axis to sum over. Only None (all elements) and 0 are
+                supported. Default is None.
+        Returns
+        -------
+            total : :class:`~vunits.quantity.Quantity`
+                Sum
+        """
+        _check_axis(axis)
+        partials = self._map(lambda i, chunk: np.sum(chunk, axis=axis))
+        return Quantity._new(mag=np.sum(partials, axis=0),
+                             units=dict(self._units))
+
+    def mean(self, axis=None):
+        """Calculates the mean chunk by chunk
+
+        Parameters
+        ----------
+            axis : int, optional
+                Axis to average over. Only None (all elements) and 0 are
+                supported. Default is None.
+        Returns
+        -------
+            mean : :class:`~vunits.quantity.Quantity`
+                Mean
+        """
+        total = self.sum(axis=axis)
+        if axis is None:
+            count = int(np.prod(self.shape))
+        else:
+            count = len(self)
+        total.mag = total.mag/count
+        return total
+
+    def min(self, axis=None):
+        """Calculates the minimum chunk by chunk
+
+        Parameters
+        ----------
+            axis : int, optional
+                Axis to reduce. Only None (all elements) and 0 are supported.
+                Default is None.
+        Returns
+        -------
+            minimum : :class:`~vunits.quantity.Quantity`
+                Minimum
+        """
+        _check_axis(axis)
+        partials = self._map(lambda i, chunk: np.min(chunk, axis=axis))
+        return Quantity._new(mag=np.min(partials, axis=0),
+                             units=dict(self._units))
+
+    def max(self, axis=None):
+        """Calculates the maximum chunk by chunk
+
+        Parameters
+        ----------
+            axis : int, optional
+                Axis to reduce. Only None (all elements) and 0 are supported.
+                Default is None.
+        Returns
+        -------
+            maximum : :class:`~vunits.quantity.Quantity`
+                Maximum
+        """
+        _check_axis(axis)
+        partials = self._map(lambda i, chunk: np.max(chunk, axis=axis))
+        return Quantity._new(mag=np.max(partials, axis=0),
+                             units=dict(self._units))
+
+    def __call__(self, units=None, out=None):
+        """Returns the magnitude in the desired units, converting one chunk at
+        a time
+
+        Parameters
+        ----------
+            units : str, optional
+                Desired units. If not specified, the SI magnitude (or the
+                magnitude in the active unit system) is returned.
+            out : np.ndarray, optional
+                Array to write the result to (e.g. a ``numpy.memmap`` for
+                results larger than the memory). If not specified, a new
+                array is created.
+        Returns
+        -------
+            mag : np.ndarray
+                Magnitude in the desired units
+        """
+        out = self._get_out(out)
+        offsets = np.cumsum((0,) + self._lengths)
+        from vunits.db import _temp_units
+        if units in _temp_units:
+            # Temperatures require offsets
+            from vunits.convert import convert_temp
+            self._get_factor('K')
+
+            def convert(i, chunk):
+                convert_temp(num=chunk, initial='K', final=units,
+                             out=out[offsets[i]:offsets[i+1]])
+        else:
+            factor = self._get_factor(units)
+
+            def convert(i, chunk):
+                _divide(chunk, factor, out=out[offsets[i]:offsets[i+1]])
+        self._map(convert)
+        return out
+
+    def _get_out(self, out):
+        """Helper method to get the array results are written to
+
+        Parameters
+        ----------
+            out : np.ndarray or None
+                Array provided by the user. If None, a new array is created.
+        Returns
+        -------
+            out : np.ndarray
+                Array with the shape of the object
+        Raises
+        ------
+            ValueError
+                If ``out`` does not have the shape of the object.
+        """
+        if out is None:
+            return np.empty(self.shape, dtype=self._dtype)
+        if out.shape != self.shape:
+            err_msg = ('Output array has shape {} but the object has shape {}.'
+                       ''.format(out.shape, self.shape))
+            raise ValueError(err_msg)
+        return out
+
+    def _get_factor(self, units):
+        """Helper method to calculate the factor to convert to ``units``
+
+        Parameters
+        ----------
+            units : str or None
+                Desired units. If None, uses the active unit system.
+        Returns
+        -------
+            factor : float
+                Magnitude of ``units`` in SI units.
+        Raises
+        ------
+            ValueError
+                If ``units`` are not compatible with the object's units.
+        """
+        if units is None:
+            system = _active_system.get()
+            if system is None:
+                return 1.
+            return system.factor(self._units)
+        from vunits.parse import _parse_factor
+        factor, units_out = _parse_factor(units=units)
+        if _check_units() and self._units != units_out:
+            units_obj = Quantity._from_qty(units=units_out, mag=factor)
+            err_msg = ('Unit conversion not possible due to incompatibility '
+                       'between object\'s units, {}, and requested units, {}.'
+                       ''.format(str(self), str(units_obj)))
+            raise ValueError(err_msg)
+        return factor
+
+    def si(self, out=None):
+        """Returns the SI magnitude regardless of the active unit system
+
+        Parameters
+        ----------
+            out : np.ndarray, optional
+                Array to write the result to. If not specified, a new array is
+                created.
+        Returns
+        -------
+            mag : np.ndarray
+                SI magnitude
+        """
+        out = self._get_out(out)
+        offsets = np.cumsum((0,) + self._lengths)
+
+        def write(i, chunk):
+            out[offsets[i]:offsets[i+1]] = chunk
+        self._map(write)
+        return out
+
+    def to_quantity(self):
+        """Loads the full magnitude into memory
+
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                Quantity with the SI magnitude
+        """
+        return Quantity._new(mag=self.si(), units=dict(self._units))
+
+def _float_dtype(dtype):
+    """Helper method to get the type of magnitudes after conversions
+
+    Parameters
+    ----------
+        dtype : data-type
+            Type of the data
+    Returns
+    -------
+        dtype_out : np.dtype
+            ``dtype`` if it is a floating point type. Otherwise, float64.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'fc':
+        return dtype
+    return np.dtype(np.float64)
+
+def _check_axis(axis):
+    """Helper method to check reductions are supported along ``axis``
+
+    Raises
+    ------
+        ValueError
+            If ``axis`` is not None or 0.
+    """
+    if axis not in (None, 0):
+        err_msg = ('ChunkedQuantity reductions only support axis=None or '
+                   'axis=0, not {}.'.format(axis))
+        raise ValueError(err_msg)
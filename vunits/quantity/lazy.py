@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.quantity.lazy
+
+Lazy evaluation of :class:`~vunits.quantity.Quantity` array expressions.
+"""
+
+import numpy as np
+
+from vunits.quantity import (Quantity, _check_units, _get_units, _add_units,
+                             _sub_units, _mul_units)
+from vunits.system import _active_system
+
+_chunk_elements = 65536
+"""int: Default number of elements evaluated per chunk. Chunks are small
+enough for the intermediate buffers to stay in the processor cache."""
+
+class LazyQuantity:
+    """Expression of :class:`~vunits.quantity.Quantity` objects that is
+    evaluated on demand
+
+    Operations (+, -, \\*, /, \\*\\*) on
+    :class:`~vunits.quantity.lazy.LazyQuantity` objects build an expression
+    graph instead of allocating arrays. Units are resolved (and checked) when
+    the graph is built and scalar factors are folded together. The graph is
+    evaluated in chunks along the first axis using reused buffers when
+    :meth:`~vunits.quantity.lazy.LazyQuantity.evaluate` or
+    :meth:`~vunits.quantity.lazy.LazyQuantity.__call__` is used. Created using
+    :meth:`~vunits.quantity.Quantity.lazy`.
+
+    Attributes
+    ----------
+        quantity : :class:`~vunits.quantity.Quantity` or float
+            Quantity to wrap. Other objects (e.g. float or np.ndarray) are
+            dimensionless.
+    """
+
+    _vunits_priority = True
+    # Operations with numpy arrays are handled by the reflected methods
+    __array_ufunc__ = None
+
+    def __init__(self, quantity):
+        self._op = None
+        self._args = ()
+        self._coefs = None
+        self._scale = 1.
+        self._mag = getattr(quantity, 'mag', quantity)
+        self._units = dict(_get_units(quantity))
+
+    @classmethod
+    def _new(cls, op, args, scale, units, coefs=None, mag=None):
+        """Helper method to create a node of the expression graph
+
+        Parameters
+        ----------
+            op : str or None
+                Operation of the node. None for leaves.
+            args : tuple of :class:`~vunits.quantity.lazy.LazyQuantity`
+                Operands
+            scale : float
+                Factor multiplying the result of the operation
+            units : dict
+                Units of the result
+            coefs : tuple of float, optional
+                Coefficients of the operands for additions
+            mag : float or np.ndarray, optional
+                Magnitude of leaves
+        Returns
+        -------
+            node : :class:`~vunits.quantity.lazy.LazyQuantity`
+                New node
+        """
+        obj = cls.__new__(cls)
+        obj._op = op
+        obj._args = args
+        obj._coefs = coefs
+        obj._scale = scale
+        obj._mag = mag
+        obj._units = units
+        return obj
+
+    @property
+    def units_str(self):
+        """str: Units of the expression in SI units. The object does not have
+        a ``units`` attribute so :class:`~vunits.quantity.Quantity` operators
+        defer to the reflected methods of
+        :class:`~vunits.quantity.lazy.LazyQuantity`."""
+        return Quantity._new(mag=1., units=self._units).units_str
+
+    def __str__(self):
+        return 'LazyQuantity({})'.format(self.units_str)
+
+    def __repr__(self):
+        out = ('<vunits.quantity.lazy.LazyQuantity object at {} with units '
+               '{}>'.format(hex(id(self)), self.units_str))
+        return out
+
+    def _scaled(self, factor, units=None):
+        """Helper method to copy the node with a different scale
+
+        Parameters
+        ----------
+            factor : float
+                Factor to multiply the scale
+            units : dict, optional
+                Units of the copy. Default is the units of the node.
+        Returns
+        -------
+            node : :class:`~vunits.quantity.lazy.LazyQuantity`
+                Copy sharing the operands of the node
+        """
+        if units is None:
+            units = self._units
+        return LazyQuantity._new(op=self._op, args=self._args,
+                                 scale=self._scale*factor, units=units,
+                                 coefs=self._coefs, mag=self._mag)
+
+    def add(self, other, operation='Addition', other_sign=1.):
+        """Helper method for addition.
+
+        Parameters
+        ----------
+            other : :class:`~vunits.quantity.lazy.LazyQuantity`,
+            :class:`~vunits.quantity.Quantity` or other object
+                Variable to add
+            operation : str, optional
+                Operation to apply. Default is 'Addition'.
+            other_sign : float, optional
+                Sign of ``other``. Use -1 for subtraction. Default is 1.
+        Returns
+        -------
+            out : :class:`~vunits.quantity.lazy.LazyQuantity`
+                Expression of the sum.
+        """
+        other = _as_lazy(other)
+        if _check_units() and self._units != other._units:
+            err_msg = ('{} incompatible due to different units, {} and {}.'
+                       ''.format(operation, str(self), str(other)))
+            raise TypeError(err_msg)
+        # The result is scaled by the scale of self so only the second
+        # operand needs to be multiplied when evaluated
+        if self._scale == 0.:
+            scale = 1.
+            coefs = (0., other_sign*other._scale)
+        else:
+            scale = self._scale
+            coefs = (1., other_sign*other._scale/self._scale)
+        return LazyQuantity._new(op='add', args=(self, other), scale=scale,
+                                 units=self._units, coefs=coefs)
+
+    def __add__(self, other):
+        return self.add(other=other)
+
+    def __radd__(self, other):
+        return _as_lazy(other).add(other=self)
+
+    def __sub__(self, other):
+        return self.add(other=other, operation='Subtraction', other_sign=-1.)
+
+    def __rsub__(self, other):
+        return _as_lazy(other).add(other=self, operation='Subtraction',
+                                   other_sign=-1.)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._scaled(-1.)
+
+    def __mul__(self, other):
+        other = _as_lazy(other)
+        units = _add_units(self._units, other._units)
+        # Fold scalar operands into the scale
+        if other._is_scalar():
+            return self._scaled(other._mag*other._scale, units=units)
+        if self._is_scalar():
+            return other._scaled(self._mag*self._scale, units=units)
+        return LazyQuantity._new(op='mul', args=(self, other),
+                                 scale=self._scale*other._scale, units=units)
+
+    def __rmul__(self, other):
+        return self.__mul__(other=other)
+
+    def __truediv__(self, other):
+        other = _as_lazy(other)
+        units = _sub_units(self._units, other._units)
+        if other._is_scalar():
+            return self._scaled(1./(other._mag*other._scale), units=units)
+        return LazyQuantity._new(op='div', args=(self, other),
+                                 scale=self._scale/other._scale, units=units)
+
+    def __rtruediv__(self, other):
+        return _as_lazy(other).__truediv__(other=self)
+
+    def __pow__(self, other):
+        try:
+            other_units = other.units
+        except AttributeError:
+            power = other
+        else:
+            if _check_units() and any(other_units.values()):
+                err_msg = ('Power operation incompatible exponent with units, '
+                           '{}.'.format(str(other)))
+                raise TypeError(err_msg)
+            power = other.mag
+        if np.ndim(power) != 0:
+            err_msg = ('Power of LazyQuantity must be a scalar, not {}.'
+                       ''.format(power))
+            raise TypeError(err_msg)
+        units = _mul_units(self._units, power)
+        if self._is_scalar():
+            return LazyQuantity._new(op=None, args=(), scale=1., units=units,
+                                     mag=(self._mag*self._scale)**power)
+        return LazyQuantity._new(op='pow', args=(self,),
+                                 scale=self._scale**power, units=units,
+                                 coefs=(power,))
+
+    def _is_scalar(self):
+        """Helper method to check if the node is a leaf with a scalar
+        magnitude
+
+        Returns
+        -------
+            is_scalar : bool
+                True if the node can be folded into a scale.
+        """
+        return self._op is None and np.ndim(self._mag) == 0
+
+    def evaluate(self, chunk_size=None, out=None):
+        """Evaluates the expression
+
+        Parameters
+        ----------
+            chunk_size : int, optional
+                Number of elements along the first axis evaluated at a time.
+                If not specified, chunks of about 65536 elements are used.
+            out : np.ndarray, optional
+                Array to write the SI magnitude to. If not specified, a new
+                array is created.
+        Returns
+        -------
+            quantity : :class:`~vunits.quantity.Quantity`
+                Result of the expression.
+        """
+        mag = self._evaluate(scale=self._scale, chunk_size=chunk_size, out=out)
+        return Quantity._new(mag=mag, units=dict(self._units))
+
+    def __call__(self, units=None, out=None, chunk_size=None):
+        """Evaluates the expression and returns the magnitude in the desired
+        units. The conversion factor is folded into the evaluation so no
+        additional pass over the result is needed.
+
+        Parameters
+        ----------
+            units : str, optional
+                Desired units. If not specified, the SI magnitude (or the
+                magnitude in the active unit system) is returned.
+            out : np.ndarray, optional
+                Array to write the result to. If not specified, a new array is
+                created.
+            chunk_size : int, optional
+                Number of elements along the first axis evaluated at a time.
+                If not specified, chunks of about 65536 elements are used.
+        Returns
+        -------
+            mag : float or np.ndarray
+                Magnitude in the desired units.
+        """
+        if units is None:
+            system = _active_system.get()
+            if system is None:
+                factor = 1.
+            else:
+                factor = system.factor(self._units)
+        else:
+            from vunits.db import _temp_units
+            from vunits.parse import _parse_factor
+            temp_units = {key: float(key == 'K') for key in self._units}
+            if units in _temp_units or self._units == temp_units:
+                # Temperature offsets are handled by Quantity
+                quantity = self.evaluate(chunk_size=chunk_size)
+                return quantity(units, out=out)
+            factor, units_out = _parse_factor(units=units)
+            if _check_units() and self._units != units_out:
+                units_obj = Quantity._from_qty(units=units_out, mag=factor)
+                err_msg = ('Unit conversion not possible due to '
+                           'incompatibility between object\'s units, {}, and '
+                           'requested units, {}.'
+                           ''.format(self.units_str, str(units_obj)))
+                raise ValueError(err_msg)
+        return self._evaluate(scale=self._scale/factor, chunk_size=chunk_size,
+                              out=out)
+
+    def _evaluate(self, scale, chunk_size=None, out=None):
+        """Helper method to evaluate the expression in chunks
+
+        Parameters
+        ----------
+            scale : float
+                Factor applied to the result of the graph. Used instead of
+                the scale of the root so conversion factors can be folded.
+            chunk_size : int, optional
+                Number of elements along the first axis evaluated at a time.
+            out : np.ndarray, optional
+                Array to write the result to.
+        Returns
+        -------
+            mag : float or np.ndarray
+                Result
+        """
+        nodes = _get_nodes(self)
+        refcounts = {}
+        for node in nodes:
+            for arg in node._args:
+                refcounts[id(arg)] = refcounts.get(id(arg), 0) + 1
+        mags = [node._mag for node in nodes if node._op is None]
+        shape = np.broadcast_shapes(*[np.shape(mag) for mag in mags])
+        dtype = np.result_type(*mags)
+        if dtype.kind not in 'fc':
+            dtype = np.result_type(dtype, np.float64)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            err_msg = ('Output array has shape {} but the expression has shape '
+                       '{}.'.format(out.shape, shape))
+            raise ValueError(err_msg)
+
+        if len(shape) == 0:
+            chunks = [Ellipsis]
+        else:
+            if chunk_size is None:
+                row_size = int(np.prod(shape[1:]))
+                chunk_size = max(1, _chunk_elements//max(1, row_size))
+            chunks = [slice(start, start + chunk_size)
+                      for start in range(0, shape[0], chunk_size)]
+
+        pools = {}
+        for chunk in chunks:
+            out_chunk = out[chunk]
+            try:
+                pool = pools[out_chunk.shape]
+            except KeyError:
+                pool = _BufferPool(shape=out_chunk.shape, dtype=dtype)
+                pools[out_chunk.shape] = pool
+            context = _EvalContext(chunk=chunk, shape=shape,
+                                   refcounts=refcounts, pool=pool)
+            result, is_temp = self._eval(context)
+            if scale == 1.:
+                np.copyto(out_chunk, result)
+            else:
+                np.multiply(result, scale, out=out_chunk)
+            if is_temp:
+                pool.release(result)
+            context.release()
+        if len(shape) == 0:
+            return out[()]
+        return out
+
+    def _eval(self, context):
+        """Helper method to evaluate the node (without its scale) for one
+        chunk
+
+        Parameters
+        ----------
+            context : _EvalContext
+                Chunk, buffers and intermediate results.
+        Returns
+        -------
+            result : float or np.ndarray
+                Result of the node.
+            is_temp : bool
+                True if ``result`` is a buffer that can be overwritten.
+        """
+        key = id(self)
+        try:
+            return (context.memo[key], False)
+        except KeyError:
+            pass
+
+        if self._op is None:
+            result = context.slice(self._mag)
+            is_temp = False
+        elif self._op == 'pow':
+            arg, arg_temp = self._args[0]._eval(context)
+            result = context.apply(np.power, arg, arg_temp, self._coefs[0],
+                                   False)
+            is_temp = True
+        else:
+            arg1, arg1_temp = self._args[0]._eval(context)
+            arg2, arg2_temp = self._args[1]._eval(context)
+            if self._op == 'add':
+                coef1, coef2 = self._coefs
+                if coef1 == 0.:
+                    # Only the second operand contributes
+                    if arg1_temp:
+                        context.pool.release(arg1)
+                    result = context.apply(np.multiply, arg2, arg2_temp, coef2,
+                                           False)
+                elif coef2 == 1.:
+                    result = context.apply(np.add, arg1, arg1_temp, arg2,
+                                           arg2_temp)
+                elif coef2 == -1.:
+                    result = context.apply(np.subtract, arg1, arg1_temp, arg2,
+                                           arg2_temp)
+                else:
+                    arg2 = context.apply(np.multiply, arg2, arg2_temp, coef2,
+                                         False)
+                    result = context.apply(np.add, arg1, arg1_temp, arg2, True)
+            elif self._op == 'mul':
+                result = context.apply(np.multiply, arg1, arg1_temp, arg2,
+                                       arg2_temp)
+            else:
+                result = context.apply(np.divide, arg1, arg1_temp, arg2,
+                                       arg2_temp)
+            is_temp = True
+
+        # Results used by several nodes are kept until the chunk is done
+        if context.refcounts.get(key, 0) > 1:
+            context.memo[key] = result
+            if is_temp:
+                context.held.append(result)
+            is_temp = False
+        return (result, is_temp)
+
+
+class _BufferPool:
+    """Buffers of one chunk shape that are reused between operations and
+    chunks
+
+    Attributes
+    ----------
+        shape : tuple
+            Shape of the buffers
+        dtype : data-type
+            Type of the buffers
+    """
+    def __init__(self, shape, dtype):
+        self.shape = shape
+        self.dtype = dtype
+        self._free = []
+
+    def get(self):
+        """Returns a free buffer, allocating one if necessary"""
+        try:
+            return self._free.pop()
+        except IndexError:
+            return np.empty(self.shape, dtype=self.dtype)
+
+    def release(self, buffer):
+        """Returns a buffer to the pool"""
+        self._free.append(buffer)
+
+
+class _EvalContext:
+    """State used to evaluate one chunk of an expression
+
+    Attributes
+    ----------
+        chunk : slice or Ellipsis
+            Part of the first axis being evaluated
+        shape : tuple
+            Shape of the full result
+        refcounts : dict
+            Number of parents of each node. Keys are the node ids.
+        pool : _BufferPool
+            Buffers for intermediate results
+    """
+    def __init__(self, chunk, shape, refcounts, pool):
+        self.chunk = chunk
+        self.shape = shape
+        self.refcounts = refcounts
+        self.pool = pool
+        self.memo = {}
+        self.held = []
+
+    def slice(self, mag):
+        """Returns the part of a leaf magnitude in the chunk. Magnitudes that
+        are broadcast along the first axis are not sliced."""
+        if (self.chunk is Ellipsis or np.ndim(mag) != len(self.shape)
+                or np.shape(mag)[0] != self.shape[0]):
+            return mag
+        return mag[self.chunk]
+
+    def apply(self, ufunc, arg1, arg1_temp, arg2, arg2_temp):
+        """Applies a binary ufunc writing to a temporary operand if possible
+
+        Parameters
+        ----------
+            ufunc : np.ufunc
+                Function to apply
+            arg1, arg2 : float or np.ndarray
+                Operands
+            arg1_temp, arg2_temp : bool
+                Whether each operand is a buffer that can be overwritten
+        Returns
+        -------
+            result : np.ndarray
+                Buffer holding the result
+        """
+        if arg1_temp:
+            out = arg1
+            if arg2_temp:
+                self.pool.release(arg2)
+        elif arg2_temp:
+            out = arg2
+        else:
+            out = self.pool.get()
+        return ufunc(arg1, arg2, out=out)
+
+    def release(self):
+        """Returns the buffers of shared nodes to the pool"""
+        for buffer in self.held:
+            self.pool.release(buffer)
+        self.held = []
+        self.memo = {}
+
+
+def lazy(quantity):
+    """Wraps a :class:`~vunits.quantity.Quantity` so operations build an
+    expression graph
+
+    Parameters
+    ----------
+        quantity : :class:`~vunits.quantity.Quantity` or float
+            Quantity to wrap.
+    Returns
+    -------
+        lazy_quantity : :class:`~vunits.quantity.lazy.LazyQuantity`
+            Lazy expression. Use ``evaluate`` or call the object to compute
+            the result.
+    """
+    return _as_lazy(quantity)
+
+def _as_lazy(obj):
+    """Helper method to wrap objects as leaves of an expression graph
+
+    Parameters
+    ----------
+        obj : :class:`~vunits.quantity.lazy.LazyQuantity`,
+        :class:`~vunits.quantity.Quantity` or other object
+            Object to wrap
+    Returns
+    -------
+        lazy_quantity : :class:`~vunits.quantity.lazy.LazyQuantity`
+            ``obj`` if it is already lazy. Otherwise, a new leaf.
+    """
+    if isinstance(obj, LazyQuantity):
+        return obj
+    return LazyQuantity(obj)
+
+def _get_nodes(root):
+    """Helper method to list the unique nodes of an expression graph
+
+    Parameters
+    ----------
+        root : :class:`~vunits.quantity.lazy.LazyQuantity`
+            Root of the graph
+    Returns
+    -------
+        nodes : list of :class:`~vunits.quantity.lazy.LazyQuantity`
+            Unique nodes of the graph
+    """
+    nodes = []
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        nodes.append(node)
+        stack.extend(node._args)
+    return nodes
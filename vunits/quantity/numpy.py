@@ -1,8 +1,15 @@
+from warnings import warn
+
 import numpy as np
 from vunits.quantity import Quantity as Qty
 
 HANDLED_FUNCTIONS = {}
 
+HANDLED_UFUNCS = (np.exp, np.expm1, np.exp2, np.log, np.log10, np.log2,
+                  np.log1p)
+"""tuple: Ufuncs dispatched to ``HANDLED_FUNCTIONS`` by
+``Quantity.__array_ufunc__``. Other ufuncs are applied to the magnitudes."""
+
 
 def implements(np_function):
     def decorator(func):
@@ -56,7 +63,6 @@ https://docs.scipy.org/doc/numpy/reference/routines.math.html#exponents-and-loga
 '''
 @implements(np.exp)
 def exp(x, **kwargs):
-    pass
     _dimless_warn('numpy.exp', x)
     return Qty(mag=np.exp(x.mag, **kwargs))
 
@@ -221,8 +227,10 @@ def nan_to_num(x, **kwargs):
 def interp(x, xp, fp, **kwargs):
     xp_out = _return_quantity(quantity=xp, return_quantity=False,
                               units_out=x.units_str)
-    fp_out = _return_quantity(quantity=fp, return_quantity=False,
-                              units_out=None)
+    try:
+        fp_out = fp.si()
+    except AttributeError:
+        fp_out = fp
     try:
         fp_units = fp.units
     except AttributeError:
@@ -232,7 +240,7 @@ def interp(x, xp, fp, **kwargs):
 
 
 @implements(np.mean)
-def mean(a):
+def mean(a, **kwargs):
     return Qty._from_qty(units=a.units, mag=np.mean(a.mag, **kwargs))
 
 
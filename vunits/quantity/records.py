@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.quantity.records
+
+Tables of quantities stored in a numpy structured array.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+from vunits.quantity import Quantity, _check_units
+
+class QuantityRecords:
+    """Table of quantities with different units stored in a numpy structured
+    array. Rows of all the fields are contiguous in memory so filtering and
+    sorting rows are single operations.
+
+    Attributes
+    ----------
+        data : np.ndarray
+            Structured array with the SI magnitude of each field.
+        units : dict, optional
+            Keys are field names and values are dictionaries of units (e.g.
+            ``Quantity.units``). Fields not specified are dimensionless.
+    Raises
+    ------
+        ValueError
+            If ``data`` is not a structured array or ``units`` has fields not
+            in ``data``.
+    """
+
+    def __init__(self, data, units=None):
+        if data.dtype.names is None:
+            err_msg = 'QuantityRecords requires a structured array.'
+            raise ValueError(err_msg)
+        if units is None:
+            units = {}
+        unknown_fields = set(units) - set(data.dtype.names)
+        if len(unknown_fields) > 0:
+            err_msg = ('Units specified for fields not in the data, {}.'
+                       ''.format(sorted(unknown_fields)))
+            raise ValueError(err_msg)
+        self.data = data
+        self._units = {field: dict(units.get(field, Quantity().units))
+                       for field in data.dtype.names}
+
+    @classmethod
+    def from_quantities(cls, quantities, dtype=float):
+        """Creates a :class:`~vunits.quantity.records.QuantityRecords` from
+        :class:`~vunits.quantity.Quantity` objects
+
+        Parameters
+        ----------
+            quantities : dict
+                Keys are field names and values are
+                :class:`~vunits.quantity.Quantity` objects with the same
+                length.
+            dtype : data-type, optional
+                Type of the fields. Default is float.
+        Returns
+        -------
+            records : :class:`~vunits.quantity.records.QuantityRecords`
+                New object.
+        Raises
+        ------
+            ValueError
+                If the quantities have different lengths.
+        """
+        mags = {field: np.asarray(quantity.mag)
+                for field, quantity in quantities.items()}
+        lengths = set([len(mag) for mag in mags.values()])
+        if len(lengths) > 1:
+            err_msg = ('Quantities must have the same length to create '
+                       'records, not {}.'.format(sorted(lengths)))
+            raise ValueError(err_msg)
+        record_dtype = [(field, dtype, mag.shape[1:])
+                        for field, mag in mags.items()]
+        data = np.empty(lengths.pop(), dtype=record_dtype)
+        for field, mag in mags.items():
+            data[field] = mag
+        units = {field: quantity.units
+                 for field, quantity in quantities.items()}
+        return cls(data=data, units=units)
+
+    @classmethod
+    def from_units(cls, data, units):
+        """Creates a :class:`~vunits.quantity.records.QuantityRecords` by
+        parsing the units of each field
+
+        Parameters
+        ----------
+            data : np.ndarray
+                Structured array with magnitudes in ``units``. Converted to SI
+                units in a copy. Integer fields with units are converted to
+                float.
+            units : dict
+                Keys are field names and values are unit strings (e.g.
+                {'H': 'kJ/mol', 'T': 'oC'}). Fields not specified are
+                dimensionless.
+        Returns
+        -------
+            records : :class:`~vunits.quantity.records.QuantityRecords`
+                New object.
+        """
+        from vunits.db import _temp_units
+        from vunits.convert import convert_temp
+        data = data.astype(np.dtype([(field, _float_field(data.dtype[field])
+                                          if field in units
+                                          else data.dtype[field])
+                                         for field in data.dtype.names]))
+        si_units = {}
+        for field, field_units in units.items():
+            unit_qty = Quantity.from_units(units=field_units)
+            if field_units in _temp_units:
+                # Temperatures require offsets
+                data[field] = convert_temp(num=data[field],
+                                           initial=field_units, final='K')
+            else:
+                data[field] *= unit_qty.mag
+            si_units[field] = unit_qty.units
+        return cls(data=data, units=si_units)
+
+    @property
+    def units(self):
+        """dict: Read-only mapping of field names to units."""
+        return MappingProxyType(self._units)
+
+    @property
+    def fields(self):
+        """tuple of str: Names of the fields."""
+        return self.data.dtype.names
+
+    def __len__(self):
+        return len(self.data)
+
+    def __str__(self):
+        fields = ', '.join(['{} [{}]'.format(field,
+                                             Quantity._new(mag=1.,
+                                                           units=units)
+                                             .units_str.strip())
+                            for field, units in self._units.items()])
+        return 'QuantityRecords({} rows; {})'.format(len(self), fields)
+
+    def __repr__(self):
+        out = ('<vunits.quantity.records.QuantityRecords object at {} with '
+               'value {}>'.format(hex(id(self)), str(self)))
+        return out
+
+    def __getitem__(self, key):
+        """Accesses fields or rows
+
+        Parameters
+        ----------
+            key : str, list of str or index
+                If a str, returns the field as a
+                :class:`~vunits.quantity.Quantity` whose magnitude is a view
+                of ``data``. If a list of str, returns a
+                :class:`~vunits.quantity.records.QuantityRecords` with those
+                fields. Otherwise, ``key`` selects rows (e.g. slice, boolean
+                mask or indices) and a
+                :class:`~vunits.quantity.records.QuantityRecords` is returned.
+        Returns
+        -------
+            out : :class:`~vunits.quantity.Quantity` or :class:`~vunits.quantity.records.QuantityRecords`
+                Selected data
+        """
+        if isinstance(key, str):
+            return Quantity._new(mag=self.data[key],
+                                 units=dict(self._units[key]))
+        if isinstance(key, list) and all(isinstance(field, str)
+                                         for field in key):
+            units = {field: self._units[field] for field in key}
+            return QuantityRecords(data=self.data[key], units=units)
+        data = self.data[key]
+        if data.ndim == 0:
+            data = data.reshape(1)
+        return QuantityRecords(data=data, units=self._units)
+
+    def __setitem__(self, key, value):
+        """Sets a field
+
+        Parameters
+        ----------
+            key : str
+                Name of the field.
+            value : :class:`~vunits.quantity.Quantity`
+                New values. Must have the units of the field.
+        Raises
+        ------
+            TypeError
+                If ``value`` has different units than the field.
+        """
+        units = getattr(value, 'units', Quantity().units)
+        if _check_units() and units != self._units[key]:
+            err_msg = ('Assignment incompatible due to different units, {} '
+                       'and {}.'.format(str(self[key]), str(value)))
+            raise TypeError(err_msg)
+        self.data[key] = getattr(value, 'mag', value)
+
+    def sort(self, order, reverse=False):
+        """Sorts the rows
+
+        Parameters
+        ----------
+            order : str or list of str
+                Fields used to sort the rows. Later fields break ties.
+            reverse : bool, optional
+                If True, rows are sorted in descending order. Default is False.
+        Returns
+        -------
+            records : :class:`~vunits.quantity.records.QuantityRecords`
+                Sorted copy.
+        """
+        indices = np.argsort(self.data, order=order, kind='stable')
+        if reverse:
+            indices = indices[::-1]
+        return QuantityRecords(data=self.data[indices], units=self._units)
+
+    def __call__(self, units=None):
+        """Returns the data with fields in the desired units
+
+        Parameters
+        ----------
+            units : dict, optional
+                Keys are field names and values are the desired units (e.g.
+                {'H': 'kcal/mol', 'T': 'oC'}). Fields not specified are
+                returned in SI units (or in the active unit system).
+        Returns
+        -------
+            data : np.ndarray
+                New structured array with the converted magnitudes.
+        Raises
+        ------
+            ValueError
+                If the desired units are not compatible with a field's units.
+        """
+        if units is None:
+            units = {}
+        out = np.empty_like(self.data)
+        for field in self.fields:
+            self[field](units.get(field), out=out[field])
+        return out
+
+def _float_field(dtype):
+    """Helper method to get the type of a field after unit conversions
+
+    Parameters
+    ----------
+        dtype : np.dtype
+            Type of the field. Can be a subarray type.
+    Returns
+    -------
+        dtype_out : np.dtype
+            ``dtype`` with integer and boolean types replaced by float64.
+    """
+    if dtype.subdtype is None:
+        base, shape = dtype, ()
+    else:
+        base, shape = dtype.subdtype
+    if base.kind in 'biu':
+        base = np.dtype(np.float64)
+    if shape:
+        return np.dtype((base, shape))
+    return base
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.quantity.vector
+
+Vectors whose elements have different units (e.g. solver state vectors).
+"""
+
+import numpy as np
+
+from vunits.quantity import (Quantity, _unit_keys, _units_key, _check_units,
+                             _get_units)
+
+class QuantityVector:
+    """Vector whose elements can have different units
+
+    The magnitudes are stored in one float64 array and the units in an (N, 7)
+    array of SI exponents so operations are vectorized. Segments of the vector
+    can be named to access them as :class:`~vunits.quantity.Quantity` objects.
+
+    Attributes
+    ----------
+        mag : (N,) np.ndarray
+            Magnitudes in SI units. Float64 arrays are used without copying.
+        exponents : (N, 7) or (7,) np.ndarray
+            Powers of the SI units of each element. Columns are ordered as
+            'm', 'kg', 's', 'A', 'K', 'mol', 'cd'. If a 1D array is passed,
+            all elements have the same units.
+        segments : dict, optional
+            Named segments of the vector. Keys are the names and values are
+            slices of ``mag``. Default is no segments.
+    """
+
+    _vunits_priority = True
+    # Operations with numpy arrays are handled by the reflected methods
+    __array_ufunc__ = None
+
+    def __init__(self, mag, exponents, segments=None):
+        self.mag = np.asarray(mag, dtype=np.float64)
+        if self.mag.ndim != 1:
+            err_msg = ('Magnitude of QuantityVector must be 1D, not {}D.'
+                       ''.format(self.mag.ndim))
+            raise ValueError(err_msg)
+        exponents = np.asarray(exponents, dtype=np.float64)
+        if exponents.ndim == 1:
+            exponents = np.broadcast_to(exponents, (len(self.mag), 7))
+        if exponents.shape != (len(self.mag), 7):
+            err_msg = ('Exponents of QuantityVector must have shape ({}, 7), '
+                       'not {}.'.format(len(self.mag), exponents.shape))
+            raise ValueError(err_msg)
+        self.exponents = exponents
+        if segments is None:
+            segments = {}
+        self.segments = segments
+
+    @classmethod
+    def from_segments(cls, segments):
+        """Creates a :class:`~vunits.quantity.vector.QuantityVector` by
+        concatenating :class:`~vunits.quantity.Quantity` objects
+
+        Parameters
+        ----------
+            segments : dict
+                Keys are the names of the segments and values are
+                :class:`~vunits.quantity.Quantity` objects with scalar or 1D
+                magnitudes. Segments are concatenated in order.
+        Returns
+        -------
+            vector : :class:`~vunits.quantity.vector.QuantityVector`
+                New vector.
+        """
+        mags = [np.ravel(getattr(qty, 'mag', qty)) for qty in segments.values()]
+        n = sum([len(mag) for mag in mags])
+        mag_out = np.empty(n, dtype=np.float64)
+        exponents = np.empty((n, 7), dtype=np.float64)
+        segments_out = {}
+        start = 0
+        for (name, qty), mag in zip(segments.items(), mags):
+            slc = slice(start, start + len(mag))
+            mag_out[slc] = mag
+            exponents[slc] = _units_key(_get_units(qty))
+            segments_out[name] = slc
+            start = slc.stop
+        return cls(mag=mag_out, exponents=exponents, segments=segments_out)
+
+    def pack(self, out=None):
+        """Returns the magnitudes as a plain array (e.g. for solvers)
+
+        Parameters
+        ----------
+            out : np.ndarray, optional
+                Array to copy the magnitudes into. If not specified, the
+                magnitude array is returned without copying.
+        Returns
+        -------
+            mag : np.ndarray
+                Magnitudes in SI units.
+        """
+        if out is None:
+            return self.mag
+        np.copyto(out, self.mag)
+        return out
+
+    def unpack(self, mag):
+        """Creates a vector with the units and segments of this vector
+
+        Parameters
+        ----------
+            mag : (N,) np.ndarray
+                Magnitudes in SI units (e.g. the state passed to a solver
+                callback). Float64 arrays are used without copying.
+        Returns
+        -------
+            vector : :class:`~vunits.quantity.vector.QuantityVector`
+                Vector sharing ``mag``, ``exponents`` and ``segments``.
+        Raises
+        ------
+            ValueError
+                If ``mag`` does not have the shape of ``self.mag``.
+        """
+        mag = np.asarray(mag, dtype=np.float64)
+        if mag.shape != self.mag.shape:
+            err_msg = ('Cannot unpack array of shape {} into QuantityVector of '
+                       'shape {}.'.format(mag.shape, self.mag.shape))
+            raise ValueError(err_msg)
+        return QuantityVector._new(mag=mag, exponents=self.exponents,
+                                   segments=self.segments)
+
+    @classmethod
+    def _new(cls, mag, exponents, segments):
+        """Helper method to create a
+        :class:`~vunits.quantity.vector.QuantityVector` without validating
+        the inputs. Used by operations.
+        """
+        obj = cls.__new__(cls)
+        obj.mag = mag
+        obj.exponents = exponents
+        obj.segments = segments
+        return obj
+
+    def __len__(self):
+        return len(self.mag)
+
+    def __iter__(self):
+        for i in range(len(self.mag)):
+            yield self[i]
+
+    def __getitem__(self, key):
+        # Named segments are returned as Quantity objects
+        if isinstance(key, str):
+            slc = self.segments[key]
+            exponents = self.exponents[slc]
+            if len(exponents) > 0 and (exponents != exponents[0]).any():
+                err_msg = ('Segment "{}" does not have uniform units.'
+                           ''.format(key))
+                raise ValueError(err_msg)
+            return Quantity._new(mag=self.mag[slc],
+                                 units=_exponents_to_units(exponents[0]))
+        # Integers return scalar Quantity objects
+        if isinstance(key, (int, np.integer)):
+            return Quantity._new(mag=self.mag[key],
+                                 units=_exponents_to_units(self.exponents[key]))
+        return QuantityVector._new(mag=self.mag[key],
+                                   exponents=self.exponents[key], segments={})
+
+    def __setitem__(self, key, value):
+        if isinstance(key, str):
+            key = self.segments[key]
+        value_exponents = np.array(_units_key(_get_units(value)))
+        if _check_units() and (self.exponents[key] != value_exponents).any():
+            err_msg = ('Assignment incompatible due to different units, {} '
+                       'and {}.'.format(key, str(value)))
+            raise TypeError(err_msg)
+        self.mag[key] = getattr(value, 'mag', value)
+
+    def __call__(self, units=None):
+        """Returns the magnitudes with segments in the desired units
+
+        Parameters
+        ----------
+            units : dict, optional
+                Keys are the names of segments and values are the desired
+                units. Segments not specified remain in SI units. If not
+                specified, returns the magnitudes in SI units.
+        Returns
+        -------
+            mag : np.ndarray
+                Magnitudes. A new array is created if ``units`` is specified.
+        """
+        if units is None:
+            return self.mag
+        mag_out = self.mag.copy()
+        for name, segment_units in units.items():
+            self[name](segment_units, out=mag_out[self.segments[name]])
+        return mag_out
+
+    def __str__(self):
+        if self.segments:
+            return ', '.join(['{}: {}'.format(name, str(self[name]))
+                              for name in self.segments])
+        return '[{}]'.format(', '.join([str(qty) for qty in self]))
+
+    def __repr__(self):
+        out = ('<vunits.quantity.vector.QuantityVector object at {} with '
+               'value {}>'.format(hex(id(self)), str(self)))
+        return out
+
+    def _get_other(self, other):
+        """Helper method to get the magnitude, exponents and segments of the
+        second operand.
+
+        Parameters
+        ----------
+            other : :class:`~vunits.quantity.vector.QuantityVector`,
+            :class:`~vunits.quantity.Quantity` or other object
+                Second operand. Objects other than quantities are
+                dimensionless.
+        Returns
+        -------
+            other_mag : float or np.ndarray
+                Magnitude of ``other``
+            other_exponents : (N, 7) or (7,) np.ndarray
+                Exponents of ``other``
+            segments : dict
+                Segments of the result. Segments are only kept if both
+                vectors have the same segments or ``other`` has none.
+        """
+        if isinstance(other, QuantityVector):
+            if not other.segments or other.segments == self.segments:
+                segments = self.segments
+            elif not self.segments:
+                segments = other.segments
+            else:
+                segments = {}
+            return (other.mag, other.exponents, segments)
+        other_exponents = np.array(_units_key(_get_units(other)),
+                                   dtype=np.float64)
+        return (getattr(other, 'mag', other), other_exponents, self.segments)
+
+    def add(self, other, operation='Addition'):
+        """Helper method for addition.
+
+        Parameters
+        ----------
+            other : :class:`~vunits.quantity.vector.QuantityVector`,
+            :class:`~vunits.quantity.Quantity` or other object
+                Variable to add
+            operation : str, optional
+                Operation to apply. Default is 'Addition'.
+        Returns
+        -------
+            out : :class:`~vunits.quantity.vector.QuantityVector`
+                Result of sum.
+        """
+        other_mag, other_exponents, segments = self._get_other(other)
+        if _check_units() and (self.exponents != other_exponents).any():
+            err_msg = ('{} incompatible due to different units, {} and {}.'
+                       ''.format(operation, str(self), str(other)))
+            raise TypeError(err_msg)
+        return QuantityVector._new(mag=self.mag+other_mag,
+                                   exponents=self.exponents, segments=segments)
+
+    def __add__(self, other):
+        return self.add(other=other)
+
+    def __radd__(self, other):
+        return self.add(other=other)
+
+    def __sub__(self, other):
+        return self.add(other=-other, operation='Subtraction')
+
+    def __rsub__(self, other):
+        return (-self).add(other=other, operation='Subtraction')
+
+    def __pos__(self):
+        return QuantityVector._new(mag=+self.mag, exponents=self.exponents,
+                                   segments=self.segments)
+
+    def __neg__(self):
+        return QuantityVector._new(mag=-self.mag, exponents=self.exponents,
+                                   segments=self.segments)
+
+    def __abs__(self):
+        return QuantityVector._new(mag=np.abs(self.mag),
+                                   exponents=self.exponents,
+                                   segments=self.segments)
+
+    def __mul__(self, other):
+        other_mag, other_exponents, segments = self._get_other(other)
+        exponents = np.broadcast_to(self.exponents + other_exponents,
+                                    self.exponents.shape)
+        return QuantityVector._new(mag=self.mag*other_mag, exponents=exponents,
+                                   segments=segments)
+
+    def __rmul__(self, other):
+        return self.__mul__(other=other)
+
+    def __truediv__(self, other):
+        other_mag, other_exponents, segments = self._get_other(other)
+        exponents = np.broadcast_to(self.exponents - other_exponents,
+                                    self.exponents.shape)
+        return QuantityVector._new(mag=self.mag/other_mag, exponents=exponents,
+                                   segments=segments)
+
+    def __rtruediv__(self, other):
+        other_mag, other_exponents, segments = self._get_other(other)
+        exponents = np.broadcast_to(other_exponents - self.exponents,
+                                    self.exponents.shape)
+        return QuantityVector._new(mag=other_mag/self.mag, exponents=exponents,
+                                   segments=segments)
+
+    def __pow__(self, other):
+        if isinstance(other, Quantity):
+            if _check_units() and not other._is_dimless():
+                err_msg = ('Power operation incompatible exponent with units, '
+                           '{}.'.format(str(other)))
+                raise TypeError(err_msg)
+            other = other.mag
+        power = np.asarray(other, dtype=np.float64)
+        exponents = self.exponents*power[..., np.newaxis]
+        return QuantityVector._new(mag=self.mag**power, exponents=exponents,
+                                   segments=self.segments)
+
+    def __eq__(self, other):
+        other_mag, other_exponents, _ = self._get_other(other)
+        same_units = (self.exponents == other_exponents).all(axis=-1)
+        return (self.mag == other_mag) & same_units
+
+    def __ne__(self, other):
+        return ~(self == other)
+
+def _exponents_to_units(exponents):
+    """Helper method to convert a row of exponents to units
+
+    Parameters
+    ----------
+        exponents : (7,) np.ndarray
+            Powers of the SI units ordered as 'm', 'kg', 's', 'A', 'K', 'mol',
+            'cd'.
+    Returns
+    -------
+        units : dict
+            Units compatible with :attr:`~vunits.quantity.Quantity.units`.
+    """
+    return dict(zip(_unit_keys, exponents.tolist()))
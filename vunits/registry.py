@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.registry
+
+Unit databases that add a few units to a shared database without copying it.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+class UnitRegistry(Mapping):
+    """Unit database made of an overlay of custom units on top of a shared
+    base database. The base is never modified so many registries can share
+    ``vunits.db.unit_db`` (or another registry) while only storing their own
+    units.
+
+    Registries can be passed as ``unit_db`` wherever a unit database is
+    accepted (e.g. :meth:`~vunits.quantity.Quantity.from_units`). Each
+    registry caches its own parsing results.
+
+    Attributes
+    ----------
+        units : dict, optional
+            Custom units. Keys are the names of the units and values are
+            :class:`~vunits.quantity.Quantity` objects. Prefixes and plurals
+            are not added; use
+            :meth:`~vunits.registry.UnitRegistry.register` instead.
+        base : dict or :class:`~vunits.registry.UnitRegistry`, optional
+            Database used for units not in the overlay. Default is
+            ``vunits.db.unit_db``.
+    """
+
+    def __init__(self, units=None, base=None):
+        if base is None:
+            from vunits.db import unit_db
+            base = unit_db
+        self._base = base
+        self._overlay = {}
+        self._version = 0
+        self._parse_cache = OrderedDict()
+        self._cache_version = self.version
+        if units is not None:
+            self._overlay.update(units)
+
+    @property
+    def base(self):
+        """dict or :class:`~vunits.registry.UnitRegistry`: Database used for
+        units not in the overlay."""
+        return self._base
+
+    @property
+    def version(self):
+        """tuple: Versions of this registry and its bases. Changes when units
+        are registered in the registry or its bases."""
+        if isinstance(self._base, UnitRegistry):
+            return (self._version,) + self._base.version
+        from vunits import db
+        if self._base is db.unit_db:
+            return (self._version, db.get_unit_db_version())
+        return (self._version,)
+
+    def __getitem__(self, key):
+        try:
+            return self._overlay[key]
+        except KeyError:
+            return self._base[key]
+
+    def __contains__(self, key):
+        return key in self._overlay or key in self._base
+
+    def __iter__(self):
+        yield from self._overlay
+        for key in self._base:
+            if key not in self._overlay:
+                yield key
+
+    def __len__(self):
+        n_new = sum([key not in self._base for key in self._overlay])
+        return len(self._base) + n_new
+
+    def __repr__(self):
+        out = ('<vunits.registry.UnitRegistry object at {} with {} custom '
+               'units>'.format(hex(id(self)), len(self._overlay)))
+        return out
+
+    def register(self, name, quantity, add_short_prefix=False,
+                 add_long_prefix=False, plural_suffix=None):
+        """Adds a unit to the overlay. Units in the base with the same names
+        are shadowed.
+
+        Parameters
+        ----------
+            name : str
+                Name of the unit.
+            quantity : :class:`~vunits.quantity.Quantity`
+                Value of one unit.
+            add_short_prefix : bool, optional
+                If True, short prefixes are also added. Default is False.
+            add_long_prefix : bool, optional
+                If True, long prefixes are also added. Default is False.
+            plural_suffix : str, optional
+                If specified, plural units are also added. Default is None.
+        Returns
+        -------
+            names : list of str
+                Names added to the overlay.
+        """
+        from vunits.db import _add_prefixes, _add_plural
+        from vunits.quantity import UnitQuantity
+        from vunits.parse import _split_units
+
+        unit_qty = UnitQuantity._from_qty(units=quantity.units,
+                                          mag=quantity.mag,
+                                          add_short_prefix=add_short_prefix,
+                                          add_long_prefix=add_long_prefix,
+                                          plural_suffix=plural_suffix)
+        new_entries = _add_plural(_add_prefixes({name: unit_qty}))
+        self._overlay.update(new_entries)
+        # Discard cached results using the new names
+        parse_cache = self._get_parse_cache()
+        for units in list(parse_cache):
+            if any(unit in new_entries for unit, _ in _split_units(units)):
+                del parse_cache[units]
+        self._version += 1
+        self._cache_version = self.version
+        return list(new_entries)
+
+    def _get_parse_cache(self):
+        """Helper method to get the cache of
+        :func:`~vunits.parse._parse_factor` results. The cache is cleared if
+        units were registered in a base.
+
+        Returns
+        -------
+            parse_cache : collections.OrderedDict
+                Keys are unit strings and values are the SI factor and units.
+        """
+        version = self.version
+        if version != self._cache_version:
+            self._parse_cache.clear()
+            self._cache_version = version
+        return self._parse_cache
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.statmech
+
+Vibrational and rotational partition functions evaluated over arrays of
+species, modes and temperatures.
+"""
+
+import numpy as np
+
+from vunits.convert import wavenumber_to_temp, inertia_to_temp
+from vunits.db import symmetry_dict
+from vunits.quantity import Quantity, _return_quantity
+
+def q_vib(wavenumbers, T, units_in='cm-1', T_units='K', mask=None,
+          include_zpe=True, log=False, return_quantity=False):
+    """Calculates harmonic vibrational partition functions
+
+    Parameters
+    ----------
+        wavenumbers : (..., M) array-like or :class:`~vunits.quantity.Quantity` obj
+            Wavenumbers of up to M modes of each species. Species with fewer
+            modes can be given as a list of lists of different lengths or
+            padded with 0 or NaN.
+        T : float, (N,) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures.
+        units_in : str, optional
+            Units of ``wavenumbers`` if it is not a
+            :class:`~vunits.quantity.Quantity`. Default is 'cm-1'.
+        T_units : str, optional
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is 'K'.
+        mask : (..., M) np.ndarray of bool, optional
+            True for modes to include. If not specified, modes that are 0 or
+            NaN are excluded.
+        include_zpe : bool, optional
+            If True, the partition function is referenced to the bottom of
+            the well (i.e. includes the zero-point energy). Otherwise, it is
+            referenced to the ground state. Default is True.
+        log : bool, optional
+            If True, returns the natural logarithm of the partition functions.
+            Default is False.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns float or np.ndarray.
+    Returns
+    -------
+        q : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Vibrational partition functions for each species and temperature.
+    Raises
+    ------
+        ValueError
+            If an included mode is not positive (e.g. imaginary frequencies
+            reported as negative wavenumbers).
+    """
+    vib_temps = wavenumber_to_temp(_pad(wavenumbers), units_in=units_in)
+    mask = _get_mask(values=vib_temps, mask=mask)
+    if not np.all(np.where(mask, vib_temps > 0., True)):
+        err_msg = ('Included vibrational modes must have positive '
+                   'wavenumbers. Mask or remove non-positive modes.')
+        raise ValueError(err_msg)
+    T_mag, axis = _get_temps(T=T, T_units=T_units)
+    reduced_temps = _expand(vib_temps, T_mag)/T_mag
+    # Excluded modes may be 0 or NaN
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_q = -np.log1p(-np.exp(-reduced_temps))
+        if include_zpe:
+            log_q -= reduced_temps/2.
+    log_q = np.where(_expand(mask, T_mag), log_q, 0.).sum(axis=axis)
+    return _return_log(log_q=log_q, log=log, return_quantity=return_quantity)
+
+def q_rot(inertia, symmetry, T, units_in='kg m2', T_units='K', mask=None,
+          log=False, return_quantity=False):
+    """Calculates rigid rotor partition functions
+
+    Parameters
+    ----------
+        inertia : (..., 3) array-like or :class:`~vunits.quantity.Quantity` obj
+            Principal moments of inertia of each species. Linear species have
+            one moment; the others can be omitted (list of lists of different
+            lengths) or set to 0 or NaN.
+        symmetry : int, str or (...) array-like
+            Symmetry numbers or point groups (see
+            :data:`~vunits.db.symmetry_dict`) of each species.
+        T : float, (N,) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures.
+        units_in : str, optional
+            Units of ``inertia`` if it is not a
+            :class:`~vunits.quantity.Quantity`. Default is 'kg m2'.
+        T_units : str, optional
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`.
+            Default is 'K'.
+        mask : (..., 3) np.ndarray of bool, optional
+            True for moments to include. If not specified, moments that are 0
+            or NaN are excluded.
+        log : bool, optional
+            If True, returns the natural logarithm of the partition functions.
+            Default is False.
+        return_quantity : bool, optional
+            If True, returns :class:`~vunits.quantity.Quantity`. Otherwise,
+            returns float or np.ndarray.
+    Returns
+    -------
+        q : (..., N) np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Rotational partition functions for each species and temperature.
+    Raises
+    ------
+        ValueError
+            If a species does not have 1 (linear) or 3 (nonlinear) moments of
+            inertia.
+    """
+    with np.errstate(divide='ignore'):
+        rot_temps = inertia_to_temp(_pad(inertia), units_in=units_in)
+    if mask is None:
+        # Moments that are 0 or NaN have infinite or NaN temperatures
+        mask = np.isfinite(rot_temps)
+    else:
+        mask = np.asarray(mask, dtype=bool)
+    n_moments = mask.sum(axis=-1)
+    if not np.all((n_moments == 1) | (n_moments == 3)):
+        err_msg = ('Species must have 1 (linear) or 3 (nonlinear) moments of '
+                   'inertia, not {}.'.format(n_moments))
+        raise ValueError(err_msg)
+    linear = n_moments == 1
+    log_sym = np.log(_get_symmetry(symmetry))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_rot_temps = np.where(mask, np.log(rot_temps), 0.).sum(axis=-1)
+    # Linear: T/(sigma theta). Nonlinear: sqrt(pi T^3/(theta_A theta_B
+    # theta_C))/sigma
+    log_const = np.where(linear, -log_rot_temps,
+                         0.5*np.log(np.pi) - 0.5*log_rot_temps) - log_sym
+    power = np.where(linear, 1., 1.5)
+
+    T_mag, _ = _get_temps(T=T, T_units=T_units)
+    log_q = _expand(log_const, T_mag) + _expand(power, T_mag)*np.log(T_mag)
+    return _return_log(log_q=log_q, log=log, return_quantity=return_quantity)
+
+def _pad(values):
+    """Helper method to convert ragged lists to arrays padded with NaN
+
+    Parameters
+    ----------
+        values : array-like, list of lists or :class:`~vunits.quantity.Quantity` obj
+            Values
+    Returns
+    -------
+        values_out : np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Values as an array. Quantities are returned as is.
+    """
+    if isinstance(values, Quantity):
+        return values
+    try:
+        return np.asarray(values, dtype=float)
+    except ValueError:
+        # Lists of different lengths
+        n_max = max([len(row) for row in values])
+        values_out = np.full((len(values), n_max), np.nan)
+        for i, row in enumerate(values):
+            values_out[i, :len(row)] = row
+        return values_out
+
+def _get_mask(values, mask):
+    """Helper method to find the values to include
+
+    Parameters
+    ----------
+        values : np.ndarray
+            Values padded with 0 or NaN
+        mask : np.ndarray of bool or None
+            True for values to include. If None, values that are 0 or NaN are
+            excluded.
+    Returns
+    -------
+        mask : np.ndarray of bool
+            True for values to include
+    """
+    if mask is None:
+        return ~np.isnan(values) & (values != 0.)
+    return np.asarray(mask, dtype=bool)
+
+def _get_temps(T, T_units):
+    """Helper method to get temperatures in K
+
+    Parameters
+    ----------
+        T : float, np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Temperatures
+        T_units : str
+            Units of ``T`` if it is not a :class:`~vunits.quantity.Quantity`
+    Returns
+    -------
+        T_mag : float or np.ndarray
+            Temperatures in K
+        axis : int
+            Axis of the modes after the temperatures are broadcasted
+    """
+    if isinstance(T, Quantity):
+        T_mag = np.asarray(T('K'))
+    else:
+        T_mag = np.asarray(Quantity.from_units(mag=T, units=T_units)('K'))
+    return T_mag, -(T_mag.ndim + 1)
+
+def _expand(values, T_mag):
+    """Helper method to add axes to ``values`` so they are broadcasted with
+    the temperatures
+
+    Parameters
+    ----------
+        values : np.ndarray
+            Values whose last axes are not temperatures
+        T_mag : np.ndarray
+            Temperatures
+    Returns
+    -------
+        values_out : np.ndarray
+            ``values`` with ``T_mag.ndim`` trailing axes of length 1
+    """
+    values = np.asarray(values)
+    return values.reshape(values.shape + (1,)*T_mag.ndim)
+
+def _get_symmetry(symmetry):
+    """Helper method to get symmetry numbers
+
+    Parameters
+    ----------
+        symmetry : int, str or array-like
+            Symmetry numbers or point groups
+    Returns
+    -------
+        symmetry_out : np.ndarray
+            Symmetry numbers
+    """
+    symmetry = np.asarray(symmetry)
+    if symmetry.dtype.kind in 'US':
+        return np.vectorize(symmetry_dict.__getitem__, otypes=[float])(symmetry)
+    return symmetry.astype(float)
+
+def _return_log(log_q, log, return_quantity):
+    """Helper method to return partition functions
+
+    Parameters
+    ----------
+        log_q : np.ndarray
+            Natural logarithm of the partition functions
+        log : bool
+            If True, returns ``log_q``. Otherwise, returns the partition
+            functions.
+        return_quantity : bool
+            If True, returns a :class:`~vunits.quantity.Quantity`.
+    Returns
+    -------
+        q : np.ndarray or :class:`~vunits.quantity.Quantity` obj
+            Partition functions or their logarithm
+    """
+    mag = log_q if log else np.exp(log_q)
+    if np.ndim(mag) == 0:
+        mag = float(mag)
+    return _return_quantity(quantity=Quantity(mag=mag),
+                            return_quantity=return_quantity)
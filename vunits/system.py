@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+vunits.system
+
+Unit systems used to express SI magnitudes in a preferred set of units.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_base_dims = (('length', 'm'), ('mass', 'kg'), ('time', 's'),
+              ('current', 'A'), ('temperature', 'K'), ('amount', 'mol'),
+              ('intensity', 'cd'))
+"""tuple: Pairs of dimension names and the corresponding SI base unit. The
+SI base units match the keys of :attr:`~vunits.quantity.Quantity.units`."""
+
+_energy_units = {'m': 2., 'kg': 1., 's': -2., 'A': 0., 'K': 0., 'cd': 0.}
+"""dict: Powers an energy unit must have. The power of 'mol' is free so molar
+energies (e.g. 'kcal/mol') are accepted."""
+
+_unit_systems = {}
+"""dict: Cache of :class:`~vunits.system.UnitSystem` objects. Keys are the
+tuples returned by :attr:`~vunits.system.UnitSystem.key`."""
+
+_active_system = ContextVar('vunits_unit_system', default=None)
+"""contextvars.ContextVar: Unit system used by
+:class:`~vunits.quantity.Quantity` objects when no units are requested. Set
+using :func:`~vunits.system.unit_system`."""
+
+
+class UnitSystem:
+    """Set of preferred units used to express quantities
+
+    A :class:`~vunits.quantity.Quantity` is expressed in the unit system by
+    substituting each SI base unit with the preferred unit of that dimension.
+    If ``energy`` is specified, the mass dimension is expressed using the
+    energy unit (e.g. J/K becomes kcal/mol mol/K = kcal/K) and the remaining
+    dimensions use the base units.
+
+    Conversion factors are computed once per dimension and cached so repeated
+    conversions do not parse unit strings.
+
+    Attributes
+    ----------
+        length : str, optional
+            Length unit. Default is 'm'.
+        mass : str, optional
+            Mass unit. Default is 'kg'.
+        time : str, optional
+            Time unit. Default is 's'.
+        current : str, optional
+            Electric current unit. Default is 'A'.
+        temperature : str, optional
+            Temperature unit. Only absolute temperature units ('K' and 'R') are
+            supported. Default is 'K'.
+        amount : str, optional
+            Amount unit. Default is 'mol'.
+        intensity : str, optional
+            Luminous intensity unit. Default is 'cd'.
+        energy : str, optional
+            Energy unit. May be molar (e.g. 'kcal/mol'). If not specified,
+            energies are expressed using the base units.
+    """
+
+    def __init__(self, length='m', mass='kg', time='s', current='A',
+                 temperature='K', amount='mol', intensity='cd', energy=None):
+        from vunits.quantity import Quantity
+        from vunits.parse import _split_units
+
+        if temperature not in ('K', 'R'):
+            err_msg = ('Unit system only supports absolute temperature units '
+                       '("K" or "R"), not "{}".'.format(temperature))
+            raise ValueError(err_msg)
+
+        self._base_units = {}
+        self._base_factors = {}
+        base_units = (length, mass, time, current, temperature, amount,
+                      intensity)
+        for (dim, si_unit), unit in zip(_base_dims, base_units):
+            unit_qty = Quantity.from_units(units=unit)
+            expected_units = {key: 0. for key in unit_qty.units}
+            expected_units[si_unit] = 1.
+            if unit_qty.units != expected_units:
+                err_msg = ('Unit "{}" does not have dimensions of {}.'
+                           ''.format(unit, dim))
+                raise ValueError(err_msg)
+            self._base_units[si_unit] = unit
+            self._base_factors[si_unit] = unit_qty.mag
+
+        if energy is None:
+            self._energy_units = None
+            self._energy_factor = None
+            self._energy_tokens = None
+        else:
+            energy_qty = Quantity.from_units(units=energy)
+            for key, power in _energy_units.items():
+                if energy_qty.units[key] != power:
+                    err_msg = ('Unit "{}" does not have dimensions of energy.'
+                               ''.format(energy))
+                    raise ValueError(err_msg)
+            self._energy_units = energy_qty.units
+            self._energy_factor = energy_qty.mag
+            self._energy_tokens = _split_units(energy)
+        self._key = base_units + (energy,)
+        self._cache = {}
+
+    @property
+    def key(self):
+        """tuple: Units of the system. Used to compare and cache systems."""
+        return self._key
+
+    def __eq__(self, other):
+        try:
+            return self.key == other.key
+        except AttributeError:
+            return False
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        dims = [dim for dim, _ in _base_dims] + ['energy']
+        args = ', '.join('{}={!r}'.format(dim, unit)
+                         for dim, unit in zip(dims, self.key))
+        return 'UnitSystem({})'.format(args)
+
+    def factor(self, units):
+        """Conversion factor from SI to the unit system
+
+        Parameters
+        ----------
+            units : dict
+                Powers of SI units. Keys should be 'm', 'kg', 's', 'A', 'K',
+                'mol', 'cd'.
+        Returns
+        -------
+            factor : float
+                Magnitude of one system unit in SI units. Divide a SI magnitude
+                by ``factor`` to express it in the unit system.
+        """
+        return self._resolve(units)[0]
+
+    def units_str(self, units):
+        """Units of the system corresponding to ``units``
+
+        Parameters
+        ----------
+            units : dict
+                Powers of SI units. Keys should be 'm', 'kg', 's', 'A', 'K',
+                'mol', 'cd'.
+        Returns
+        -------
+            units_str : str
+                Units in the system. The string can be parsed by
+                :meth:`~vunits.quantity.Quantity.from_units`.
+        """
+        return self._resolve(units)[1]
+
+    def _resolve(self, units):
+        """Helper method to calculate the factor and units string of
+        ``units``. Results are cached by dimension.
+
+        Parameters
+        ----------
+            units : dict
+                Powers of SI units.
+        Returns
+        -------
+            factor : float
+                Magnitude of one system unit in SI units.
+            units_str : str
+                Units in the system.
+        """
+        units_key = tuple(units[si_unit] for _, si_unit in _base_dims)
+        try:
+            return self._cache[units_key]
+        except KeyError:
+            pass
+
+        remaining = dict(units)
+        factor = 1.
+        tokens = []
+        # Express mass dimension using energy
+        if self._energy_units is not None and remaining['kg'] != 0.:
+            n = remaining['kg']
+            factor *= self._energy_factor**n
+            tokens.extend([(unit, power*n)
+                           for unit, power in self._energy_tokens])
+            for key, power in self._energy_units.items():
+                remaining[key] -= power*n
+        # Use base units for remaining dimensions
+        for _, si_unit in _base_dims:
+            power = remaining[si_unit]
+            if power == 0.:
+                continue
+            factor *= self._base_factors[si_unit]**power
+            tokens.append((self._base_units[si_unit], power))
+
+        out = (factor, _join_units(tokens))
+        self._cache[units_key] = out
+        return out
+
+
+def get_unit_system(**kwargs):
+    """Returns a cached :class:`~vunits.system.UnitSystem`
+
+    Parameters
+    ----------
+        kwargs : keyword arguments
+            Units of the system. See :class:`~vunits.system.UnitSystem` for
+            supported keywords.
+    Returns
+    -------
+        unit_system : :class:`~vunits.system.UnitSystem`
+            Unit system. The same object is returned for the same units so its
+            conversion factors are only calculated once.
+    """
+    key_args = [kwargs.get(dim, si_unit) for dim, si_unit in _base_dims]
+    key = tuple(key_args) + (kwargs.get('energy', None),)
+    try:
+        return _unit_systems[key]
+    except KeyError:
+        pass
+    system = UnitSystem(**kwargs)
+    _unit_systems[system.key] = system
+    return system
+
+@contextmanager
+def unit_system(system=None, **kwargs):
+    """Context manager to express quantities in a unit system
+
+    Inside the context, calling a :class:`~vunits.quantity.Quantity` without
+    units returns the magnitude in the unit system and ``str`` shows the
+    magnitude and units of the system. Conversion factors are cached by
+    dimension so unit strings are not parsed repeatedly. The active system is
+    stored in a context variable so it is local to each thread and asynchronous
+    task.
+
+    Parameters
+    ----------
+        system : :class:`~vunits.system.UnitSystem`, optional
+            Unit system to use. If not specified, created using ``kwargs``.
+        kwargs : keyword arguments
+            Units of the system (e.g. ``energy='kcal/mol'``,
+            ``length='Ang'``). See :class:`~vunits.system.UnitSystem` for
+            supported keywords.
+    Yields
+    ------
+        system : :class:`~vunits.system.UnitSystem`
+            Active unit system.
+    """
+    if system is None:
+        system = get_unit_system(**kwargs)
+    token = _active_system.set(system)
+    try:
+        yield system
+    finally:
+        _active_system.reset(token)
+
+def get_active_system():
+    """Returns the active unit system
+
+    Returns
+    -------
+        system : :class:`~vunits.system.UnitSystem` or None
+            Unit system set by :func:`~vunits.system.unit_system`. If no unit
+            system is active, returns None.
+    """
+    return _active_system.get()
+
+def _join_units(tokens):
+    """Helper method to combine units and powers into a string
+
+    Parameters
+    ----------
+        tokens : list of tuple
+            Each element is a tuple whose first element is the unit (str) and
+            the second element is the power (float). Repeated units are
+            combined.
+    Returns
+    -------
+        units_str : str
+            Units separated by spaces with powers denoted using '^'.
+    """
+    powers = {}
+    for unit, power in tokens:
+        if unit == '':
+            continue
+        powers[unit] = powers.get(unit, 0.) + power
+
+    str_out = []
+    for unit, power in powers.items():
+        if power == 0.:
+            continue
+        if power == 1.:
+            str_out.append(unit)
+        elif power == int(power):
+            str_out.append('{}^{}'.format(unit, int(power)))
+        else:
+            str_out.append('{}^{}'.format(unit, power))
+    return ' '.join(str_out)
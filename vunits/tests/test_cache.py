@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from vunits import memoize
+from vunits.quantity import Quantity
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.n_calls = 0
+
+        @memoize(maxsize=2)
+        def get_energy(T, factor=1.):
+            self.n_calls += 1
+            return T*factor
+        self.get_energy = get_energy
+
+    def test_memoize(self):
+        T1 = Quantity(mag=300., K=1.)
+        T2 = Quantity(mag=400., K=1.)
+        self.assertEqual(self.get_energy(T1), T1)
+        self.assertEqual(self.get_energy(Quantity(mag=300., K=1.)), T1)
+        self.assertEqual(self.n_calls, 1)
+        # Different magnitudes, units and keyword arguments are not cached
+        self.get_energy(T2)
+        self.get_energy(Quantity(mag=300., m=1.))
+        self.get_energy(T1, factor=2.)
+        self.assertEqual(self.n_calls, 4)
+
+    def test_arrays(self):
+        Ts = Quantity(mag=np.array([300., 400.]), K=1.)
+        self.get_energy(Ts)
+        self.get_energy(Quantity(mag=np.array([300., 400.]), K=1.))
+        self.assertEqual(self.n_calls, 1)
+        self.get_energy(np.array([300., 400.]))
+        self.assertEqual(self.n_calls, 2)
+
+    def test_cache_info(self):
+        T1 = Quantity(mag=300., K=1.)
+        self.get_energy(T1)
+        self.get_energy(T1)
+        self.get_energy(T1)
+        info = self.get_energy.cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.maxsize, 2)
+        self.assertEqual(info.currsize, 1)
+        self.assertAlmostEqual(info.hit_rate, 2./3.)
+        self.get_energy.cache_clear()
+        self.assertEqual(self.get_energy.cache_info().currsize, 0)
+        self.assertEqual(self.get_energy.cache_info().hit_rate, 0.)
+
+    def test_eviction(self):
+        T1 = Quantity(mag=300., K=1.)
+        self.get_energy(T1)
+        self.get_energy(Quantity(mag=400., K=1.))
+        self.get_energy(T1)
+        # Evicts the least recently used result (400 K)
+        self.get_energy(Quantity(mag=500., K=1.))
+        self.assertEqual(self.get_energy.cache_info().currsize, 2)
+        self.get_energy(T1)
+        self.assertEqual(self.n_calls, 3)
+        self.get_energy(Quantity(mag=400., K=1.))
+        self.assertEqual(self.n_calls, 4)
+
+    def test_no_parentheses(self):
+        @memoize
+        def square(x):
+            return x**2
+        self.assertEqual(square(Quantity(mag=2., m=1.)),
+                         Quantity(mag=4., m=2.))
+        self.assertEqual(square.cache_info().maxsize, 128)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import unittest
+import tempfile
+
+import numpy as np
+
+import vunits
+from vunits import io
+from vunits.quantity import Quantity
+from vunits.quantity.chunked import ChunkedQuantity
+
+class TestChunkedQuantity(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mag = np.arange(10.).reshape(5, 2)
+        path = os.path.join(self.tmp_dir.name, 'lengths.npy')
+        np.save(path, self.mag)
+        self.lengths = ChunkedQuantity(mag=np.load(path, mmap_mode='r'),
+                                       units='cm', chunk_size=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_init(self):
+        self.assertEqual(self.lengths.n_chunks, 3)
+        self.assertEqual(self.lengths.shape, (5, 2))
+        self.assertEqual(len(self.lengths), 5)
+        self.assertEqual(self.lengths.units, Quantity(m=1.).units)
+        np.testing.assert_allclose(self.lengths(), self.mag/100.)
+        np.testing.assert_allclose(self.lengths('cm'), self.mag)
+        chunks = list(self.lengths.chunks())
+        self.assertEqual(len(chunks), 3)
+        np.testing.assert_allclose(chunks[-1].mag, self.mag[4:]/100.)
+
+    def test_from_files(self):
+        paths = []
+        for i, start in enumerate(range(0, 5, 2)):
+            paths.append(os.path.join(self.tmp_dir.name, '{}.npy'.format(i)))
+            io.save(paths[-1], Quantity(mag=self.mag[start:start+2], s=1.))
+        times = ChunkedQuantity.from_files(paths)
+        self.assertEqual(times.n_chunks, 3)
+        np.testing.assert_allclose(times('ms'), self.mag*1000.)
+        # Files with different units
+        io.save(paths[-1], Quantity(mag=self.mag[4:], m=1.))
+        with self.assertRaises(TypeError):
+            ChunkedQuantity.from_files(paths)
+        # Numpy files
+        np.save(paths[-1], self.mag[4:])
+        with self.assertRaises(TypeError):
+            ChunkedQuantity.from_files(paths)
+        times = ChunkedQuantity.from_files(paths, units='s')
+        np.testing.assert_allclose(times(), self.mag)
+
+    def test_arithmetic(self):
+        areas = self.lengths*self.lengths + Quantity(mag=1., m=2.)
+        self.assertIsInstance(areas, ChunkedQuantity)
+        self.assertEqual(areas.units, Quantity(m=2.).units)
+        np.testing.assert_allclose(areas(), (self.mag/100.)**2 + 1.)
+        np.testing.assert_allclose((self.lengths**2)('cm2'), self.mag**2)
+        np.testing.assert_allclose((2.*self.lengths)('cm'), 2.*self.mag)
+        np.testing.assert_allclose((-self.lengths)('cm'), -self.mag)
+        ratios = (self.lengths - Quantity(mag=1., m=1.))/self.lengths
+        self.assertEqual(ratios.units, Quantity().units)
+        with np.errstate(divide='ignore'):
+            np.testing.assert_allclose(ratios(), 1. - 100./self.mag)
+        with self.assertRaises(TypeError):
+            self.lengths + 1.
+        with self.assertRaises(ValueError):
+            self.lengths + ChunkedQuantity(mag=self.mag, units='m')
+
+    def test_reductions(self):
+        self.assertAlmostEqual(self.lengths.sum(), Quantity(mag=0.45, m=1.))
+        self.assertAlmostEqual(self.lengths.mean(), Quantity(mag=0.045, m=1.))
+        self.assertEqual(self.lengths.min(), Quantity(mag=0., m=1.))
+        self.assertEqual(self.lengths.max(), Quantity(mag=0.09, m=1.))
+        np.testing.assert_allclose(self.lengths.sum(axis=0).mag,
+                                   self.mag.sum(axis=0)/100.)
+        np.testing.assert_allclose(self.lengths.mean(axis=0).mag,
+                                   self.mag.mean(axis=0)/100.)
+        np.testing.assert_allclose(self.lengths.max(axis=0).mag,
+                                   self.mag.max(axis=0)/100.)
+        with self.assertRaises(ValueError):
+            self.lengths.sum(axis=1)
+
+    def test_call(self):
+        path = os.path.join(self.tmp_dir.name, 'out.npy')
+        out = np.lib.format.open_memmap(path, mode='w+', shape=(5, 2))
+        self.lengths('mm', out=out)
+        np.testing.assert_allclose(np.load(path), self.mag*10.)
+        temps = ChunkedQuantity(mag=self.mag, units='oC', chunk_size=2)
+        np.testing.assert_allclose(temps(), self.mag + 273.15)
+        np.testing.assert_allclose(temps('oC'), self.mag)
+        with self.assertRaises(ValueError):
+            self.lengths('s')
+        with self.assertRaises(ValueError):
+            self.lengths(out=np.empty(3))
+
+    def test_to_quantity(self):
+        lengths = self.lengths.to_quantity()
+        np.testing.assert_allclose(lengths.mag, self.mag/100.)
+        self.assertEqual(lengths.units, self.lengths.units)
+        # The SI magnitude is used regardless of the active unit system
+        with vunits.unit_system(length='cm'):
+            np.testing.assert_allclose(self.lengths.to_quantity().mag,
+                                       self.mag/100.)
+            np.testing.assert_allclose(self.lengths.si(), self.mag/100.)
+            np.testing.assert_allclose(self.lengths(), self.mag)
+
+    def test_n_workers(self):
+        self.lengths.n_workers = 2
+        np.testing.assert_allclose((self.lengths*3.)('cm'), self.mag*3.)
+        self.assertAlmostEqual(self.lengths.sum(), Quantity(mag=0.45, m=1.))
+
+if __name__ == '__main__':
+    unittest.main()
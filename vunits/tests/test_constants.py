@@ -5,6 +5,8 @@ Tests for vunits.constants file
 """
 
 import os
+import sys
+import subprocess
 import unittest
 
 import numpy as np
@@ -222,5 +224,47 @@ class TestConstants(unittest.TestCase):
         with self.assertRaises(ValueError):
             c.r_bohr('arbitrary unit')
 
+    def test_lazy_import(self):
+        # Import constants in a fresh interpreter after its dependencies
+        code = ('import sys\n'
+                'import numpy, vunits.quantity\n'
+                'import vunits.constants\n'
+                'print("vunits.db" in sys.modules, '
+                '"vunits.parse" in sys.modules)\n')
+        root_path = os.path.dirname(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))))
+        out = subprocess.run([sys.executable, '-c', code], cwd=root_path,
+                             stdout=subprocess.PIPE, check=True)
+        db_loaded, parse_loaded = out.stdout.decode().split()
+        # Importing constants should not load the unit database or parser
+        self.assertEqual(db_loaded, 'False')
+        self.assertEqual(parse_loaded, 'False')
+
+        # Constants are created on first access and then stored
+        self.assertIs(c.R, c.R)
+        with self.assertRaises(AttributeError):
+            c.arbitrary_constant
+
+    def test_in_units(self):
+        # Test constants are floats in the requested unit system
+        consts = c.in_units(energy='kcal/mol', length='Ang')
+        self.assertIsInstance(consts.R, float)
+        self.assertAlmostEqual(consts.R, c.R('kcal/mol/K'))
+        self.assertAlmostEqual(consts.kb/c.kb('kcal/K'), 1.)
+        self.assertAlmostEqual(consts.V0/c.V0('Ang3/mol'), 1.)
+        self.assertAlmostEqual(consts.T0, c.T0('K'))
+
+        # Test namespace is cached and immutable
+        self.assertIs(consts, c.in_units(length='Ang', energy='kcal/mol'))
+        with self.assertRaises(AttributeError):
+            consts.R = 1.
+
+        # Test default unit system uses SI values
+        self.assertEqual(c.in_units().h, c.h())
+
+        # Test incompatible units raise an error
+        with self.assertRaises(ValueError):
+            c.in_units(length='s')
+
 if __name__ == '__main__':
     unittest.main()
@@ -75,6 +75,42 @@ class TestConvert(unittest.TestCase):
         with self.assertRaises(ValueError):
             c.convert_unit(initial='cm', final='arbitrary unit')
 
+    def test_convert_unit_dtype(self):
+        num = np.array([1., 2.], dtype=np.float32)
+        self.assertEqual(c.convert_unit(num=num, initial='m',
+                                        final='cm').dtype, np.float32)
+        self.assertEqual(c.convert_unit(num=num, initial='K',
+                                        final='oC').dtype, np.float32)
+        result = c.convert_unit(num=[1., 2.], initial='m', final='cm',
+                                dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, [100., 200.])
+
+    def test_convert_unit_out(self):
+        # Test that the result is written to out
+        num = np.array([1., 2., 3.])
+        out = np.zeros(3)
+        result = c.convert_unit(num=num, initial='m', final='cm', out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, [100., 200., 300.])
+        np.testing.assert_array_equal(num, [1., 2., 3.])
+        # Test converting in place
+        c.convert_unit(num=num, initial='m', final='cm', out=num)
+        np.testing.assert_allclose(num, [100., 200., 300.])
+        # Test temperatures
+        temps = np.array([273.15, 373.15])
+        c.convert_unit(num=temps, initial='K', final='oC', out=temps)
+        np.testing.assert_allclose(temps, [0., 100.], atol=1.e-10)
+
+    def test_convert_temp_out(self):
+        temps = np.array([0., 100.])
+        out = np.zeros(2)
+        result = c.convert_temp(num=temps, initial='oC', final='oF', out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, [32., 212.])
+        c.convert_temp(num=temps, initial='oC', final='K', out=temps)
+        np.testing.assert_allclose(temps, [273.15, 373.15])
+
     def test_energy_to_freq(self):
         E = Quantity.from_units(0.1, 'eV')
         freq = Quantity.from_units(self.ans.at['test_energy_to_freq', 0], 'Hz')
@@ -341,5 +377,58 @@ class TestConvert(unittest.TestCase):
         self.assertAlmostEqual(c.einstein_to_debye(einstein_temp),
                                debye_temp)
 
+    def test_mole_mass_fraction(self):
+        mole_fractions = np.array([[0.5, 0.5], [0.2, 0.8]])
+        molar_masses = np.array([2.016, 31.998])
+        mass_fractions = c.mole_to_mass_fraction(mole_fractions, ['H2', 'O2'])
+        expected = mole_fractions*molar_masses
+        expected /= expected.sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(mass_fractions, expected)
+        np.testing.assert_allclose(
+                c.mole_to_mass_fraction(mole_fractions, molar_masses),
+                expected)
+        np.testing.assert_allclose(
+                c.mass_to_mole_fraction(mass_fractions, ['H2', 'O2']),
+                mole_fractions)
+        mole_qty = c.mass_to_mole_fraction(
+                mass_fractions, Quantity.from_units(molar_masses, 'g/mol'),
+                return_quantity=True)
+        self.assertTrue(mole_qty._is_dimless())
+        with self.assertRaises(TypeError):
+            c.mole_to_mass_fraction(Quantity(mole_fractions, m=1.),
+                                    molar_masses)
+        with self.assertRaises(TypeError):
+            c.mole_to_mass_fraction(mole_fractions,
+                                    Quantity.from_units(molar_masses, 'g'))
+        with self.assertRaises(TypeError):
+            c.mole_to_mass_fraction(mole_fractions, molar_masses,
+                                    molar_mass_units='g')
+
+    def test_mole_fraction_to_conc(self):
+        mole_fractions = np.array([[0.5, 0.5], [0.2, 0.8]])
+        T = Quantity.from_units(np.array([300., 600.]), 'K')
+        P = Quantity.from_units(1., 'bar')
+        conc = c.mole_fraction_to_conc(mole_fractions, T=T, P=P,
+                                       return_quantity=True)
+        self.assertEqual(conc.units, Quantity(mol=1., m=-3.).units)
+        total_conc = 1.e5/8.314462618/np.array([300., 600.])
+        np.testing.assert_allclose(conc.mag,
+                                   mole_fractions*total_conc[:, None],
+                                   rtol=1.e-6)
+        np.testing.assert_allclose(
+                c.mole_fraction_to_conc(mole_fractions, T=300., P=1.,
+                                        P_units='bar', units_out='mol/L'),
+                mole_fractions*total_conc[0]/1000., rtol=1.e-6)
+        np.testing.assert_allclose(c.conc_to_mole_fraction(conc),
+                                   mole_fractions)
+        with self.assertRaises(TypeError):
+            c.mole_fraction_to_conc(mole_fractions, T=T, P=T)
+        # Mass fractions
+        mass_fractions = c.conc_to_mass_fraction(conc, ['H2', 'O2'])
+        np.testing.assert_allclose(
+                c.mass_fraction_to_conc(mass_fractions, ['H2', 'O2'], T=T,
+                                        P=P),
+                conc.mag)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+import unittest
+
+from vunits import db, constants
+from vunits.quantity import Quantity
+from vunits.parse import _parse_cache
+from vunits.system import get_unit_system
+
+class TestRegisterUnit(unittest.TestCase):
+    def setUp(self):
+        self.names = []
+        self.replaced = {}
+
+    def tearDown(self):
+        for name in self.names:
+            db.unit_db.pop(name, None)
+        db.unit_db.update(self.replaced)
+        db._invalidate_units(names=set(self.names) | set(self.replaced))
+
+    def test_register_unit(self):
+        version = db.get_unit_db_version()
+        furlong = Quantity.from_units(mag=201.168, units='m')
+        self.names = db.register_unit('furlong', furlong,
+                                      add_long_prefix=True,
+                                      plural_suffix='s')
+        self.assertIn('kilofurlongs', self.names)
+        self.assertNotIn('kfurlong', self.names)
+        self.assertEqual(db.get_unit_db_version(), version + 1)
+        self.assertEqual(Quantity.from_units(mag=2., units='furlongs/s'),
+                         Quantity(mag=402.336, m=1., s=-1.))
+        self.assertEqual(Quantity.from_units(units='kilofurlong'),
+                         Quantity(mag=201168., m=1.))
+        with self.assertRaises(ValueError):
+            db.register_unit('furlong', furlong)
+
+    def test_overwrite(self):
+        self.replaced = {'yr': db.unit_db['yr']}
+        Quantity.from_units(units='m/yr')
+        Quantity.from_units(units='m/s')
+        system = get_unit_system(time='yr')
+        year = Quantity.from_units(mag=365., units='day')
+        db.register_unit('yr', year, overwrite=True)
+        # Only results using the unit are discarded
+        self.assertNotIn('m/yr', _parse_cache)
+        self.assertIn('m/s', _parse_cache)
+        self.assertEqual(Quantity.from_units(units='yr'), year)
+        self.assertIsNot(get_unit_system(time='yr'), system)
+
+    def test_overwrite_constants(self):
+        # Prefixed units (e.g. kcal) are also replaced
+        self.replaced = {name: unit for name, unit in db.unit_db.items()
+                         if name.endswith('cal')}
+        R_cal = constants.in_units(energy='cal').R
+        consts_J = constants.in_units(energy='J')
+        self.names = db.register_unit('cal',
+                                      Quantity.from_units(mag=2., units='J'),
+                                      overwrite=True)
+        self.assertAlmostEqual(constants.in_units(energy='cal').R,
+                               consts_J.R/2.)
+        self.assertNotAlmostEqual(constants.in_units(energy='cal').R, R_cal)
+        # Systems not using the unit are kept
+        self.assertIs(constants.in_units(energy='J'), consts_J)
+
+if __name__ == '__main__':
+    unittest.main()
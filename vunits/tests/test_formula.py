@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from vunits import formula
+from vunits.db import atomic_weight
+from vunits.quantity import Quantity
+
+class TestFormula(unittest.TestCase):
+    def test_parse_formula(self):
+        self.assertEqual(formula.parse_formula('CH3OH'),
+                         {'C': 1., 'H': 4., 'O': 1.})
+        self.assertEqual(formula.parse_formula('Ca(OH)2'),
+                         {'Ca': 1., 'O': 2., 'H': 2.})
+        self.assertEqual(formula.parse_formula('K4(Fe(CN)6)'),
+                         {'K': 4., 'Fe': 1., 'C': 6., 'N': 6.})
+        self.assertEqual(formula.parse_formula('C0.5H'), {'C': 0.5, 'H': 1.})
+        for invalid in ('', 'Xx2', 'CH3-', 'Ca(OH', 'CaOH)2', 'h2o', '()',
+                        'H()', '(H)0', 'H0', 'H.'):
+            with self.assertRaises(ValueError):
+                formula.parse_formula(invalid)
+
+    def test_atomic_numbers(self):
+        self.assertEqual(formula._atomic_numbers['Fe'], 26)
+        self.assertEqual(formula._atomic_numbers['Uuo'], 118)
+        # Consistent with the weights stored by atomic number
+        for symbol, atomic_number in formula._atomic_numbers.items():
+            self.assertEqual(atomic_weight[symbol],
+                             atomic_weight[atomic_number])
+        self.assertEqual(len(formula._symbols), len(formula._atomic_numbers))
+
+    def test_get_element_matrix(self):
+        element_matrix = formula.get_element_matrix(['H2O', 'CO2'])
+        self.assertEqual(element_matrix.shape, (2, 119))
+        np.testing.assert_array_equal(element_matrix[:, [1, 6, 8]],
+                                      [[2., 0., 1.], [0., 1., 2.]])
+        self.assertEqual(element_matrix.sum(), 6.)
+
+    def test_get_molar_mass(self):
+        self.assertAlmostEqual(formula.get_molar_mass('H2O'), 18.015)
+        np.testing.assert_allclose(
+                formula.get_molar_mass(['H2O', 'CO2'], units_out='kg/mol'),
+                [0.018015, 0.0440096])
+        molar_mass = formula.get_molar_mass('CH4', return_quantity=True)
+        self.assertEqual(molar_mass.units, Quantity(kg=1., mol=-1.).units)
+        self.assertAlmostEqual(molar_mass('g/mol'), 16.0436)
+
+if __name__ == '__main__':
+    unittest.main()
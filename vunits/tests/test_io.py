@@ -0,0 +1,77 @@
+import os
+import pathlib
+import unittest
+import tempfile
+
+import numpy as np
+
+from vunits import io
+from vunits.quantity import Quantity
+
+class TestIO(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'speeds.npy')
+        self.speeds = Quantity(mag=np.arange(12.).reshape(3, 4), m=1., s=-1.)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_load(self):
+        self.speeds.save(self.path)
+        speeds = Quantity.load(self.path)
+        self.assertIsInstance(speeds.mag, np.memmap)
+        self.assertFalse(speeds.mag.flags.writeable)
+        np.testing.assert_array_equal(speeds.mag, self.speeds.mag)
+        self.assertEqual(speeds.units, self.speeds.units)
+        # Load into memory
+        speeds = io.load(self.path, mmap_mode=None)
+        self.assertNotIsInstance(speeds.mag, np.memmap)
+        np.testing.assert_array_equal(speeds.mag, self.speeds.mag)
+        # File can be read by numpy
+        np.testing.assert_array_equal(np.load(self.path), self.speeds.mag)
+
+    def test_scalar(self):
+        io.save(self.path, Quantity(mag=2., kg=1.))
+        mass = io.load(self.path)
+        self.assertEqual(mass, Quantity(mag=2., kg=1.))
+
+    def test_numpy_file(self):
+        np.save(self.path, np.arange(3.))
+        ratios = io.load(self.path)
+        np.testing.assert_array_equal(ratios.mag, [0., 1., 2.])
+        self.assertTrue(ratios._is_dimless())
+
+    def test_archive(self):
+        path = os.path.join(self.tmp_dir.name, 'archive')
+        temps = Quantity(mag=np.array([300., 400.]), K=1.)
+        io.save_archive(path, {'speeds': self.speeds, 'temps': temps})
+        quantities = io.load_archive(path)
+        self.assertEqual(sorted(quantities), ['speeds', 'temps'])
+        np.testing.assert_array_equal(quantities['temps'].mag, temps.mag)
+        self.assertEqual(quantities['temps'].units, temps.units)
+        with self.assertRaises(ValueError):
+            io.save_archive(path, {'../speeds': self.speeds})
+
+    def test_write_table(self):
+        path = os.path.join(self.tmp_dir.name, 'table.csv')
+        temps = Quantity(mag=np.array([300., 400., 500.]), K=1.)
+        io.write_table(path, {'T': temps, 'speeds': self.speeds,
+                              'ratio': Quantity(mag=np.ones(3))},
+                       units={'T': 'oC'}, fmt='%.2f')
+        with open(path) as f_ptr:
+            lines = f_ptr.read().splitlines()
+        self.assertEqual(lines[0], ('T [oC],speeds_0 [m s^-1],'
+                                    'speeds_1 [m s^-1],speeds_2 [m s^-1],'
+                                    'speeds_3 [m s^-1],ratio'))
+        self.assertEqual(lines[1], '26.85,0.00,1.00,2.00,3.00,1.00')
+        # Tab-separated file given as a path object
+        path = pathlib.Path(self.tmp_dir.name, 'table.tsv')
+        io.write_table(path, {'T': temps})
+        data = np.loadtxt(path, delimiter='\t', skiprows=1)
+        np.testing.assert_array_equal(data, temps.mag)
+        with self.assertRaises(ValueError):
+            io.write_table(path, {'T': temps, 'ratio': Quantity(np.ones(4))})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from vunits import kinetics
+from vunits.constants import R, kb
+from vunits.quantity import Quantity
+
+class TestKinetics(unittest.TestCase):
+    def setUp(self):
+        self.Ea = Quantity.from_units(mag=np.array([[10.], [50.]]),
+                                      units='kcal/mol')
+        self.T = np.array([300., 600., 900.])
+
+    def test_boltzmann_factor(self):
+        factor = kinetics.boltzmann_factor(self.Ea, self.T,
+                                           return_quantity=True)
+        self.assertTrue(factor._is_dimless())
+        self.assertEqual(factor.mag.shape, (2, 3))
+        expected = np.exp(-self.Ea.mag/(R.mag*self.T))
+        np.testing.assert_allclose(factor.mag, expected)
+        # Particle energies
+        energy = Quantity.from_units(mag=0.5, units='eV')
+        np.testing.assert_allclose(
+                kinetics.boltzmann_factor(energy, self.T),
+                np.exp(-energy.mag/(kb.mag*self.T)))
+        # Logarithm does not underflow
+        log_factor = kinetics.boltzmann_factor(1.e7, 300., log=True)
+        self.assertAlmostEqual(log_factor, -1.e7/(R.mag*300.))
+        np.testing.assert_allclose(
+                kinetics.boltzmann_factor(10., 26.85, units_in='kcal/mol',
+                                          T_units='oC'),
+                expected[0, 0])
+        with self.assertRaises(TypeError):
+            kinetics.boltzmann_factor(Quantity(mag=1., m=1.), self.T)
+        with self.assertRaises(TypeError):
+            kinetics.boltzmann_factor(self.Ea, Quantity(mag=300., s=1.))
+
+    def test_arrhenius(self):
+        A = Quantity.from_units(mag=1.e13, units='s-1')
+        k = kinetics.arrhenius(A, self.Ea, self.T, n=0.5,
+                               return_quantity=True)
+        self.assertEqual(k.units, A.units)
+        expected = 1.e13*self.T**0.5*np.exp(-self.Ea.mag/(R.mag*self.T))
+        np.testing.assert_allclose(k.mag, expected)
+        np.testing.assert_allclose(
+                kinetics.arrhenius(1.e13, self.Ea, self.T, A_units='min-1',
+                                   units_out='min-1'),
+                np.exp(-self.Ea.mag/(R.mag*self.T))*1.e13)
+        # Large exponents do not overflow
+        k = kinetics.arrhenius(1., 6.e6, 1000., n=120.)
+        self.assertTrue(np.isfinite(k))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+import vunits
+from vunits.quantity import Quantity
+from vunits.quantity.lazy import LazyQuantity, lazy
+
+class TestLazyQuantity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.length = Quantity(mag=rng.random(1000), m=1.)
+        self.rate = Quantity(mag=rng.random(1000), s=-1.)
+        self.vel = Quantity(mag=rng.random(1000), m=1., s=-1.)
+        self.mass = Quantity(mag=rng.random(1000) + 1., kg=1.)
+
+    def test_evaluate(self):
+        expected = (self.length*self.rate + self.vel)/self.mass
+        expr = (self.length.lazy()*self.rate + self.vel)/self.mass
+        self.assertIsInstance(expr, LazyQuantity)
+        for chunk_size in (None, 1, 7, 1000, 5000):
+            result = expr.evaluate(chunk_size=chunk_size)
+            self.assertEqual(result.units, expected.units)
+            np.testing.assert_allclose(result.mag, expected.mag)
+
+    def test_scalars(self):
+        x = lazy(self.length)
+        expr = 2.*x - x*Quantity(mag=3.) + Quantity(mag=0.5, m=1.)
+        np.testing.assert_allclose(expr.evaluate().mag,
+                                   2.*self.length.mag - 3.*self.length.mag
+                                   + 0.5)
+        # Scalars are folded into the scale instead of creating nodes
+        self.assertIs((x*2.*3.)._args, x._args)
+        self.assertEqual((x*2.*3.)._scale, 6.)
+        # Quantity objects defer to the lazy expression
+        np.testing.assert_allclose((self.length - x).evaluate().mag, 0.)
+        np.testing.assert_allclose((1./x).evaluate().mag,
+                                   1./self.length.mag)
+        scalar = (lazy(Quantity(mag=2., m=1.))*3.).evaluate()
+        self.assertEqual(scalar, Quantity(mag=6., m=1.))
+
+    def test_shared_nodes(self):
+        x = self.length.lazy()
+        y = x*self.rate
+        expr = y*y + y*y
+        np.testing.assert_allclose(expr.evaluate(chunk_size=10).mag,
+                                   2.*(self.length.mag*self.rate.mag)**2)
+
+    def test_pow(self):
+        expr = self.length.lazy()**2
+        result = expr.evaluate(chunk_size=100)
+        np.testing.assert_allclose(result.mag, self.length.mag**2)
+        self.assertEqual(result.m, 2.)
+        with self.assertRaises(TypeError):
+            self.length.lazy()**self.length
+
+    def test_call(self):
+        expr = self.length.lazy()*self.rate
+        expected = (self.length*self.rate).mag
+        np.testing.assert_allclose(expr('cm/s'), expected*100.)
+        out = np.empty(1000)
+        self.assertIs(expr('cm/s', out=out), out)
+        with self.assertRaises(ValueError):
+            expr('kg')
+        with vunits.unit_system(length='cm'):
+            np.testing.assert_allclose(expr(), expected*100.)
+        temps = lazy(Quantity(mag=np.array([273.15, 373.15]), K=1.))
+        np.testing.assert_allclose(temps('oC'), [0., 100.], atol=1.e-10)
+
+    def test_units_check(self):
+        with self.assertRaises(TypeError):
+            self.length.lazy() + self.mass
+        with vunits.unchecked():
+            self.length.lazy() + self.mass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@ import os
 import unittest
 
 from vunits.quantity import Quantity
-from vunits.parse import _parse_unit
+from vunits import parse
+from vunits.parse import _parse_unit, _parse_factor, _parse_cache
 
 class TestParse(unittest.TestCase):
     def test_parse_unit(self):
@@ -25,6 +26,21 @@ class TestParse(unittest.TestCase):
         self.assertEqual(_parse_unit(mag=1., units='centimeter second^-1'),
                          Quantity(mag=0.01, m=1., s=-1))
 
+    def test_parse_cache(self):
+        maxsize = parse._parse_cache_maxsize
+        parse._parse_cache_maxsize = 3
+        try:
+            for units in ('m', 'm2', 'm3', 'm4'):
+                _parse_factor(units)
+            self.assertLessEqual(len(_parse_cache), 3)
+            self.assertNotIn('m', _parse_cache)
+            # Hits are moved to the end so they are discarded last
+            _parse_factor('m2')
+            _parse_factor('m5')
+            self.assertIn('m2', _parse_cache)
+            self.assertNotIn('m3', _parse_cache)
+        finally:
+            parse._parse_cache_maxsize = maxsize
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
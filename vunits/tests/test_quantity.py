@@ -1,10 +1,18 @@
 import os
+import json
+import copy
+import array
+import pickle
 import unittest
 import math
 
 import numpy as np
 
-from vunits.quantity import Quantity, _force_get_quantity, _return_quantity
+import vunits
+from vunits import quantity
+from vunits.quantity import (Quantity, FrozenQuantity, UnitQuantity,
+                             _force_get_quantity, _return_quantity,
+                             _get_units_str)
 
 class TestQuantityModule(unittest.TestCase):
     def test_force_get_quantity(self):
@@ -18,6 +26,59 @@ class TestQuantityModule(unittest.TestCase):
         self.assertEqual(_return_quantity(vel1, False, 'm/s'), vel1.mag)
         self.assertEqual(_return_quantity(vel1, False, 'cm/s'), vel1.mag*100.)
 
+    def test_unchecked(self):
+        vel1 = Quantity(mag=10., m=1., s=-1.)
+        mass1 = Quantity(mag=2., kg=1.)
+        with vunits.unchecked():
+            # Incompatible operations do not raise errors
+            self.assertEqual((vel1 + mass1).mag, 12.)
+            self.assertEqual((vel1 - 1.).mag, 9.)
+            self.assertTrue(vel1 > mass1)
+            # Units still propagate for multiplication
+            self.assertEqual(vel1*mass1, Quantity(mag=20., m=1., kg=1., s=-1.))
+            # Units reused without copying
+            self.assertIs((vel1 + vel1).units, vel1.units)
+        # Checks restored after leaving context
+        self.assertEqual(quantity._check_fraction, 1.)
+        with self.assertRaises(TypeError):
+            vel1 + mass1
+
+        # Errors are still raised if all operations are sampled
+        with vunits.unchecked(check_fraction=1.):
+            with self.assertRaises(TypeError):
+                vel1 + mass1
+
+        # Invalid fractions raise an error
+        with self.assertRaises(ValueError):
+            with vunits.unchecked(check_fraction=2.):
+                pass
+
+    def test_set_check_fraction(self):
+        vel1 = Quantity(mag=10., m=1., s=-1.)
+        mass1 = Quantity(mag=2., kg=1.)
+        try:
+            vunits.set_check_fraction(0.5)
+            n_errors = 0
+            for _ in range(200):
+                try:
+                    vel1 + mass1
+                except TypeError:
+                    n_errors += 1
+            # Some, but not all, operations are checked
+            self.assertGreater(n_errors, 0)
+            self.assertLess(n_errors, 200)
+        finally:
+            vunits.set_check_fraction(1.)
+
+    def test_units_setter_copy(self):
+        vel1 = Quantity(mag=10., m=1., s=-1.)
+        with vunits.unchecked():
+            vel2 = +vel1
+        # Setting a unit does not change quantities sharing the units
+        vel2.m = 2.
+        self.assertEqual(vel1.m, 1.)
+        self.assertEqual(vel2.m, 2.)
+
 class TestQuantityClass(unittest.TestCase):
     def setUp(self):
         self.mag1 = 12.3456
@@ -26,6 +87,36 @@ class TestQuantityClass(unittest.TestCase):
         self.vel2 = Quantity(mag=self.mag2, m=1., s=-1.)
         self.accel1 = Quantity(mag=10., m=1., s=-2)
 
+    def test_units_str(self):
+        self.assertEqual(self.vel1.units_str, 'm s^-1')
+        self.assertEqual(Quantity(mag=1., m=0.5).units_str, 'm^0.5')
+        self.assertEqual(Quantity().units_str, '')
+        # Units changed after the string was cached
+        vel = Quantity(mag=1., m=1., s=-1.)
+        self.assertEqual(vel.units_str, 'm s^-1')
+        vel.s = -2.
+        self.assertEqual(vel.units_str, 'm s^-2')
+        # Cache is bounded
+        for power in np.linspace(0.1, 0.9, 2000):
+            Quantity(m=power).units_str
+        cache_info = _get_units_str.cache_info()
+        self.assertLessEqual(cache_info.currsize, cache_info.maxsize)
+
+    def test_to_compact(self):
+        pressure = Quantity.from_units(mag=101325., units='Pa')
+        mag, units = pressure.to_compact()
+        self.assertAlmostEqual(mag, 101.325)
+        self.assertEqual(units, 'kPa')
+        self.assertEqual(Quantity(mag=0.3, m=1.).best_units(), 'mm')
+        # No named units
+        self.assertEqual(self.vel1.to_compact(), (self.mag1, 'm s^-1'))
+        # Arrays
+        energies = Quantity(mag=np.array([1.e-20, 0., 3.e5]), kg=1., m=2.,
+                            s=-2.)
+        mag, units = energies.to_compact()
+        np.testing.assert_allclose(mag, [10., 0., 300.])
+        np.testing.assert_array_equal(units, ['zJ', 'J', 'kJ'])
+
     def test_neg(self):
         self.assertEqual(-self.vel1, Quantity(mag=-self.mag1, m=1., s=-1.))
 
@@ -93,6 +184,82 @@ class TestQuantityClass(unittest.TestCase):
         vel4 *= 2.
         self.assertEqual(vel4, Quantity(mag=mag4*2., m=1., s=-1.))
 
+    def test_getitem(self):
+        speeds = Quantity(mag=np.array([1., 2., 3., 4.]), m=1., s=-1.)
+        # Scalar indexing
+        self.assertEqual(speeds[1], Quantity(mag=2., m=1., s=-1.))
+        # Slices are views sharing the units
+        speeds_slice = speeds[1:3]
+        self.assertTrue(np.shares_memory(speeds_slice.mag, speeds.mag))
+        self.assertIs(speeds_slice.units, speeds.units)
+        np.testing.assert_array_equal(speeds_slice.mag, [2., 3.])
+        # Fancy and boolean indexing
+        np.testing.assert_array_equal(speeds[[0, 3]].mag, [1., 4.])
+        np.testing.assert_array_equal(speeds[speeds.mag > 2.].mag, [3., 4.])
+        # Setting units of a view does not change the parent
+        speeds_slice.m = 2.
+        self.assertEqual(speeds.m, 1.)
+
+    def test_setitem(self):
+        speeds = Quantity(mag=np.array([1., 2., 3.]), m=1., s=-1.)
+        speeds[0] = Quantity.from_units(mag=100., units='cm/s')
+        speeds[1:] = Quantity(mag=np.array([5., 6.]), m=1., s=-1.)
+        np.testing.assert_allclose(speeds.mag, [1., 5., 6.])
+        with self.assertRaises(TypeError):
+            speeds[0] = 1.
+        with self.assertRaises(TypeError):
+            speeds[0] = Quantity(mag=1., kg=1.)
+        ratios = Quantity(mag=np.array([0.1, 0.2]))
+        ratios[0] = 0.5
+        np.testing.assert_array_equal(ratios.mag, [0.5, 0.2])
+
+    def test_len(self):
+        speeds = Quantity(mag=np.array([1., 2., 3.]), m=1., s=-1.)
+        self.assertEqual(len(speeds), 3)
+        with self.assertRaises(TypeError):
+            len(self.vel1)
+
+    def test_iter(self):
+        speeds = Quantity(mag=np.array([1., 2., 3.]), m=1., s=-1.)
+        speeds_list = list(speeds)
+        self.assertEqual(len(speeds_list), 3)
+        self.assertEqual(speeds_list[2], Quantity(mag=3., m=1., s=-1.))
+        with self.assertRaises(TypeError):
+            iter(self.vel1)
+
+    def test_bool(self):
+        self.assertTrue(self.vel1)
+        self.assertTrue(Quantity(mag=0., m=1.))
+        self.assertTrue(Quantity(mag=np.array([]), m=1.))
+        self.assertTrue(Quantity(mag=np.array([0., 1.]), m=1.))
+
+    def test_stack(self):
+        speeds = [Quantity(mag=1., m=1., s=-1.),
+                  Quantity.from_units(mag=200., units='cm/s')]
+        speeds_qty = Quantity.stack(speeds)
+        self.assertEqual(speeds_qty.units, self.vel1.units)
+        np.testing.assert_array_almost_equal(speeds_qty.mag, [1., 2.])
+        # Generators and dimensionless numbers are supported
+        ratios = Quantity.from_sequence(x for x in (Quantity(0.5), 1))
+        np.testing.assert_array_equal(ratios.mag, [0.5, 1.])
+        self.assertTrue(ratios._is_dimless())
+        self.assertEqual(len(Quantity.stack([])), 0)
+        with self.assertRaises(TypeError):
+            Quantity.stack(speeds + [Quantity(mag=1., m=1.)])
+
+    def test_group_by_dimension(self):
+        quantities = [Quantity(mag=1., m=1., s=-1.), Quantity(mag=2., K=1.),
+                      Quantity(mag=3., m=1., s=-1.), 4.]
+        groups, indices = Quantity.group_by_dimension(quantities,
+                                                      return_indices=True)
+        speed_key = (1., 0., -1., 0., 0., 0., 0.)
+        self.assertEqual(list(groups), [speed_key,
+                                        (0., 0., 0., 0., 1., 0., 0.),
+                                        (0., 0., 0., 0., 0., 0., 0.)])
+        np.testing.assert_array_equal(groups[speed_key].mag, [1., 3.])
+        np.testing.assert_array_equal(indices[speed_key], [0, 2])
+        self.assertEqual(groups[speed_key].units, self.vel1.units)
+
     def test_int(self):
         self.assertEqual(int(self.vel1), int(self.mag1))
 
@@ -282,6 +449,86 @@ class TestQuantityClass(unittest.TestCase):
         temp = Quantity(mag=273.15, K=1.)
         self.assertEqual(temp('oC'), temp.mag-273.15)
 
+    def test_call_out(self):
+        speeds = Quantity.from_units(mag=np.array([1., 2.]), units='m/s')
+        out = np.zeros(2)
+        result = speeds('cm/s', out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, [100., 200.])
+        # Magnitude is not modified
+        np.testing.assert_array_equal(speeds.mag, [1., 2.])
+        # SI units
+        speeds(out=out)
+        np.testing.assert_array_equal(out, [1., 2.])
+        # Temperatures
+        temps = Quantity(mag=np.array([273.15, 373.15]), K=1.)
+        temps('oC', out=out)
+        np.testing.assert_allclose(out, [0., 100.], atol=1.e-10)
+        with self.assertRaises(ValueError):
+            speeds('cm3', out=out)
+
+    def test_to_inplace(self):
+        mag = np.array([1., 2.])
+        speeds = Quantity(mag=mag, m=1., s=-1.)
+        out = speeds.to_inplace('cm/s')
+        self.assertIs(out, mag)
+        np.testing.assert_allclose(mag, [100., 200.])
+        # Object becomes the dimensionless ratio to the requested units
+        self.assertIs(speeds.mag, mag)
+        self.assertTrue(speeds._is_dimless())
+        np.testing.assert_allclose((speeds*Quantity.from_units(units='cm/s'))
+                                   ('m/s'), [1., 2.])
+        with self.assertRaises(TypeError):
+            self.vel1.to_inplace('cm/s')
+        temps = Quantity(mag=np.array([300.]), K=1.)
+        with self.assertRaises(ValueError):
+            temps.to_inplace('oC')
+        np.testing.assert_allclose(temps.mag, [300.])
+
+    def test_dtype(self):
+        speeds = Quantity(mag=[1., 2.], m=1., s=-1., dtype=np.float32)
+        self.assertEqual(speeds.mag.dtype, np.float32)
+        self.assertIsInstance(Quantity(mag=1., dtype=np.float32).mag,
+                              np.float32)
+        # Type is preserved through operations and conversions
+        self.assertEqual((speeds*2.).mag.dtype, np.float32)
+        self.assertEqual((speeds + speeds).mag.dtype, np.float32)
+        self.assertEqual(speeds('cm/s').dtype, np.float32)
+        speeds_cm = Quantity.from_units(mag=[100., 200.], units='cm/s',
+                                        dtype=np.float32)
+        self.assertEqual(speeds_cm.mag.dtype, np.float32)
+        np.testing.assert_allclose(speeds_cm.mag, [1., 2.])
+        temps = Quantity.from_units(mag=np.array([0., 100.], dtype=np.float32),
+                                    units='oC')
+        self.assertEqual(temps.mag.dtype, np.float32)
+        self.assertEqual(np.asarray(speeds, dtype=np.float64).dtype,
+                         np.float64)
+        # Factors that underflow in single precision are applied in double
+        # precision
+        inertia = Quantity.from_units(mag=np.float32([1e30, 2e30]),
+                                      units='amu Ang2', dtype=np.float32)
+        self.assertEqual(inertia.mag.dtype, np.float32)
+        np.testing.assert_allclose(inertia('amu Ang2'), [1e30, 2e30],
+                                   rtol=1e-6)
+        with self.assertWarns(RuntimeWarning):
+            inertia = Quantity.from_units(mag=np.float32([1., 2.]),
+                                          units='amu Ang2', dtype=np.float32)
+        self.assertEqual(inertia.mag.dtype, np.float64)
+        np.testing.assert_allclose(inertia('amu Ang2'), [1., 2.])
+        # Reductions accept dtype
+        for func in (np.sum, np.nansum, np.cumsum, np.nancumsum, np.mean):
+            result = func(Quantity(mag=np.array([1., 2.]), m=1.),
+                          dtype=np.float32)
+            self.assertEqual(result.mag.dtype, np.float32)
+            self.assertEqual(result.units, Quantity(m=1.).units)
+
+    def test_astype(self):
+        speeds = Quantity(mag=np.array([1., 2.]), m=1., s=-1.)
+        speeds32 = speeds.astype(np.float32)
+        self.assertEqual(speeds32.mag.dtype, np.float32)
+        self.assertEqual(speeds32.units, speeds.units)
+        self.assertEqual(speeds.mag.dtype, np.float64)
+
     def test_from_units(self):
         self.assertEqual(Quantity.from_units(mag=self.mag1, units='m/s'),
                          self.vel1)
@@ -291,13 +538,204 @@ class TestQuantityClass(unittest.TestCase):
                          self.vel1)
         self.assertEqual(Quantity.from_units(mag=self.accel1.mag, units='m/s2'),
                          self.accel1)
+        # Arrays in SI units are copied so the inputted array is not modified
+        for units in ('m', 'K'):
+            mag = np.array([1., 2.])
+            quantity = Quantity.from_units(mag=mag, units=units)
+            self.assertFalse(np.shares_memory(quantity.mag, mag))
+            quantity += Quantity.from_units(mag=1., units=units)
+            np.testing.assert_array_equal(mag, [1., 2.])
+
+    def test_from_buffer(self):
+        buf = bytearray(np.array([1., 2., 3.]).tobytes())
+        lengths = Quantity.from_buffer(buf, units='m')
+        # SI units wrap the buffer without copying
+        self.assertTrue(np.shares_memory(lengths.mag, np.frombuffer(buf)))
+        np.testing.assert_array_equal(lengths.mag, [1., 2., 3.])
+        self.assertEqual(lengths.m, 1.)
+        lengths_cm = Quantity.from_buffer(buf, units='cm', offset=8, count=2)
+        np.testing.assert_allclose(lengths_cm.mag, [0.02, 0.03])
+        matrix = Quantity.from_buffer(bytes(np.arange(4.).tobytes()),
+                                      shape=(2, 2), units='s')
+        self.assertEqual(matrix.mag.shape, (2, 2))
+        temps = Quantity.from_buffer(np.array([1., 2.], dtype=np.float32),
+                                     dtype=np.float32, units='K')
+        self.assertEqual(temps.mag.dtype, np.float32)
+
+    def test_init_buffer(self):
+        mags = array.array('d', [1., 2.])
+        lengths = Quantity(mag=mags, m=1.)
+        lengths.mag[0] = 5.
+        self.assertEqual(mags[0], 5.)
+        view = memoryview(bytearray(16)).cast('d')
+        lengths = Quantity(mag=view, m=1.)
+        lengths.mag[1] = 3.
+        self.assertEqual(view[1], 3.)
+        lengths = Quantity(mag=np.array([1., 2.], dtype=np.float32).tobytes(),
+                           m=1., dtype=np.float32)
+        np.testing.assert_array_equal(lengths.mag, [1., 2.])
+
+    def test_pickle(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            vel1 = pickle.loads(pickle.dumps(self.vel1, protocol=protocol))
+            self.assertEqual(vel1, self.vel1)
+            speeds = Quantity(mag=np.arange(6.).reshape(2, 3), m=1., s=-1.)
+            speeds_out = pickle.loads(pickle.dumps(speeds, protocol=protocol))
+            np.testing.assert_array_equal(speeds_out.mag, speeds.mag)
+            self.assertEqual(speeds_out.units, speeds.units)
+            # Magnitude can be modified
+            speeds_out.mag[0, 0] = 10.
+            # 0-d magnitudes keep their shape
+            rate = Quantity(mag=np.array(3.), s=-1.)
+            rate_out = pickle.loads(pickle.dumps(rate, protocol=protocol))
+            self.assertEqual(rate_out.mag.shape, ())
+            self.assertEqual(rate_out, rate)
+            # Non-contiguous magnitudes
+            speeds_T = Quantity(mag=speeds.mag.T, m=1., s=-1.)
+            speeds_out = pickle.loads(pickle.dumps(speeds_T,
+                                                   protocol=protocol))
+            np.testing.assert_array_equal(speeds_out.mag, speeds.mag.T)
+        # Units are smaller than pickling the dictionary
+        self.assertLess(len(pickle.dumps(self.vel1)), 100)
+
+    def test_copy(self):
+        rate = Quantity(mag=np.array(3.), s=-1.)
+        for rate_out in (copy.copy(rate), copy.deepcopy(rate)):
+            self.assertEqual(rate_out.mag.shape, ())
+            self.assertEqual(rate_out, rate)
+        speeds = Quantity(mag=np.arange(6.).reshape(2, 3), m=1., s=-1.)
+        speeds_out = copy.deepcopy(speeds)
+        np.testing.assert_array_equal(speeds_out.mag, speeds.mag)
+        self.assertFalse(np.shares_memory(speeds_out.mag, speeds.mag))
+
+    def test_pickle_out_of_band(self):
+        speeds = Quantity(mag=np.arange(1000.), m=1., s=-1.)
+        buffers = []
+        data = pickle.dumps(speeds, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertLess(len(data), 1000)
+        speeds_out = pickle.loads(data, buffers=buffers)
+        self.assertTrue(np.shares_memory(speeds_out.mag, speeds.mag))
+
+    def test_pickle_subclasses(self):
+        unit = UnitQuantity(mag=2., m=1., add_short_prefix=False)
+        unit_out = pickle.loads(pickle.dumps(unit))
+        self.assertIsInstance(unit_out, UnitQuantity)
+        self.assertFalse(unit_out.add_short_prefix)
+        self.assertEqual(unit_out, unit)
+        frozen = Quantity(mag=np.array([1., 2.]), m=1.).freeze()
+        frozen_out = pickle.loads(pickle.dumps(frozen))
+        self.assertIsInstance(frozen_out, FrozenQuantity)
+        self.assertEqual(hash(frozen_out), hash(frozen))
+        self.assertFalse(frozen_out.mag.flags.writeable)
+
+    def test_to_dict(self):
+        speeds = Quantity(mag=np.array([[1., 2.], [3., 4.]]), m=1., s=-1.)
+        speeds_dict = speeds.to_dict()
+        self.assertEqual(speeds_dict['mag'], [[1., 2.], [3., 4.]])
+        self.assertIsInstance(speeds_dict['mag'][0][0], float)
+        speeds_out = Quantity.from_dict(speeds_dict)
+        np.testing.assert_array_equal(speeds_out.mag, speeds.mag)
+        self.assertEqual(speeds_out.units, speeds.units)
+        with self.assertRaises(ValueError):
+            speeds.to_dict(encoding='hex')
+
+    def test_to_dict_base64(self):
+        speeds = Quantity(mag=np.random.rand(3, 4), m=1., s=-1.)
+        for compress in (False, True):
+            speeds_dict = speeds.to_dict(encoding='base64', compress=compress)
+            # Dictionary is JSON serializable
+            speeds_dict = json.loads(json.dumps(speeds_dict))
+            speeds_out = Quantity.from_dict(speeds_dict)
+            np.testing.assert_array_equal(speeds_out.mag, speeds.mag)
+            self.assertEqual(speeds_out.units, speeds.units)
+        # Types and byte order are kept
+        ints = Quantity(mag=np.arange(4, dtype='>i4'))
+        ints_out = Quantity.from_dict(ints.to_dict(encoding='base64'))
+        np.testing.assert_array_equal(ints_out.mag, ints.mag)
+        self.assertEqual(ints_out.mag.dtype, np.dtype('<i4'))
+        # Scalars are not encoded
+        self.assertEqual(self.vel1.to_dict(encoding='base64')['mag'],
+                         self.mag1)
+        # Invalid combinations
+        with self.assertRaises(ValueError):
+            speeds.to_dict(encoding='list', compress=True)
+        with self.assertRaises(ValueError):
+            Quantity(mag=np.array([1., 'a'], dtype=object)).to_dict(
+                    encoding='base64')
 
     def test_from_qty(self):
         self.assertEqual(Quantity._from_qty(mag=self.mag1,
                                             units=self.vel1.units),
                          self.vel1)
                          
+class TestFrozenQuantityClass(unittest.TestCase):
+    def setUp(self):
+        self.vel1 = FrozenQuantity(mag=10., m=1., s=-1.)
+        self.speeds = Quantity(mag=np.array([1., 2.]), m=1., s=-1.)
+
+    def test_hash(self):
+        self.assertEqual(hash(self.vel1), hash(FrozenQuantity(10, m=1, s=-1)))
+        self.assertEqual(hash(self.speeds.freeze()),
+                         hash(self.speeds.freeze()))
+        # Can be used as dictionary keys
+        speeds_dict = {self.vel1: 'scalar', self.speeds.freeze(): 'array'}
+        self.assertEqual(speeds_dict[Quantity(mag=10., m=1., s=-1.).freeze()],
+                         'scalar')
+        self.assertEqual(speeds_dict[self.speeds.freeze()], 'array')
+        # Different units or magnitudes are different keys
+        self.assertNotIn(FrozenQuantity(mag=10., m=1.), speeds_dict)
+        self.assertNotIn(FrozenQuantity(mag=11., m=1., s=-1.), speeds_dict)
+        # Dimensionless scalars hash like the numbers they are equal to
+        ratio = FrozenQuantity(mag=1.)
+        self.assertEqual(ratio, 1.)
+        self.assertEqual(hash(ratio), hash(1.))
+        self.assertEqual(len({ratio, 1.}), 1)
+
+    def test_immutable(self):
+        frozen_speeds = self.speeds.freeze()
+        # Magnitude was copied
+        self.speeds.mag[0] = 5.
+        self.assertEqual(frozen_speeds.mag[0], 1.)
+        with self.assertRaises(ValueError):
+            frozen_speeds.mag[0] = 5.
+        with self.assertRaises(TypeError):
+            frozen_speeds[0] = Quantity(mag=5., m=1., s=-1.)
+        with self.assertRaises(AttributeError):
+            self.vel1.mag = 5.
+        with self.assertRaises(AttributeError):
+            self.vel1.m = 2.
+        with self.assertRaises(TypeError):
+            self.vel1.units['m'] = 2.
+
+    def test_operations(self):
+        vel2 = self.vel1
+        vel2 += Quantity(mag=1., m=1., s=-1.)
+        # In place operations return new objects
+        self.assertEqual(self.vel1.mag, 10.)
+        self.assertEqual(vel2, Quantity(mag=11., m=1., s=-1.))
+        self.assertEqual(self.vel1*2., Quantity(mag=20., m=1., s=-1.))
+        self.assertEqual(self.vel1, Quantity(mag=10., m=1., s=-1.))
+
+    def test_thaw(self):
+        speeds = self.speeds.freeze().thaw()
+        self.assertNotIsInstance(speeds, FrozenQuantity)
+        speeds.mag[0] = 5.
+        np.testing.assert_array_equal(speeds.mag, [5., 2.])
+
 class TestQuantityNumpyCompatibility(unittest.TestCase):
+    def test_exp(self):
+        ratio = np.exp(Quantity(mag=1.))
+        self.assertIsInstance(ratio, Quantity)
+        self.assertAlmostEqual(ratio.mag, np.e)
+        with self.assertWarns(UserWarning):
+            np.exp(Quantity(mag=np.array([1., 2.]), K=1.))
+        self.assertAlmostEqual(np.log(Quantity(mag=np.e)).mag, 1.)
+        # Other ufuncs are applied to the magnitudes
+        np.testing.assert_array_equal(
+                np.array([1., 2.])*Quantity(mag=np.array([1., 2.]), m=1.),
+                [1., 4.])
+
     def test_prod(self):
         # Testing a 1D array
         mag_1d = np.array([5., 6.])
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from vunits.quantity import Quantity, unchecked
+from vunits.quantity.records import QuantityRecords
+
+class TestQuantityRecords(unittest.TestCase):
+    def setUp(self):
+        self.H = Quantity.from_units(mag=np.array([10., -5., 2.]),
+                                     units='kJ/mol')
+        self.T = Quantity.from_units(mag=np.array([300., 400., 500.]),
+                                     units='K')
+        self.records = QuantityRecords.from_quantities({'H': self.H,
+                                                        'T': self.T})
+
+    def test_init(self):
+        self.assertEqual(self.records.fields, ('H', 'T'))
+        self.assertEqual(len(self.records), 3)
+        self.assertEqual(self.records.units['H'], self.H.units)
+        with self.assertRaises(ValueError):
+            QuantityRecords(data=np.arange(3.))
+        with self.assertRaises(ValueError):
+            QuantityRecords(data=self.records.data, units={'S': {}})
+        with self.assertRaises(ValueError):
+            QuantityRecords.from_quantities({'H': self.H,
+                                             'T': Quantity(np.ones(2), K=1.)})
+
+    def test_from_units(self):
+        data = np.array([(10., 26.85), (-5., 126.85)],
+                        dtype=[('H', float), ('T', float)])
+        records = QuantityRecords.from_units(data, units={'H': 'kJ/mol',
+                                                          'T': 'oC'})
+        np.testing.assert_allclose(records['H'].mag, [10000., -5000.])
+        np.testing.assert_allclose(records['T'].mag, [300., 400.])
+        self.assertEqual(records['T'].units, self.T.units)
+        # Original data not modified
+        self.assertEqual(data['H'][0], 10.)
+        # Integer fields with units are converted to float
+        data = np.array([(1, 2), (3, 4)], dtype=[('L', int), ('n', int)])
+        records = QuantityRecords.from_units(data, units={'L': 'cm'})
+        np.testing.assert_allclose(records['L'].mag, [0.01, 0.03])
+        self.assertEqual(records.data.dtype['n'], data.dtype['n'])
+
+    def test_units_copied(self):
+        units = dict(self.H.units)
+        with unchecked():
+            records = QuantityRecords(data=self.records.data,
+                                      units={'H': units})
+            H = records['H']
+        units['m'] = 1.
+        self.assertEqual(records.units['H'], self.H.units)
+        self.assertIsNot(H.units, records.units['H'])
+
+    def test_getitem(self):
+        H = self.records['H']
+        np.testing.assert_array_equal(H.mag, self.H.mag)
+        self.assertEqual(H.units, self.H.units)
+        self.assertTrue(np.shares_memory(H.mag, self.records.data))
+        subset = self.records[self.records['H'].mag > 0.]
+        self.assertIsInstance(subset, QuantityRecords)
+        np.testing.assert_array_equal(subset['T'].mag, [300., 500.])
+        self.assertEqual(len(self.records[0]), 1)
+        self.assertEqual(self.records[['T']].fields, ('T',))
+
+    def test_setitem(self):
+        self.records['T'] = Quantity(mag=np.array([1., 2., 3.]), K=1.)
+        np.testing.assert_array_equal(self.records.data['T'], [1., 2., 3.])
+        with self.assertRaises(TypeError):
+            self.records['T'] = self.H
+
+    def test_sort(self):
+        records = self.records.sort('H')
+        np.testing.assert_array_equal(records['T'].mag, [400., 500., 300.])
+        records = self.records.sort('H', reverse=True)
+        np.testing.assert_array_equal(records['T'].mag, [300., 500., 400.])
+
+    def test_call(self):
+        data = self.records({'H': 'kcal/mol', 'T': 'oC'})
+        np.testing.assert_allclose(data['H'], self.H('kcal/mol'))
+        np.testing.assert_allclose(data['T'], [26.85, 126.85, 226.85])
+        np.testing.assert_array_equal(self.records()['H'], self.H.mag)
+        with self.assertRaises(ValueError):
+            self.records({'H': 'm'})
+
+if __name__ == '__main__':
+    unittest.main()
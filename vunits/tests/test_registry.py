@@ -0,0 +1,47 @@
+import unittest
+
+from vunits import db
+from vunits.quantity import Quantity
+from vunits.registry import UnitRegistry
+
+class TestUnitRegistry(unittest.TestCase):
+    def setUp(self):
+        self.furlong = Quantity.from_units(mag=201.168, units='m')
+        self.registry = UnitRegistry()
+        self.registry.register('furlong', self.furlong, plural_suffix='s')
+
+    def test_mapping(self):
+        self.assertIn('furlongs', self.registry)
+        self.assertIn('m', self.registry)
+        self.assertNotIn('furlong', db.unit_db)
+        self.assertEqual(len(self.registry), len(db.unit_db) + 2)
+        self.assertEqual(list(self.registry)[:2], ['furlong', 'furlongs'])
+        self.assertEqual(self.registry['m'], db.unit_db['m'])
+
+    def test_from_units(self):
+        speed = Quantity.from_units(mag=2., units='furlongs/s',
+                                    unit_db=self.registry)
+        self.assertEqual(speed, Quantity(mag=402.336, m=1., s=-1.))
+        self.assertIn('furlongs/s', self.registry._parse_cache)
+        with self.assertRaises(ValueError):
+            Quantity.from_units(units='furlong')
+        # Other registries do not see the unit
+        with self.assertRaises(ValueError):
+            Quantity.from_units(units='furlong', unit_db=UnitRegistry())
+
+    def test_chained(self):
+        registry = UnitRegistry(base=self.registry)
+        registry.register('chain', self.furlong/10.)
+        self.assertEqual(Quantity.from_units(units='furlong/chain',
+                                             unit_db=registry),
+                         Quantity(mag=10.))
+        # Shadowing a unit of the base
+        Quantity.from_units(units='chain', unit_db=registry)
+        self.registry.register('chain', self.furlong)
+        # Registering in the base clears the cache
+        self.assertEqual(registry._get_parse_cache(), {})
+        self.assertEqual(Quantity.from_units(units='chain', unit_db=registry),
+                         self.furlong/10.)
+
+if __name__ == '__main__':
+    unittest.main()
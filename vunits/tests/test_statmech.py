@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from vunits import statmech
+from vunits.convert import wavenumber_to_temp, inertia_to_temp
+from vunits.quantity import Quantity
+
+class TestStatmech(unittest.TestCase):
+    def setUp(self):
+        self.wavenumbers = [[1595., 3657., 3756.], [667., 667., 1333., 2349.]]
+        self.T = np.array([300., 1000.])
+
+    def _q_vib(self, wavenumbers, T):
+        vib_temps = wavenumber_to_temp(np.array(wavenumbers))
+        return np.prod(np.exp(-vib_temps/2./T)/(1. - np.exp(-vib_temps/T)))
+
+    def test_q_vib(self):
+        q = statmech.q_vib(self.wavenumbers, self.T)
+        self.assertEqual(q.shape, (2, 2))
+        for i, wavenumbers in enumerate(self.wavenumbers):
+            for j, T in enumerate(self.T):
+                self.assertAlmostEqual(q[i, j]/self._q_vib(wavenumbers, T),
+                                       1.)
+        # Padding with a mask and scalar temperature
+        wavenumbers = np.array([[1595., 3657., 3756., 0.],
+                                [667., 667., 1333., 2349.]])
+        mask = np.array([[True, True, True, False], [True]*4])
+        np.testing.assert_allclose(
+                statmech.q_vib(wavenumbers, 300., mask=mask), q[:, 0])
+        # Modes that are 0 are padding, like in q_rot
+        np.testing.assert_allclose(statmech.q_vib(wavenumbers, 300.),
+                                   q[:, 0])
+        # Included modes must be positive
+        with self.assertRaises(ValueError):
+            statmech.q_vib([[-100., 1595.]], 300.)
+        with self.assertRaises(ValueError):
+            statmech.q_vib(wavenumbers, 300., mask=np.ones((2, 4), bool))
+        np.testing.assert_allclose(
+                statmech.q_vib([[-100., 1595.]], 300.,
+                               mask=[[False, True]]),
+                statmech.q_vib([[1595.]], 300.))
+        # Quantities and logarithms
+        wavenumbers = Quantity.from_units(mag=np.array(self.wavenumbers[1]),
+                                          units='cm-1')
+        log_q = statmech.q_vib(wavenumbers, Quantity.from_units(300., 'K'),
+                               log=True, return_quantity=True)
+        self.assertTrue(log_q._is_dimless())
+        self.assertAlmostEqual(log_q.mag, np.log(q[1, 0]))
+        # Referenced to the ground state
+        np.testing.assert_allclose(
+                statmech.q_vib([[1000.]], self.T, include_zpe=False),
+                [1./(1. - np.exp(-wavenumber_to_temp(1000.)/self.T))])
+
+    def test_q_rot(self):
+        inertia = [[1.0e-47, 1.9e-47, 2.9e-47], [7.1e-46]]
+        q = statmech.q_rot(inertia, ['C2v', 'Dinfh'], self.T)
+        self.assertEqual(q.shape, (2, 2))
+        rot_temps = inertia_to_temp(np.array(inertia[0]))
+        np.testing.assert_allclose(
+                q[0], np.sqrt(np.pi*self.T**3/np.prod(rot_temps))/2.)
+        np.testing.assert_allclose(
+                q[1], self.T/2./inertia_to_temp(inertia[1][0]))
+        # Zeros as padding and symmetry numbers
+        np.testing.assert_allclose(
+                statmech.q_rot([[7.1e-46, 0., 0.]], [2], 300.), q[1:, 0])
+        inertia = Quantity.from_units(mag=np.array([7.1e-46, 0., 0.]),
+                                      units='kg m2')
+        np.testing.assert_allclose(
+                statmech.q_rot(inertia, 'Dinfh', self.T), q[1])
+        with self.assertRaises(ValueError):
+            statmech.q_rot([[1.e-47, 1.e-47]], 1, 300.)
+
+if __name__ == '__main__':
+    unittest.main()
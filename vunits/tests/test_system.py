@@ -0,0 +1,92 @@
+import unittest
+import threading
+
+from vunits.quantity import Quantity, _return_quantity
+from vunits.system import (UnitSystem, get_unit_system, unit_system,
+                           get_active_system, _join_units)
+
+class TestUnitSystem(unittest.TestCase):
+    def setUp(self):
+        self.system = UnitSystem(energy='kcal/mol', length='Ang')
+        self.molar_energy = Quantity.from_units(mag=1., units='kcal/mol')
+        self.heat_capacity = Quantity.from_units(mag=1., units='J/mol/K')
+        self.length = Quantity.from_units(mag=2., units='Ang')
+
+    def test_factor(self):
+        self.assertAlmostEqual(
+                self.molar_energy.mag/self.system.factor(
+                    self.molar_energy.units), 1.)
+        self.assertAlmostEqual(
+                self.heat_capacity.mag/self.system.factor(
+                    self.heat_capacity.units),
+                self.heat_capacity('kcal/mol/K'))
+        self.assertAlmostEqual(
+                self.length.mag/self.system.factor(self.length.units), 2.)
+
+    def test_units_str(self):
+        self.assertEqual(self.system.units_str(self.molar_energy.units),
+                         'kcal mol^-1')
+        self.assertEqual(self.system.units_str(self.heat_capacity.units),
+                         'kcal mol^-1 K^-1')
+        self.assertEqual(self.system.units_str(self.length.units), 'Ang')
+        # Units string can be parsed
+        units_str = self.system.units_str(self.heat_capacity.units)
+        self.assertAlmostEqual(self.heat_capacity(units_str),
+                               self.heat_capacity('kcal/mol/K'))
+
+    def test_invalid_units(self):
+        with self.assertRaises(ValueError):
+            UnitSystem(length='kg')
+        with self.assertRaises(ValueError):
+            UnitSystem(energy='m')
+        with self.assertRaises(ValueError):
+            UnitSystem(temperature='oC')
+
+    def test_get_unit_system(self):
+        system = get_unit_system(energy='kcal/mol', length='Ang')
+        self.assertEqual(system, self.system)
+        self.assertIs(system, get_unit_system(length='Ang',
+                                              energy='kcal/mol'))
+
+    def test_unit_system(self):
+        self.assertIsNone(get_active_system())
+        with unit_system(energy='kcal/mol', length='Ang') as system:
+            self.assertEqual(system, self.system)
+            self.assertIs(get_active_system(), system)
+            self.assertAlmostEqual(self.molar_energy(), 1.)
+            self.assertAlmostEqual(self.length(), 2.)
+            self.assertEqual(str(self.length), '2.0 Ang')
+            self.assertAlmostEqual(
+                    _return_quantity(self.heat_capacity, False, None),
+                    self.heat_capacity('kcal/mol/K'))
+            # Explicit units and the SI accessor are still honored
+            self.assertAlmostEqual(self.length('m'), 2.e-10)
+            self.assertAlmostEqual(self.length.si(), 2.e-10)
+            # Nested systems
+            with unit_system(length='cm'):
+                self.assertAlmostEqual(self.length(), 2.e-8)
+            self.assertAlmostEqual(self.length(), 2.)
+        self.assertIsNone(get_active_system())
+        self.assertAlmostEqual(self.length(), 2.e-10)
+
+    def test_unit_system_thread_local(self):
+        results = []
+        def get_length():
+            results.append(self.length())
+
+        with unit_system(length='Ang'):
+            thread = threading.Thread(target=get_length)
+            thread.start()
+            thread.join()
+        # Other threads do not use the active system
+        self.assertAlmostEqual(results[0], 2.e-10)
+
+    def test_join_units(self):
+        self.assertEqual(_join_units([('kcal', 1.), ('mol', -1.),
+                                      ('mol', 1.), ('K', -2.)]),
+                         'kcal K^-2')
+        self.assertEqual(_join_units([('m', 0.5)]), 'm^0.5')
+        self.assertEqual(_join_units([('', 1.)]), '')
+
+if __name__ == '__main__':
+    unittest.main()
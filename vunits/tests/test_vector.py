@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from vunits.quantity import Quantity
+from vunits.quantity.vector import QuantityVector
+
+class TestQuantityVector(unittest.TestCase):
+    def setUp(self):
+        self.conc = Quantity.from_units(mag=np.array([1., 2.]),
+                                        units='mol/L')
+        self.T = Quantity.from_units(mag=300., units='K')
+        self.state = QuantityVector.from_segments({'conc': self.conc,
+                                                   'T': self.T})
+
+    def test_from_segments(self):
+        np.testing.assert_array_almost_equal(self.state.mag,
+                                             [1000., 2000., 300.])
+        np.testing.assert_array_equal(self.state.exponents,
+                                      [[-3., 0., 0., 0., 0., 1., 0.],
+                                       [-3., 0., 0., 0., 0., 1., 0.],
+                                       [0., 0., 0., 0., 1., 0., 0.]])
+        self.assertEqual(self.state.segments,
+                         {'conc': slice(0, 2), 'T': slice(2, 3)})
+        with self.assertRaises(ValueError):
+            QuantityVector(mag=[1., 2.], exponents=np.zeros((3, 7)))
+
+    def test_getitem(self):
+        self.assertEqual(self.state['T'], Quantity(mag=[300.], K=1.))
+        self.assertEqual(self.state[2], self.T)
+        np.testing.assert_array_almost_equal(self.state['conc']('mol/L'),
+                                             [1., 2.])
+        self.assertIsInstance(self.state[1:], QuantityVector)
+        self.assertEqual(len(self.state[1:]), 2)
+        self.assertEqual(len(list(self.state)), 3)
+
+    def test_setitem(self):
+        self.state['T'] = Quantity.from_units(mag=400., units='K')
+        self.assertEqual(self.state.mag[2], 400.)
+        with self.assertRaises(TypeError):
+            self.state[0] = self.T
+
+    def test_pack_unpack(self):
+        y = self.state.pack()
+        self.assertIs(y, self.state.mag)
+        new_state = self.state.unpack(y*2.)
+        np.testing.assert_array_almost_equal(new_state['T'].mag, [600.])
+        self.assertIs(new_state.exponents, self.state.exponents)
+        out = np.empty(3)
+        self.state.pack(out=out)
+        np.testing.assert_array_equal(out, self.state.mag)
+        with self.assertRaises(ValueError):
+            self.state.unpack(np.zeros(2))
+
+    def test_call(self):
+        np.testing.assert_array_almost_equal(self.state({'conc': 'mol/L'}),
+                                             [1., 2., 300.])
+        self.assertIs(self.state(), self.state.mag)
+
+    def test_add(self):
+        new_state = self.state + self.state
+        np.testing.assert_array_almost_equal(new_state.mag,
+                                             [2000., 4000., 600.])
+        self.assertEqual(new_state.segments, self.state.segments)
+        np.testing.assert_array_almost_equal((new_state - self.state).mag,
+                                             self.state.mag)
+        with self.assertRaises(TypeError):
+            self.state + self.T
+        with self.assertRaises(TypeError):
+            self.state + 1.
+
+    def test_mul(self):
+        dt = Quantity(mag=2., s=1.)
+        rate = self.state/dt
+        np.testing.assert_array_almost_equal(rate.mag, self.state.mag/2.)
+        np.testing.assert_array_equal(rate.exponents[:, 2], [-1., -1., -1.])
+        # Quantity objects defer to the vector
+        rate = dt*self.state
+        np.testing.assert_array_equal(rate.exponents[:, 2], [1., 1., 1.])
+        inv = dt/self.state
+        np.testing.assert_array_equal(inv.exponents[2],
+                                      [0., 0., 1., 0., -1., 0., 0.])
+        # Elementwise with other vectors and arrays
+        squared = self.state*self.state
+        np.testing.assert_array_equal(squared.exponents,
+                                      2.*self.state.exponents)
+        scaled = np.array([1., 2., 3.])*self.state
+        np.testing.assert_array_almost_equal(scaled.mag, [1000., 4000., 900.])
+        np.testing.assert_array_equal((self.state**2).exponents,
+                                      squared.exponents)
+
+    def test_eq(self):
+        np.testing.assert_array_equal(self.state == self.state,
+                                      [True, True, True])
+        np.testing.assert_array_equal(self.state == self.T,
+                                      [False, False, True])
+        # Quantity objects defer comparisons to the vector
+        np.testing.assert_array_equal(self.T == self.state,
+                                      [False, False, True])
+        np.testing.assert_array_equal(self.T != self.state,
+                                      [True, True, False])
+
+    def test_defer(self):
+        # Operations the vector does not support are not applied by Quantity
+        for operation in (lambda x, y: x//y, lambda x, y: x**y,
+                          lambda x, y: x < y, lambda x, y: x <= y,
+                          lambda x, y: x > y, lambda x, y: x >= y):
+            with self.assertRaises(TypeError):
+                operation(self.T, self.state)
+
+if __name__ == '__main__':
+    unittest.main()